@@ -0,0 +1,41 @@
+"""Microbenchmark of TextNode to LeafNode conversion.
+
+Usage: python3 bench/bench_converter.py [count]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from converter import text_node_to_html_node, text_nodes_to_html_nodes
+from textnode import TextNode, TextType
+
+
+def make_nodes(count):
+    """Nodes cycling through every TextType"""
+    kinds = [TextNode("some text", text_type, "https://boot.dev") for text_type in TextType]
+    return (kinds * (count // len(kinds) + 1))[:count]
+
+
+def per_node_time(func, count):
+    """Best nanoseconds per converted node over a few repeats"""
+    best = min(timeit.repeat(func, number=1, repeat=3))
+    return best / count * 1e9
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000
+    nodes = make_nodes(count)
+    cases = {
+        "text_node_to_html_node": lambda: [text_node_to_html_node(node) for node in nodes],
+        "text_nodes_to_html_nodes": lambda: text_nodes_to_html_nodes(nodes),
+        "lazy batch": lambda: list(text_nodes_to_html_nodes(nodes, lazy=True)),
+    }
+    print(f"{count} nodes")
+    for name, func in cases.items():
+        print(f"{name:<26}{per_node_time(func, count):>8.1f} ns/node")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Retained heap of many page trees, mutable versus frozen and interned.
+
+Usage: python3 bench/bench_frozen.py [pages]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from block_parser import markdown_to_html_node
+
+
+FOOTER = "Licensed under **CC BY-SA**. See the [license](/license) for details."
+
+
+def page(number):
+    """Page with unique body text and boilerplate shared by every page"""
+    return (f"# Page {number}\n\n"
+            f"Unique text for page {number} with _some_ markup.\n\n"
+            "> **Note** this page is part of the fan club archive.\n\n"
+            "- [Home](/)\n- [Books](/books)\n- [Films](/films)\n\n"
+            f"{FOOTER}\n")
+
+
+def retained_bytes(pages, frozen):
+    """Traced bytes still allocated while holding every page tree"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    trees = [markdown_to_html_node(page(number), frozen) for number in range(pages)]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del trees
+    return retained
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    mutable = retained_bytes(pages, frozen=False)
+    frozen = retained_bytes(pages, frozen=True)
+    print(f"{pages} pages")
+    print(f"mutable {mutable / 1024:>10.1f} KiB")
+    print(f"frozen  {frozen / 1024:>10.1f} KiB  ({frozen / mutable:.0%})")
+
+
+if __name__ == "__main__":
+    main()
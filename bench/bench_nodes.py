@@ -0,0 +1,51 @@
+"""Per-node memory and construction time of the node classes.
+
+Usage: python3 bench/bench_nodes.py [count]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+
+CHILDREN = [LeafNode(None, "child")]
+
+FACTORIES = {
+    "TextNode": lambda: TextNode("text", TextType.BOLD),
+    "LeafNode": lambda: LeafNode("b", "text"),
+    "ParentNode": lambda: ParentNode("p", CHILDREN),
+}
+
+
+def node_memory(factory, count):
+    """Average bytes allocated per node, excluding the holding list"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [factory() for _ in range(count)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return (allocated - sys.getsizeof(nodes)) / count
+
+
+def construction_time(factory, count):
+    """Best average nanoseconds to construct one node"""
+    best = min(timeit.repeat(factory, number=count, repeat=5))
+    return best / count * 1e9
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"{'node':<12}{'bytes/node':>12}{'ns/node':>10}")
+    for name, factory in FACTORIES.items():
+        memory = node_memory(factory, count)
+        elapsed = construction_time(factory, count)
+        print(f"{name:<12}{memory:>12.1f}{elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare two run_bench.py JSON reports and flag regressions.
+
+Usage: python3 bench/compare.py BASE.json HEAD.json [--threshold 0.1]
+
+Exits 1 when any stage got slower, or allocated more at peak, by more
+than the threshold fraction.
+"""
+import argparse
+import json
+import sys
+
+
+METRICS = ("seconds", "peak_bytes")
+
+
+def compare(base, head, threshold):
+    """List of (name, metric, base value, head value, ratio, regressed)"""
+    rows = []
+    for name in sorted(base["results"].keys() & head["results"].keys()):
+        for metric in METRICS:
+            old = base["results"][name][metric]
+            new = head["results"][name][metric]
+            ratio = new / old if old else 1.0
+            rows.append((name, metric, old, new, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare benchmark reports")
+    parser.add_argument("base", help="report of the baseline commit")
+    parser.add_argument("head", help="report of the commit under test")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed slowdown as a fraction, eg. 0.1 for 10%%")
+    args = parser.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as fp:
+        base = json.load(fp)
+    with open(args.head, encoding="utf-8") as fp:
+        head = json.load(fp)
+
+    regressions = 0
+    for name, metric, old, new, ratio, regressed in compare(base, head, args.threshold):
+        marker = "REGRESSION" if regressed else ""
+        print(f"{name:<28}{metric:<12}{old:>14.6g}{new:>14.6g}{ratio:>8.2f}x  {marker}")
+        regressions += regressed
+    print(f"{regressions} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
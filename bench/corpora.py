@@ -0,0 +1,60 @@
+"""Synthetic inputs for the benchmark suite.
+
+Every generator is deterministic and takes a scale factor, so results
+from two commits are measured on identical input.
+"""
+from htmlnode import LeafNode, ParentNode
+
+
+SENTENCE = "The road goes ever on and on, down from the door where it began. "
+
+
+def long_paragraph(scale=1):
+    """One long paragraph with sparse inline markup"""
+    pieces = []
+    for number in range(2000 * scale):
+        pieces.append(SENTENCE)
+        if number % 20 == 0:
+            pieces.append("Some **bold** words. ")
+    return "".join(pieces)
+
+
+def delimiter_dense(scale=1):
+    """Short runs of bold, italic and code back to back"""
+    return "**bold** and _italic_ with `code` " * (2000 * scale)
+
+
+def image_heavy(scale=1):
+    """Images and links interleaved with short text"""
+    return "".join(
+        f"see ![image {number}](/images/{number}.png) and [page {number}](/pages/{number}) "
+        for number in range(500 * scale)
+    )
+
+
+def document(scale=1):
+    """Markdown document mixing every block type"""
+    block = (
+        "## Chapter\n\n"
+        f"{SENTENCE * 5}with _italic_ and `code`.\n\n"
+        "> A quote\n> over two lines\n\n"
+        "- first item\n- **second** item\n\n"
+        "1. one\n2. two\n\n"
+        "```\ncode block\n\nwith a blank line\n```\n\n"
+    )
+    return "# Title\n\n" + block * (200 * scale)
+
+
+def nested_tree(scale=1):
+    """ParentNode chain nested far beyond the recursion limit"""
+    node = LeafNode("b", "deep")
+    for _ in range(5000 * scale):
+        node = ParentNode("span", [node])
+    return node
+
+
+def site_pages(scale=1):
+    """(relative path, markdown) for a site of small pages"""
+    for number in range(1000 * scale):
+        yield (f"section{number % 10}/page{number}.md",
+               f"# Page {number}\n\n{SENTENCE}**bold** [home](/)\n\n- a\n- b\n")
@@ -0,0 +1,157 @@
+"""Time each stage of the parse -> convert -> serialize pipeline.
+
+Usage: python3 bench/run_bench.py [--scale N] [--repeat N] [--output FILE]
+
+Writes JSON with the best wall time and the peak traced allocation of
+every corpus/stage pair, for bench/compare.py.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+import corpora
+from block_parser import markdown_to_html_node
+from converter import text_nodes_to_html_nodes
+from htmlnode import ParentNode
+from inline_parser import parse_inline
+from markdown_parser import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from site_builder import build_site
+from textnode import TextNode, TextType
+
+
+def multi_pass(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    return split_nodes_link(nodes)
+
+
+def inline_stages(text):
+    """Stages for one inline text, each run on the previous stage's output"""
+    text_nodes = text_to_textnodes(text)
+    html_nodes = text_nodes_to_html_nodes(text_nodes)
+    paragraph = ParentNode("p", html_nodes)
+    return {
+        "split": lambda: multi_pass(text),
+        "tokenize": lambda: text_to_textnodes(text),
+        "convert": lambda: text_nodes_to_html_nodes(text_nodes),
+        "nested": lambda: parse_inline(text),
+        "serialize": paragraph.to_html,
+    }
+
+
+def site_stages(scale, temp_dir):
+    """Full build and no-op rebuild of a generated site in temp_dir"""
+    content = os.path.join(temp_dir, "content")
+    template = os.path.join(temp_dir, "template.html")
+    with open(template, "w", encoding="utf-8") as fp:
+        fp.write("<title>{{ Title }}</title>{{ Content }}")
+    for rel_path, markdown in corpora.site_pages(scale):
+        path = os.path.join(content, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(markdown)
+    builds = iter(range(sys.maxsize))
+
+    def full_build():
+        # a fresh output directory each run, so nothing is skipped
+        build_site(content, template, os.path.join(temp_dir, f"public{next(builds)}"))
+
+    public = os.path.join(temp_dir, "public")
+    build_site(content, template, public)
+    return {
+        "build": full_build,
+        "rebuild": lambda: build_site(content, template, public),
+    }
+
+
+def suite(scale, temp_dir):
+    """Map of corpus name to its stages"""
+    document = corpora.document(scale)
+    tree = corpora.nested_tree(scale)
+    return {
+        "long_paragraph": inline_stages(corpora.long_paragraph(scale)),
+        "delimiter_dense": inline_stages(corpora.delimiter_dense(scale)),
+        "image_heavy": inline_stages(corpora.image_heavy(scale)),
+        "document": {
+            "parse": lambda: markdown_to_html_node(document),
+            "serialize": markdown_to_html_node(document).to_html,
+        },
+        "nested_tree": {"serialize": tree.to_html},
+        "site": site_stages(scale, temp_dir),
+    }
+
+
+def measure(func, repeat):
+    """Best wall time over repeat runs, then peak allocation of one traced run"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the site pipeline")
+    parser.add_argument("--scale", type=int, default=1, help="corpus size multiplier")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_site_") as temp_dir:
+        for corpus, stages in suite(args.scale, temp_dir).items():
+            for stage, func in stages.items():
+                name = f"{corpus}/{stage}"
+                results[name] = measure(func, args.repeat)
+                print(f"{name:<28}{results[name]['seconds'] * 1000:>10.2f} ms"
+                      f"{results[name]['peak_bytes'] / 1024:>12.1f} KiB")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=1, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
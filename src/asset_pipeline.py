@@ -0,0 +1,194 @@
+"""Copy static assets, eg. images, into the output directory.
+
+Every file under the static directory is mirrored into the output
+directory by a thread pool. Files whose size and mtime match the build
+manifest are skipped without being read; touched files are hashed and
+skipped when their content is unchanged. Files are hard linked when
+asked to, else copied with os.copy_file_range, which shares blocks on
+filesystems that support it, falling back to a plain copy.
+
+With hashing, each asset is written under a content hashed name, eg.
+images/ring.png -> images/ring.3f2a9c0d1b4e.png, and converter rewrites
+image urls to it, so pages and assets can be cached forever.
+"""
+import errno
+import hashlib
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+
+# hex digits of the content hash kept in hashed names
+HASH_LENGTH = 12
+DEFAULT_WORKERS = 8
+_READ_SIZE = 1024 * 1024
+# copy_file_range errors meaning this pair of files cannot use it
+_NO_COPY_RANGE = frozenset(
+    (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL, errno.EPERM))
+
+
+class AssetResult:
+    def __init__(self):
+        self.copied = []
+        self.skipped = []
+        self.deleted = []
+        # rel_path -> manifest entry of every asset
+        self.entries = {}
+        # relative outputs no longer produced, removed once pages are written
+        self.stale_outputs = []
+
+    def urls(self):
+        """Url path -> url of the output, for assets written under another name"""
+        return asset_urls(self.entries)
+
+    def __repr__(self):
+        return (f"AssetResult(copied: {len(self.copied)}, "
+                f"skipped: {len(self.skipped)}, deleted: {len(self.deleted)})")
+
+
+def sync_assets(static_dir, dest_dir, old_entries, hashed=False, link=False,
+                workers=DEFAULT_WORKERS):
+    """Copy new and changed files of static_dir into dest_dir
+
+    Args:
+        static_dir (str): directory of assets, a missing one has none
+        dest_dir (str): output directory
+        old_entries (dict): rel_path -> entry from the last build's manifest
+        hashed (bool): write each asset under a content hashed name
+        link (bool): hard link assets instead of copying when possible;
+            the output then shares the source's inode, so never edit it
+        workers (int): threads hashing and copying
+
+    Returns:
+        AssetResult: assets copied, skipped and deleted, and the new entries
+    """
+    result = AssetResult()
+    tasks = [
+        (rel_path, os.path.join(static_dir, rel_path), dest_dir,
+         old_entries.get(rel_path), hashed, link)
+        for rel_path in iter_assets(static_dir)
+    ]
+    if tasks:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks)),
+                                thread_name_prefix="asset-pipeline") as executor:
+            outcomes = list(executor.map(_sync_asset, tasks))
+    else:
+        outcomes = []
+
+    outputs = set()
+    for (rel_path, *_), (entry, copied) in zip(tasks, outcomes):
+        result.entries[rel_path] = entry
+        outputs.add(entry["output"])
+        (result.copied if copied else result.skipped).append(rel_path)
+    for rel_path, entry in old_entries.items():
+        if rel_path not in result.entries:
+            result.deleted.append(rel_path)
+        if entry["output"] not in outputs:
+            result.stale_outputs.append(entry["output"])
+    return result
+
+
+def _sync_asset(task):
+    """(manifest entry, whether the file was copied) of one asset"""
+    rel_path, source_path, dest_dir, old_entry, hashed, link = task
+    stat = os.stat(source_path)
+    if (old_entry is not None
+            and old_entry["mtime_ns"] == stat.st_mtime_ns
+            and old_entry["size"] == stat.st_size):
+        # unchanged metadata, trust the recorded hash without reading
+        digest = old_entry["hash"]
+    else:
+        digest = hash_file(source_path)
+    output = hashed_path(rel_path, digest) if hashed else rel_path
+    entry = {"hash": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+             "output": output}
+    dest_path = os.path.join(dest_dir, output)
+    if (old_entry is not None
+            and old_entry["hash"] == digest
+            and old_entry["output"] == output
+            and os.path.exists(dest_path)):
+        return entry, False
+    copy_asset(source_path, dest_path, link)
+    return entry, True
+
+
+def iter_assets(static_dir):
+    """Yield paths of files under static_dir relative to it, in sorted order"""
+    for dir_path, dir_names, file_names in os.walk(static_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            yield os.path.relpath(os.path.join(dir_path, file_name), static_dir)
+
+
+def hash_file(path):
+    """Hex sha256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(_READ_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hashed_path(rel_path, digest):
+    """Content hashed name of an asset, eg. ring.png -> ring.3f2a9c0d1b4e.png"""
+    root, extension = os.path.splitext(rel_path)
+    return f"{root}.{digest[:HASH_LENGTH]}{extension}"
+
+
+def asset_urls(entries):
+    """Url path -> output url of assets written under another name"""
+    return {
+        "/" + rel_path.replace(os.sep, "/"): "/" + entry["output"].replace(os.sep, "/")
+        for rel_path, entry in entries.items()
+        if entry["output"] != rel_path
+    }
+
+
+def copy_asset(source_path, dest_path, link=False):
+    """Copy a file through a temporary name, so readers never see half of it
+    Hard links when link is set and both paths are on one filesystem,
+    otherwise copies with copy_file_range where supported.
+
+    Returns:
+        str: "link", "range" or "copy", how the file was written
+    """
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    temp_path = dest_path + ".tmp"
+    if os.path.lexists(temp_path):
+        os.remove(temp_path)
+    method = None
+    if link:
+        try:
+            os.link(source_path, temp_path)
+            method = "link"
+        except OSError:
+            # another filesystem, or links not supported
+            pass
+    if method is None:
+        method = "range" if _copy_file_range(source_path, temp_path) else "copy"
+        if method == "copy":
+            shutil.copyfile(source_path, temp_path)
+    os.replace(temp_path, dest_path)
+    return method
+
+
+def _copy_file_range(source_path, dest_path):
+    """Copy with os.copy_file_range, False when it cannot be used here"""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    with open(source_path, "rb") as source, open(dest_path, "wb") as dest:
+        remaining = os.fstat(source.fileno()).st_size
+        first = True
+        while remaining > 0:
+            try:
+                count = os.copy_file_range(source.fileno(), dest.fileno(), remaining)
+            except OSError as error:
+                if first and error.errno in _NO_COPY_RANGE:
+                    return False
+                raise
+            if count == 0:
+                # the source shrank while copying
+                break
+            remaining -= count
+            first = False
+    return True
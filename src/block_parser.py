@@ -0,0 +1,284 @@
+import re
+import time
+from enum import Enum
+
+import profiler
+from converter import text_node_to_html_node
+from frozen_nodes import freeze
+from htmlnode import LeafNode, ParentNode
+from inline_parser import parse_inline
+from markdown_parser import is_plain_text
+from textnode import TextNode, TextType
+
+
+class BlockType(Enum):
+    PARAGRAPH = "paragraph"
+    HEADING = "heading"
+    CODE = "code"
+    QUOTE = "quote"
+    UNORDERED_LIST = "unordered_list"
+    ORDERED_LIST = "ordered_list"
+
+
+_HEADING_RE = re.compile(r"(#{1,6}) ")
+_ORDERED_ITEM_RE = re.compile(r"(\d+)\. ")
+_CODE_FENCE = "```"
+
+
+def iter_blocks(lines):
+    """Group markdown lines into typed blocks in a single pass
+    Blocks are separated by blank lines, except inside code fences.
+    Only the lines of the current block are held in memory.
+
+    Args:
+        lines (iterable): lines of markdown, eg. an open file
+
+    Yields:
+        tuple: (BlockType, list of the block's lines)
+    """
+    block_lines = []
+    in_code = False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if in_code:
+            if stripped.startswith(_CODE_FENCE):
+                block_lines.append(stripped)
+                yield BlockType.CODE, block_lines
+                block_lines = []
+                in_code = False
+            else:
+                # code keeps its indentation
+                block_lines.append(line)
+            continue
+
+        if not stripped:
+            if block_lines:
+                yield classify_block_lines(block_lines), block_lines
+                block_lines = []
+        elif stripped.startswith(_CODE_FENCE):
+            if block_lines:
+                yield classify_block_lines(block_lines), block_lines
+            block_lines = [stripped]
+            if len(stripped) > 2 * len(_CODE_FENCE) and stripped.endswith(_CODE_FENCE):
+                # single line fence, eg. ```code```
+                yield BlockType.CODE, block_lines
+                block_lines = []
+            else:
+                in_code = True
+        else:
+            block_lines.append(stripped)
+
+    if block_lines:
+        # an unterminated fence runs to the end of the document
+        yield (BlockType.CODE if in_code else classify_block_lines(block_lines)), block_lines
+
+
+def classify_block_lines(lines):
+    """Classify a non-code block from its stripped lines
+
+    Args:
+        lines (list): non-empty lines of one block
+
+    Returns:
+        BlockType: type of the block
+    """
+    if _HEADING_RE.match(lines[0]):
+        return BlockType.HEADING
+    if all(line.startswith(">") for line in lines):
+        return BlockType.QUOTE
+    if all(line.startswith(("- ", "* ")) for line in lines):
+        return BlockType.UNORDERED_LIST
+    for number, line in enumerate(lines, start=1):
+        match = _ORDERED_ITEM_RE.match(line)
+        if match is None or int(match.group(1)) != number:
+            return BlockType.PARAGRAPH
+    return BlockType.ORDERED_LIST
+
+
+def block_to_block_type(block):
+    """Classify a single markdown block
+
+    Args:
+        block (str): markdown block without surrounding blank lines
+
+    Returns:
+        BlockType: type of the block
+    """
+    lines = block.split("\n")
+    if (
+        len(lines) > 1
+        and lines[0].startswith(_CODE_FENCE)
+        and lines[-1].startswith(_CODE_FENCE)
+    ):
+        return BlockType.CODE
+    return classify_block_lines(lines)
+
+
+def markdown_to_blocks(markdown):
+    """Split markdown into stripped block strings
+
+    Args:
+        markdown (str | iterable): markdown text or iterable of lines
+
+    Returns:
+        list: markdown blocks
+    """
+    return ["\n".join(lines) for _, lines in iter_blocks(_iter_lines(markdown))]
+
+
+def text_to_children(text):
+    """Convert inline markdown into a list of HTMLNodes, nested where the
+    markup is nested, eg. a link inside bold text
+    """
+    profile = profiler.current
+    if is_plain_text(text):
+        # a single text leaf, skipping the inline parser
+        if profile is not None:
+            profile.record("plain", 0.0, 1)
+        return [LeafNode(None, text)]
+    if profile is None:
+        return parse_inline(text)
+    start = time.perf_counter()
+    children = parse_inline(text)
+    profile.record("inline", time.perf_counter() - start, len(children))
+    return children
+
+
+def iter_children(text):
+    """text_to_children as a generator, so the inline parse is deferred
+    until a serializer pulls the first child
+    """
+    yield from text_to_children(text)
+
+
+def block_to_html_node(block_type, lines, lazy=False):
+    """Convert the lines of one block into a ParentNode subtree
+
+    Args:
+        block_type (BlockType): type of the block
+        lines (list): lines of the block as yielded by iter_blocks
+        lazy (bool): give ParentNodes child generators, so inline markdown
+            is parsed only when the subtree is serialized
+
+    Returns:
+        ParentNode: html subtree for the block
+    """
+    children = iter_children if lazy else text_to_children
+    if block_type == BlockType.HEADING:
+        level = len(_HEADING_RE.match(lines[0]).group(1))
+        text = " ".join(lines)[level + 1:]
+        return ParentNode(f"h{level}", children(text))
+    if block_type == BlockType.CODE:
+        fence = len(_CODE_FENCE)
+        if len(lines) == 1 and len(lines[0]) > 2 * fence and lines[0].endswith(_CODE_FENCE):
+            # single line fence
+            code_lines = [lines[0][fence:-fence]]
+        elif len(lines) > 1 and lines[-1].startswith(_CODE_FENCE):
+            code_lines = lines[1:-1]
+        else:
+            # unterminated fence
+            code_lines = lines[1:]
+        code = "".join(line + "\n" for line in code_lines)
+        code_node = text_node_to_html_node(TextNode(code, TextType.CODE))
+        return ParentNode("pre", [code_node])
+    if block_type == BlockType.QUOTE:
+        text = " ".join(line.lstrip(">").strip() for line in lines)
+        return ParentNode("blockquote", children(text))
+    if block_type == BlockType.UNORDERED_LIST:
+        items = (ParentNode("li", children(line[2:])) for line in lines)
+        return ParentNode("ul", items if lazy else list(items))
+    if block_type == BlockType.ORDERED_LIST:
+        items = (
+            ParentNode("li", children(line.split(". ", maxsplit=1)[1]))
+            for line in lines
+        )
+        return ParentNode("ol", items if lazy else list(items))
+    if block_type == BlockType.PARAGRAPH:
+        return ParentNode("p", children(" ".join(lines)))
+    raise ValueError(f"Invalid block type: {block_type}")
+
+
+def iter_html_nodes(lines, frozen=False, lazy=False):
+    """Lazily convert markdown lines into one ParentNode per block
+
+    Args:
+        lines (iterable): lines of markdown, eg. an open file
+        frozen (bool): yield interned, immutable FrozenParentNodes
+        lazy (bool): yield blocks with child generators, see block_to_html_node
+
+    Yields:
+        ParentNode: html subtree for each block
+    """
+    for block_type, block_lines in iter_blocks(lines):
+        node = block_to_html_node(block_type, block_lines, lazy)
+        yield freeze(node) if frozen else node
+
+
+def markdown_to_html_node(markdown, frozen=False, lazy=False):
+    """Convert a markdown document into a single div ParentNode
+
+    Args:
+        markdown (str | iterable): markdown text or iterable of lines
+        frozen (bool): build an interned, immutable FrozenParentNode tree
+        lazy (bool): build each block only when the div is serialized, so
+            only one block's nodes are alive at a time. The tree can then
+            be serialized once, and lines are read while serializing
+
+    Raises:
+        ValueError: document has no blocks, raised on serializing when lazy;
+            or both frozen and lazy
+
+    Returns:
+        ParentNode: div containing one child per block
+    """
+    if lazy:
+        if frozen:
+            raise ValueError("Frozen nodes cannot be lazy")
+        return ParentNode("div", iter_html_nodes(_iter_lines(markdown), lazy=True))
+    children = list(iter_html_nodes(_iter_lines(markdown), frozen))
+    if frozen:
+        return freeze(ParentNode("div", children))
+    return ParentNode("div", children)
+
+
+def markdown_to_html(markdown, cache=None):
+    """Render a markdown document to the html of its div ParentNode
+
+    Args:
+        markdown (str | iterable): markdown text or iterable of lines
+        cache (RenderCache, optional): reuse html of blocks seen before
+
+    Raises:
+        ValueError: document has no blocks
+
+    Returns:
+        str: html of the document
+    """
+    if cache is None:
+        return markdown_to_html_node(markdown).to_html()
+    fragments = [
+        cache.render_block(block_type, block_lines)
+        for block_type, block_lines in iter_blocks(_iter_lines(markdown))
+    ]
+    if not fragments:
+        raise ValueError("ParentNode must have at least one child")
+    return "<div>" + "".join(fragments) + "</div>"
+
+
+def _iter_lines(markdown):
+    if isinstance(markdown, str):
+        return iter_text_lines(markdown)
+    return markdown
+
+
+def iter_text_lines(text):
+    """Iterator over the lines of a str, split like MarkdownSource.iter_lines
+    Only "\n" ends a line: unlike str.splitlines(), separators such as
+    "\x0c" or "\u2028" stay in the text, and a trailing "\r" is kept.
+    """
+    lines = text.split("\n")
+    if not lines[-1]:
+        # a final newline ends the last line instead of starting one
+        lines.pop()
+    return iter(lines)
\ No newline at end of file
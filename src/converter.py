@@ -1,21 +1,124 @@
-from textnode import TextNode, TextType
+from textnode import TextNode, TextNodeBatch, TextType
 from htmlnode import LeafNode
+from dependency_graph import local_url_path, page_url_path
 
 
-def text_node_to_html_node(text_node):
+# PageDependencies of the page being converted, None when not recording
+current_dependencies = None
+# url path -> title of every page of the site, eg. {"/about.html": "About"}
+page_titles = {}
+# url path -> url of its content hashed copy, eg. {"/ring.png": "/ring.3f2a9c0d1b4e.png"}
+asset_urls = {}
+
+
+def link_text(text, url):
+    """Text of a link; one written without text, eg. [](/about.html),
+    shows the title of the page it points to
+    """
+    if text:
+        return text
+    dependencies = current_dependencies
+    path = page_url_path(url, "/" if dependencies is None else dependencies.base)
+    if path is None:
+        return text
+    if dependencies is not None:
+        # recorded even when the page does not exist yet, so adding it
+        # renders this page again
+        dependencies.titles.add(path)
+    # a page without an h1 heading has a title of None
+    title = page_titles.get(path)
+    return text if title is None else title
+
+
+def image_src(url):
+    """Src to show the image at url with, its content hashed copy when there
+    is one; the image is noted as a dependency of the page being converted
+    """
+    dependencies = current_dependencies
+    if dependencies is None and not asset_urls:
+        return url
+    path = local_url_path(url, "/" if dependencies is None else dependencies.base)
+    if path is None:
+        return url
+    if dependencies is not None:
+        dependencies.images.add(path)
+    return asset_urls.get(path, url)
+
+
+def _image_node(text, url):
+    return LeafNode("img", "", {"src": image_src(url), "alt": text})
+
+
+# built once at import, so each conversion is a single lookup and constructor
+_HANDLERS = {
+    TextType.TEXT: lambda text, url: LeafNode(None, text),
+    TextType.BOLD: lambda text, url: LeafNode("b", text),
+    TextType.ITALIC: lambda text, url: LeafNode("i", text),
+    TextType.CODE: lambda text, url: LeafNode("code", text),
+    TextType.LINK: lambda text, url: LeafNode("a", link_text(text, url), {"href": url}),
+    TextType.IMAGE: _image_node,
+}
+# the same handlers indexed by TextNodeBatch type code
+_BATCH_HANDLERS = tuple(_HANDLERS[text_type] for text_type in TextNodeBatch.TEXT_TYPES)
+
+
+def text_node_to_html_node(text_node, index=None):
+    """Convert a TextNode, or node index of a TextNodeBatch, to a LeafNode"""
+    if isinstance(text_node, TextNodeBatch):
+        if index is None:
+            raise TypeError("index is required for a TextNodeBatch")
+        return _BATCH_HANDLERS[text_node.types[index]](
+            text_node.text_of(index), text_node.url_of(index)
+        )
     if not isinstance(text_node, TextNode):
         raise TypeError("Expected a TextNode object")
 
-    handlers = {
-        TextType.TEXT: lambda node: LeafNode(None, node.text),
-        TextType.BOLD: lambda node: LeafNode("b", node.text),
-        TextType.ITALIC: lambda node: LeafNode("i", node.text),
-        TextType.CODE: lambda node: LeafNode("code", node.text),
-        TextType.LINK: lambda node: LeafNode("a", node.text, {"href": node.url}),
-        TextType.IMAGE: lambda node: LeafNode("img", "", {"src": node.url, "alt": node.text}),
-    }
-    
-    if text_node.text_type not in handlers:
+    handler = _HANDLERS.get(text_node.text_type)
+    if handler is None:
         raise ValueError(f"Invalid text type: {text_node.text_type}")
     
-    return handlers[text_node.text_type](text_node)
\ No newline at end of file
+    return handler(text_node.text, text_node.url)
+
+
+def text_nodes_to_html_nodes(text_nodes, lazy=False):
+    """Convert many TextNodes, eg. a whole paragraph, in one call
+
+    Args:
+        text_nodes (iterable | TextNodeBatch): TextNodes to convert. A batch
+            is rendered straight from its columns, without TextNodes
+        lazy (bool): yield LeafNodes one at a time instead of returning a list
+
+    Raises:
+        TypeError: item is not a TextNode
+        ValueError: Invalid text type
+
+    Returns:
+        list | generator: LeafNodes in the same order
+    """
+    if isinstance(text_nodes, TextNodeBatch):
+        html_nodes = _iter_batch_html_nodes(text_nodes)
+    else:
+        html_nodes = _iter_html_nodes(text_nodes)
+    if lazy:
+        return html_nodes
+    return list(html_nodes)
+
+
+def _iter_html_nodes(text_nodes):
+    handlers = _HANDLERS
+    for text_node in text_nodes:
+        if not isinstance(text_node, TextNode):
+            raise TypeError("Expected a TextNode object")
+        handler = handlers.get(text_node.text_type)
+        if handler is None:
+            raise ValueError(f"Invalid text type: {text_node.text_type}")
+        yield handler(text_node.text, text_node.url)
+
+
+def _iter_batch_html_nodes(batch):
+    handlers = _BATCH_HANDLERS
+    text = batch.text
+    urls = batch.urls
+    for start, end, type_code, url_index in batch.spans():
+        yield handlers[type_code](text[start:end],
+                                  None if url_index < 0 else urls[url_index])
\ No newline at end of file
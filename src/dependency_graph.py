@@ -0,0 +1,147 @@
+"""Inputs of each page besides its own source and the template.
+
+While a page is converted, converter records what its html was built
+from into a PageDependencies: the pages whose titles it shows (links
+written without text, eg. [](/about.html)) and the local images it shows.
+A DependencyGraph inverts those records, so after a change only the pages
+showing a changed title or image are rendered again.
+"""
+import posixpath
+from urllib.parse import urlsplit
+
+
+class PageDependencies:
+    """Url paths a page's html depends on, recorded while converting it"""
+    __slots__ = ("base", "titles", "images")
+
+    def __init__(self, base="/", titles=(), images=()):
+        # url directory of the page, relative links are resolved against it
+        self.base = base
+        # pages whose titles are shown, eg. {"/blog/post.html"}
+        self.titles = set(titles)
+        # local images shown, eg. {"/images/ring.png"}
+        self.images = set(images)
+
+    def __bool__(self):
+        return bool(self.titles or self.images)
+
+    def __eq__(self, other):
+        if not isinstance(other, PageDependencies):
+            return False
+        return self.titles == other.titles and self.images == other.images
+
+    def update(self, other):
+        """Add the dependencies of other, eg. of one block of the page"""
+        self.titles.update(other.titles)
+        self.images.update(other.images)
+
+    def to_dict(self):
+        """Sorted lists for the build manifest"""
+        return {"titles": sorted(self.titles), "images": sorted(self.images)}
+
+    @classmethod
+    def from_dict(cls, data, base="/"):
+        return cls(base, data.get("titles", ()), data.get("images", ()))
+
+    def __repr__(self):
+        return (f"PageDependencies({self.base}, titles: {sorted(self.titles)}, "
+                f"images: {sorted(self.images)})")
+
+
+class DependencyGraph:
+    """Reverse index from titles and images to the pages showing them"""
+
+    def __init__(self):
+        self._pages = {}
+        self._by_title = {}
+        self._by_image = {}
+
+    def __len__(self):
+        return len(self._pages)
+
+    def __contains__(self, rel_path):
+        return rel_path in self._pages
+
+    def add(self, rel_path, dependencies):
+        """Record the dependencies of a page, replacing any recorded before"""
+        self.remove(rel_path)
+        self._pages[rel_path] = dependencies
+        for path in dependencies.titles:
+            self._by_title.setdefault(path, set()).add(rel_path)
+        for path in dependencies.images:
+            self._by_image.setdefault(path, set()).add(rel_path)
+
+    def remove(self, rel_path):
+        dependencies = self._pages.pop(rel_path, None)
+        if dependencies is None:
+            return
+        _discard(self._by_title, dependencies.titles, rel_path)
+        _discard(self._by_image, dependencies.images, rel_path)
+
+    def get(self, rel_path):
+        return self._pages.get(rel_path)
+
+    def dependents(self, titles=(), images=()):
+        """Pages to render again after the given titles or images changed
+
+        Args:
+            titles (iterable): url paths of pages added, removed or retitled
+            images (iterable): url paths of changed images
+
+        Returns:
+            set: relative source paths
+        """
+        pages = set()
+        for path in titles:
+            pages.update(self._by_title.get(path, ()))
+        for path in images:
+            pages.update(self._by_image.get(path, ()))
+        return pages
+
+    def __repr__(self):
+        return (f"DependencyGraph(pages: {len(self._pages)}, "
+                f"titles: {len(self._by_title)}, images: {len(self._by_image)})")
+
+
+def _discard(index, paths, rel_path):
+    for path in paths:
+        pages = index.get(path)
+        if pages is not None:
+            pages.discard(rel_path)
+            if not pages:
+                del index[path]
+
+
+def changed_paths(old, new):
+    """Url paths added, removed or mapped to another value between two
+    maps, eg. pages retitled or images renamed
+    """
+    return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+
+def local_url_path(url, base="/"):
+    """Absolute path of a url on this site, or None for other sites
+    eg. ../images/ring.png linked from /blog/ -> /images/ring.png
+    """
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = posixpath.normpath(posixpath.join(base, parts.path))
+    if parts.path.endswith("/") and path != "/":
+        path += "/"
+    return path
+
+
+def page_url_path(url, base="/"):
+    """Url path of the page a link points to, or None for other sites
+    Directories and paths without an extension resolve the way the pages
+    are served, eg. /blog/ -> /blog/index.html and /about -> /about.html
+    """
+    path = local_url_path(url, base)
+    if path is None:
+        return None
+    if path.endswith("/"):
+        return path + "index.html"
+    if not posixpath.splitext(path)[1]:
+        return path + ".html"
+    return path
@@ -0,0 +1,214 @@
+import html
+import os
+import sys
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import converter
+from dependency_graph import DependencyGraph, PageDependencies, changed_paths
+from page_template import PageTemplate
+from render_cache import RenderCache
+from site_builder import (
+    default_title,
+    extract_title,
+    iter_sources,
+    read_file,
+    render_html,
+    url_base,
+    url_path,
+)
+
+
+class SiteState:
+    """Rendered pages of a content directory, held in memory
+    refresh() stats every source and re-renders only the pages whose
+    source or template changed, plus the pages showing the title of a page
+    added, removed or retitled. Block html is kept in a RenderCache, so an
+    edit re-parses only the blocks that actually changed.
+
+    Sources are read into a str instead of a MarkdownSource: an editor
+    truncating a file in place while it is mapped would kill the server
+    with SIGBUS, where a read only sees the shorter file.
+    """
+
+    def __init__(self, content_dir, template_path, cache=None):
+        self.content_dir = content_dir
+        self.template_path = template_path
+        self.cache = cache if cache is not None else RenderCache()
+        # url path, eg. "/blog/post.html" -> utf-8 html
+        self.pages = {}
+        # rel_path -> (mtime_ns, size) of the rendered source
+        self._sources = {}
+        # url path -> title of every page
+        self.titles = {}
+        self.graph = DependencyGraph()
+        self._template = None
+        self._template_stat = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Re-render new and changed pages and drop removed ones
+
+        Returns:
+            list: relative source paths rendered or removed
+        """
+        with self._lock:
+            changed = []
+            # every page embeds the template
+            render_all = False
+            try:
+                template_stat = _stat_key(os.stat(self.template_path))
+                if template_stat != self._template_stat:
+                    self._template = PageTemplate(read_file(self.template_path))
+                    self._template_stat = template_stat
+                    render_all = True
+            except OSError:
+                # eg. briefly missing while an editor saves it: keep the last
+                # template and read it again on the next refresh
+                if self._template is None:
+                    raise
+
+            seen = set()
+            stale = {}
+            for rel_path in iter_sources(self.content_dir):
+                seen.add(rel_path)
+                source_path = os.path.join(self.content_dir, rel_path)
+                try:
+                    stat = _stat_key(os.stat(source_path))
+                except FileNotFoundError:
+                    # removed while scanning, dropped below
+                    seen.discard(rel_path)
+                    continue
+                if not render_all and self._sources.get(rel_path) == stat:
+                    continue
+                stale[rel_path] = stat
+
+            old_titles = dict(self.titles)
+            for rel_path in self._sources.keys() - seen:
+                del self._sources[rel_path]
+                self.pages.pop(url_path(rel_path), None)
+                self.titles.pop(url_path(rel_path), None)
+                self.graph.remove(rel_path)
+                changed.append(rel_path)
+            for rel_path in stale:
+                try:
+                    source_path = os.path.join(self.content_dir, rel_path)
+                    title = extract_title(read_source(source_path))
+                except (OSError, ValueError):
+                    # unreadable, or no h1 heading
+                    title = None
+                self.titles[url_path(rel_path)] = title
+            for rel_path in self.graph.dependents(
+                    titles=changed_paths(old_titles, self.titles)):
+                if rel_path not in stale:
+                    stale[rel_path] = self._sources[rel_path]
+
+            for rel_path, stat in stale.items():
+                self.pages[url_path(rel_path)] = self._render(rel_path)
+                self._sources[rel_path] = stat
+                changed.append(rel_path)
+            return changed
+
+    def _render(self, rel_path):
+        source_path = os.path.join(self.content_dir, rel_path)
+        dependencies = PageDependencies(url_base(rel_path))
+        page_titles = converter.page_titles
+        converter.page_titles = self.titles
+        converter.current_dependencies = dependencies
+        try:
+            page = render_html(read_source(source_path), self._template, self.cache,
+                               fallback_title=default_title(rel_path))
+        except (OSError, ValueError) as error:
+            # show the problem in the browser instead of stopping the server
+            page = f"<pre>{html.escape(source_path)}: {html.escape(str(error))}</pre>"
+        finally:
+            converter.current_dependencies = None
+            converter.page_titles = page_titles
+        self.graph.add(rel_path, dependencies)
+        return page.encode("utf-8")
+
+    def get(self, path):
+        """Html bytes for a request path, or None when there is no such page"""
+        path = path.split("?", 1)[0].split("#", 1)[0]
+        if path.endswith("/"):
+            path += "index.html"
+        page = self.pages.get(path)
+        if page is None and not path.endswith(".html"):
+            page = self.pages.get(path + ".html")
+        return page
+
+
+def read_source(path):
+    """Markdown of a source as a str, with line endings as in the file, so
+    it renders exactly like the MarkdownSource a build maps
+    """
+    return read_file(path, newline="")
+
+
+def watch(site, interval=0.05, stop_event=None):
+    """Refresh site every interval seconds until stop_event is set"""
+    stop_event = stop_event or threading.Event()
+    while not stop_event.wait(interval):
+        try:
+            changed = site.refresh()
+        except Exception as error:
+            # keep watching, the next poll may succeed
+            print(f"refresh failed: {error}", file=sys.stderr)
+            continue
+        if changed:
+            print(f"re-rendered {', '.join(changed)}")
+
+
+def make_handler(site):
+    """Request handler class serving the pages of site from memory"""
+
+    class SiteRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self._respond(send_body=True)
+
+        def do_HEAD(self):
+            self._respond(send_body=False)
+
+        def _respond(self, send_body):
+            page = site.get(self.path)
+            if page is None:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            if send_body:
+                self.wfile.write(page)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SiteRequestHandler
+
+
+def serve(content_dir, template_path, host="localhost", port=8888, watch_changes=False,
+          interval=0.05):
+    """Render the site into memory and serve it until interrupted"""
+    site = SiteState(content_dir, template_path)
+    site.refresh()
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    stop_event = threading.Event()
+    if watch_changes:
+        watcher = threading.Thread(target=watch, args=(site, interval, stop_event),
+                                   daemon=True)
+        watcher.start()
+    print(f"serving {len(site.pages)} pages on http://{host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        server.server_close()
+
+
+def _stat_key(stat):
+    return stat.st_mtime_ns, stat.st_size
\ No newline at end of file
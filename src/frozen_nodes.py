@@ -0,0 +1,217 @@
+"""Immutable, hashable nodes interned so identical subtrees exist once.
+
+freeze() converts a TextNode or HTMLNode tree into frozen nodes taken
+from weak intern tables: equal leaves, props and whole subtrees anywhere
+in a build share one object, and are freed once no tree uses them.
+Frozen nodes render exactly like the mutable ones.
+"""
+import weakref
+
+from htmlnode import LeafNode, ParentNode, escape_text, props_to_html
+from textnode import TextNode
+
+
+_text_nodes = weakref.WeakValueDictionary()
+_props = weakref.WeakValueDictionary()
+_leaves = weakref.WeakValueDictionary()
+_parents = weakref.WeakValueDictionary()
+
+
+class FrozenProps(dict):
+    """Read-only, hashable props dict
+    Equal like dicts, whatever the order of the items, so the hash ignores
+    order too. Props interned in another order share the first one seen,
+    and render their attributes in its order.
+    """
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenProps is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+
+class FrozenTextNode(TextNode):
+    __slots__ = ("_hash", "__weakref__")
+
+    def __init__(self, text, text_type, url=None):
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "text_type", text_type)
+        object.__setattr__(self, "url", url)
+        object.__setattr__(self, "_hash", hash((text, text_type, url)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenTextNode is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+
+class FrozenLeafNode(LeafNode):
+    __slots__ = ("_hash", "__weakref__")
+
+    def __init__(self, tag=None, value="", props=None):
+        if value is None:
+            raise ValueError("LeafNode must have a value")
+        props = _frozen_props(props)
+        object.__setattr__(self, "tag", tag)
+        object.__setattr__(self, "_value", value)
+        object.__setattr__(self, "_props", props)
+        # never invalidated, so rendered once up front
+        object.__setattr__(self, "_value_html", escape_text(value))
+        object.__setattr__(self, "_props_html", props_to_html(props))
+        object.__setattr__(self, "_hash", hash((tag, value, props)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenLeafNode is immutable")
+
+    def props_to_html(self):
+        # FrozenProps cannot change, no snapshot to compare
+        return self._props_html
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, FrozenLeafNode):
+            return False
+        return (self._hash == other._hash
+                and self.tag == other.tag
+                and self.value == other.value
+                and self.props == other.props)
+
+    def __hash__(self):
+        return self._hash
+
+
+class FrozenParentNode(ParentNode):
+    __slots__ = ("_hash", "__weakref__")
+
+    def __init__(self, tag, children, props=None):
+        if tag is None:
+            raise ValueError("ParentNode must have a tag")
+        if not children:
+            raise ValueError("ParentNode must have at least one child")
+        children = tuple(children)
+        if not all(isinstance(child, (FrozenLeafNode, FrozenParentNode))
+                   for child in children):
+            raise TypeError("All children must be frozen nodes")
+        props = _frozen_props(props)
+        object.__setattr__(self, "tag", tag)
+        object.__setattr__(self, "_value", None)
+        object.__setattr__(self, "_value_html", None)
+        object.__setattr__(self, "children", children)
+        object.__setattr__(self, "_props", props)
+        object.__setattr__(self, "_props_html", props_to_html(props))
+        object.__setattr__(self, "_hash", hash((tag, children, props)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenParentNode is immutable")
+
+    def props_to_html(self):
+        # FrozenProps cannot change, no snapshot to compare
+        return self._props_html
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, FrozenParentNode):
+            return False
+        return (self._hash == other._hash
+                and self.tag == other.tag
+                and self.props == other.props
+                and self.children == other.children)
+
+    def __hash__(self):
+        return self._hash
+
+
+def _frozen_props(props):
+    if props is None or isinstance(props, FrozenProps):
+        return props
+    return FrozenProps(props)
+
+
+def intern_props(props):
+    """Shared FrozenProps equal to props, or None"""
+    if props is None:
+        return None
+    key = frozenset(props.items())
+    frozen = _props.get(key)
+    if frozen is None:
+        frozen = FrozenProps(props)
+        _props[key] = frozen
+    return frozen
+
+
+def intern_text_node(text, text_type, url=None):
+    """Shared FrozenTextNode with these fields"""
+    key = (text, text_type, url)
+    node = _text_nodes.get(key)
+    if node is None:
+        node = FrozenTextNode(text, text_type, url)
+        _text_nodes[key] = node
+    return node
+
+
+def intern_leaf(tag, value, props=None):
+    """Shared FrozenLeafNode with these fields"""
+    props = intern_props(props)
+    key = (tag, value, props)
+    node = _leaves.get(key)
+    if node is None:
+        node = FrozenLeafNode(tag, value, props)
+        _leaves[key] = node
+    return node
+
+
+def intern_parent(tag, children, props=None):
+    """Shared FrozenParentNode of already frozen children"""
+    props = intern_props(props)
+    key = (tag, tuple(children), props)
+    node = _parents.get(key)
+    if node is None:
+        node = FrozenParentNode(tag, key[1], props)
+        _parents[key] = node
+    return node
+
+
+def freeze(node):
+    """Frozen, interned copy of a TextNode or HTMLNode tree
+    Walks the tree with an explicit stack, so nesting depth is not limited
+    by the recursion limit.
+
+    Raises:
+        TypeError: node is not a TextNode, LeafNode or ParentNode
+        ValueError: ParentNode without a tag or children
+
+    Returns:
+        FrozenTextNode | FrozenLeafNode | FrozenParentNode
+    """
+    if isinstance(node, TextNode):
+        return intern_text_node(node.text, node.text_type, node.url)
+
+    frozen = []
+    stack = [(node, False)]
+    while stack:
+        item, children_done = stack.pop()
+        if isinstance(item, (FrozenLeafNode, FrozenParentNode)):
+            frozen.append(item)
+        elif isinstance(item, LeafNode):
+            frozen.append(intern_leaf(item.tag, item.value, item.props))
+        elif isinstance(item, ParentNode):
+            if not item.children:
+                raise ValueError("ParentNode must have at least one child")
+            if not children_done:
+                stack.append((item, True))
+                stack.extend((child, False) for child in reversed(item.children))
+                continue
+            count = len(item.children)
+            children = frozen[-count:]
+            del frozen[-count:]
+            frozen.append(intern_parent(item.tag, children, item.props))
+        else:
+            raise TypeError(f"Cannot freeze {type(item).__name__}")
+    return frozen[0]
\ No newline at end of file
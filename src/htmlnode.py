@@ -1,20 +1,51 @@
+from collections.abc import Iterator
+
+
 class HTMLNode:
+    # the escaped value is cached until value is reassigned; the serialized
+    # props are cached with a snapshot of the props items, so changes made
+    # to the dict in place are seen too
+    __slots__ = ("tag", "children", "_value", "_props", "_value_html", "_props_html",
+                 "_props_key")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
         self.children = children
         self.props = props
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, new_value):
+        self._value = new_value
+        self._value_html = None
+
+    @property
+    def props(self):
+        return self._props
+
+    @props.setter
+    def props(self, new_props):
+        self._props = new_props
+        self._props_html = None
+        self._props_key = None
     
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
     
     def props_to_html(self):
-        if self.props is None:
+        props = self._props
+        if not props:
             return ""
-        return " " + " ".join(
-            f'{key}="{value}"'
-            for key, value in self.props.items()
-        )
+        # comparing the items is cheaper than escaping and joining them again
+        key = tuple(props.items())
+        if key != self._props_key:
+            self._props_html = props_to_html(props)
+            self._props_key = key
+        return self._props_html
     
     def __repr__(self):
         tag = self.tag
@@ -25,11 +56,19 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag=None, value="", props=None):
         if value is None:
             raise ValueError("LeafNode must have a value")
 
-        super().__init__(tag, value, None, props)
+        # assign the slots directly, skipping the property setters
+        self.tag = tag
+        self._value = value
+        self._props = props
+        self._value_html = None
+        self._props_html = None
+        self._props_key = None
         
     @property
     def children(self):
@@ -41,20 +80,33 @@ class LeafNode(HTMLNode):
             raise ValueError("LeafNode cannot have children")
     
     def to_html(self):
-        if self.value is None:
-            raise ValueError("LeafNode must have a value")
+        html = self._value_html
+        if html is None:
+            if self._value is None:
+                raise ValueError("LeafNode must have a value")
+            html = self._value_html = escape_text(self._value)
         if self.tag is None:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            return html
+        return f"<{self.tag}{self.props_to_html()}>{html}</{self.tag}>"
 
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
 
 
 class ParentNode(HTMLNode):
+    """Html element with child nodes
+    children may also be an iterator, eg. a generator, consumed once when
+    the node is serialized: children are then built only as they are
+    written, and are checked then instead of here.
+    """
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         if tag is None:
             raise ValueError("ParentNode must have a tag")
+        if type(children) is not list and isinstance(children, Iterator):
+            super().__init__(tag=tag, value=None, children=children, props=props)
+            return
         if not children:
             raise ValueError("ParentNode must have at least one child")
         if not all(isinstance(child, HTMLNode) for child in children):
@@ -63,15 +115,127 @@ class ParentNode(HTMLNode):
         super().__init__(tag=tag, value=None, children=children, props=props)
     
     def to_html(self):
-        if self.tag is None:
-            raise ValueError("ParentNode must have a tag")
-        if not self.children:
-            raise ValueError("ParentNode must have at least one child")
-        opening_tag = f"<{self.tag}{self.props_to_html()}>"
-        closing_tag = f"</{self.tag}>"
-        child_html = list(map(lambda child: child.to_html(), self.children))
-        inner_html = "".join(child_html)
-        return opening_tag + inner_html + closing_tag
+        return "".join(iter_html(self))
     
     def __repr__(self):
-        return f"ParentNode({self.tag}, {self.children}, {self.props})"
\ No newline at end of file
+        return f"ParentNode({self.tag}, {self.children}, {self.props})"
+
+
+class _ConsumedChildren(tuple):
+    """Children of a lazy ParentNode after its iterator was serialized"""
+
+
+_CONSUMED = _ConsumedChildren()
+_END = object()
+
+
+class _PendingChildren:
+    """Rest of a lazy ParentNode's children, pulled one at a time"""
+    __slots__ = ("children",)
+
+    def __init__(self, children):
+        self.children = children
+
+
+def iter_html(node):
+    """Yield the html of a node tree as chunks
+    Walks the tree with an explicit stack, so nesting depth is not limited
+    by the recursion limit and no intermediate strings are built per level.
+    Lazy children are pulled from their iterator only when their html is
+    next, so each child can be freed once written.
+
+    Args:
+        node (HTMLNode): root of the tree
+
+    Raises:
+        ValueError: ParentNode without a tag or children, or lazy children
+            serialized a second time
+        TypeError: lazy child that is not an HTMLNode
+
+    Yields:
+        str: consecutive pieces of the html
+    """
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            # closing tag pushed below the children of a ParentNode
+            yield item
+        elif isinstance(item, ParentNode):
+            if item.tag is None:
+                raise ValueError("ParentNode must have a tag")
+            children = item.children
+            if type(children) is not list and isinstance(children, Iterator):
+                item.children = _CONSUMED
+                first = _next_child(children)
+                if first is _END:
+                    raise ValueError("ParentNode must have at least one child")
+                yield f"<{item.tag}{item.props_to_html()}>"
+                stack.append(f"</{item.tag}>")
+                stack.append(_PendingChildren(children))
+                stack.append(first)
+                continue
+            if not children:
+                if children is _CONSUMED:
+                    raise ValueError("Lazy ParentNode children can only be rendered once")
+                raise ValueError("ParentNode must have at least one child")
+            yield f"<{item.tag}{item.props_to_html()}>"
+            stack.append(f"</{item.tag}>")
+            stack.extend(reversed(children))
+        elif type(item) is _PendingChildren:
+            child = _next_child(item.children)
+            if child is not _END:
+                stack.append(item)
+                stack.append(child)
+        else:
+            yield item.to_html()
+
+
+def _next_child(children):
+    child = next(children, _END)
+    if child is not _END and not isinstance(child, HTMLNode):
+        raise TypeError("All children must be instances of HTMLNode")
+    return child
+
+
+def write_html(node, fp):
+    """Write the html of a node tree to a file-like object chunk by chunk
+
+    Args:
+        node (HTMLNode): root of the tree
+        fp: object with a write(str) method, eg. an open text file
+    """
+    write = fp.write
+    for chunk in iter_html(node):
+        write(chunk)
+
+
+def escape_text(text):
+    """Escape &, < and > in text content, eg. a LeafNode value"""
+    if not isinstance(text, str):
+        text = str(text)
+    # most text has nothing to escape, and the membership tests are cheaper
+    # than the replaces or a regex search
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value):
+    """Escape &, <, > and double quotes in a double quoted attribute value"""
+    if not isinstance(value, str):
+        value = str(value)
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return (value.replace("&", "&amp;").replace("<", "&lt;")
+                .replace(">", "&gt;").replace('"', "&quot;"))
+    return value
+
+
+def props_to_html(props):
+    """Attribute string of a props dict, eg. ' href="/"', or "" for None"""
+    if not props:
+        return ""
+    return "".join(
+        f' {key}="{escape_attribute(value)}"'
+        for key, value in props.items()
+    )
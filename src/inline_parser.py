@@ -0,0 +1,386 @@
+"""Nested inline markdown parser.
+
+Parses **strong**, *emphasis* / _emphasis_, `code`, links and images into
+nested html nodes, eg. `**bold _italic_**` becomes <b>bold <i>italic</i></b>
+and links may contain emphasis. Emphasis follows the CommonMark
+delimiter-run rules: runs of * and _ are collected on a delimiter stack
+while the text is scanned once, pairs are matched with the "openers
+bottom" optimization, and the node tree is built in a final pass. Every
+step is linear, so adversarial input such as long runs of * never causes
+rescans. Unmatched delimiters are kept as literal text.
+"""
+import re
+import string
+import unicodedata
+from functools import lru_cache
+
+from converter import image_src, link_text
+from htmlnode import LeafNode, ParentNode
+from markdown_parser import stats
+
+
+_SPECIAL_RE = re.compile(r"[*_`!\[\]]")
+_BACKTICKS_RE = re.compile(r"`+")
+_ASCII_PUNCTUATION = frozenset(string.punctuation)
+
+
+class _Delimiter:
+    """A run of * or _, linked into the delimiter stack"""
+    __slots__ = ("char", "count", "length", "can_open", "can_close",
+                 "opens", "closes", "previous", "next")
+
+    def __init__(self, char, length, can_open, can_close):
+        self.char = char
+        # characters not yet used by a match
+        self.count = length
+        self.length = length
+        self.can_open = can_open
+        self.can_close = can_close
+        # tags opened at this run in the order they were matched, eg. "bi",
+        # and the number closed; a str and an int, so the many runs that
+        # never match allocate nothing for them
+        self.opens = ""
+        self.closes = 0
+        self.previous = None
+        self.next = None
+
+
+class _Bracket:
+    """A "[" or "![" that may start a link or image"""
+    __slots__ = ("image", "bottom", "links_before", "url")
+
+    def __init__(self, image, bottom, links_before):
+        self.image = image
+        # last delimiter before the bracket, bounds emphasis inside it
+        self.bottom = bottom
+        # links formed before the bracket; a later one makes it inactive
+        self.links_before = links_before
+        # set once the bracket is closed as a link or image
+        self.url = None
+
+
+# item closing the element of the last matched bracket
+_BRACKET_END = object()
+
+
+def parse_inline(text):
+    """Parse inline markdown into a list of nested HTMLNodes
+
+    Args:
+        text (str): markdown text of a single block
+
+    Returns:
+        list: LeafNodes and ParentNodes in document order
+    """
+    stats.scanned += 1
+    items = []
+    # sentinel below every delimiter of the stack
+    head = _Delimiter("", 0, False, False)
+    tail = head
+    brackets = []
+    links = 0
+    code_spans = _CodeSpans(text)
+    next_paren = _NextParen(text)
+
+    length = len(text)
+    cursor = 0
+    while True:
+        match = _SPECIAL_RE.search(text, cursor)
+        if match is None:
+            break
+        index = match.start()
+        if index > cursor:
+            items.append(text[cursor:index])
+        char = text[index]
+
+        if char == "*" or char == "_":
+            end = index + 1
+            while end < length and text[end] == char:
+                end += 1
+            before = text[index - 1] if index else " "
+            after = text[end] if end < length else " "
+            can_open, can_close = _flanking(char, before, after)
+            if can_open or can_close:
+                delimiter = _Delimiter(char, end - index, can_open, can_close)
+                delimiter.previous = tail
+                tail.next = delimiter
+                tail = delimiter
+                items.append(delimiter)
+            else:
+                items.append(text[index:end])
+            cursor = end
+
+        elif char == "`":
+            end = index + 1
+            while end < length and text[end] == "`":
+                end += 1
+            close = code_spans.find_close(end, end - index)
+            if close == -1:
+                items.append(text[index:end])
+                cursor = end
+            else:
+                items.append(LeafNode("code", text[end:close]))
+                cursor = close + end - index
+
+        elif char == "!":
+            if text.startswith("[", index + 1):
+                bracket = _Bracket(True, tail, links)
+                brackets.append(bracket)
+                items.append(bracket)
+                cursor = index + 2
+            else:
+                items.append("!")
+                cursor = index + 1
+
+        elif char == "[":
+            bracket = _Bracket(False, tail, links)
+            brackets.append(bracket)
+            items.append(bracket)
+            cursor = index + 1
+
+        else:  # "]"
+            cursor = index + 1
+            bracket = brackets.pop() if brackets else None
+            if bracket is None:
+                items.append("]")
+                continue
+            # links may not contain links
+            if not bracket.image and bracket.links_before != links:
+                items.append("]")
+                continue
+            close = next_paren.find(index + 2) if text.startswith("(", index + 1) else -1
+            if close == -1:
+                items.append("]")
+                continue
+            bracket.url = text[index + 2:close]
+            # emphasis inside the brackets is resolved now, so it never
+            # pairs with delimiters outside the link
+            _process_emphasis(bracket.bottom)
+            tail = bracket.bottom
+            items.append(_BRACKET_END)
+            if not bracket.image:
+                links += 1
+            cursor = close + 1
+
+    if cursor < length:
+        items.append(text[cursor:])
+    _process_emphasis(head)
+    return _build_nodes(items)
+
+
+# the same few character pairs surround most runs
+@lru_cache(maxsize=4096)
+def _flanking(char, before, after):
+    """(can_open, can_close) of a delimiter run between before and after"""
+    before_space = before.isspace()
+    after_space = after.isspace()
+    before_punctuation = _is_punctuation(before)
+    after_punctuation = _is_punctuation(after)
+    left = not after_space and (
+        not after_punctuation or before_space or before_punctuation)
+    right = not before_space and (
+        not before_punctuation or after_space or after_punctuation)
+    if char == "*":
+        return left, right
+    # _ does not emphasize inside words
+    return (left and (not right or before_punctuation),
+            right and (not left or after_punctuation))
+
+
+def _is_punctuation(char):
+    if char in _ASCII_PUNCTUATION:
+        return True
+    return char > "\x7f" and unicodedata.category(char)[0] in "PS"
+
+
+class _CodeSpans:
+    """Finds closing backtick runs in linear total time
+    All runs are indexed by length on first use; a pointer per length only
+    moves forward because openers are found left to right.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.runs = None
+        self.positions = {}
+
+    def find_close(self, start, size):
+        """Start of the first run of exactly size backticks at or after start"""
+        if self.runs is None:
+            self.runs = {}
+            for match in _BACKTICKS_RE.finditer(self.text):
+                self.runs.setdefault(match.end() - match.start(), []).append(match.start())
+        runs = self.runs.get(size)
+        if runs is None:
+            return -1
+        position = self.positions.get(size, 0)
+        while position < len(runs) and runs[position] < start:
+            position += 1
+        self.positions[size] = position
+        return runs[position] if position < len(runs) else -1
+
+
+class _NextParen:
+    """Finds the next ")" without rescanning text already searched"""
+
+    def __init__(self, text):
+        self.text = text
+        self.start = 0
+        self.found = -2
+
+    def find(self, start):
+        # queries only move forward, so the last answer stays valid until
+        # start passes it
+        if self.found == -1 or (self.found >= start >= self.start):
+            return self.found
+        self.start = start
+        self.found = self.text.find(")", start)
+        return self.found
+
+
+def _process_emphasis(bottom):
+    """Match the delimiters above bottom into pairs and unlink them all"""
+    if bottom.next is None:
+        return
+    openers_bottom = {}
+    closer = bottom.next
+    while closer is not None:
+        if not closer.can_close:
+            closer = closer.next
+            continue
+        key = (closer.char, closer.can_open, closer.length % 3)
+        limit = openers_bottom.get(key, bottom)
+        opener = closer.previous
+        while opener is not limit and opener is not bottom:
+            if opener.char == closer.char and opener.can_open and not (
+                (closer.can_open or opener.can_close)
+                and (opener.length + closer.length) % 3 == 0
+                and not (opener.length % 3 == 0 and closer.length % 3 == 0)
+            ):
+                break
+            opener = opener.previous
+        else:
+            openers_bottom[key] = closer.previous
+            if not closer.can_open:
+                _unlink(closer)
+            closer = closer.next
+            continue
+
+        used = 2 if opener.count >= 2 and closer.count >= 2 else 1
+        tag = "b" if used == 2 else "i"
+        opener.count -= used
+        closer.count -= used
+        opener.opens += tag
+        closer.closes += 1
+        # delimiters between the pair can no longer match
+        opener.next = closer
+        closer.previous = opener
+        if opener.count == 0:
+            _unlink(opener)
+        if closer.count == 0:
+            following = closer.next
+            _unlink(closer)
+            closer = following
+    bottom.next = None
+
+
+def _unlink(delimiter):
+    delimiter.previous.next = delimiter.next
+    if delimiter.next is not None:
+        delimiter.next.previous = delimiter.previous
+
+
+def _build_nodes(items):
+    """Turn the scanned items and matched pairs into a node tree
+    Items are popped as they are used, so on giant texts the scanned
+    items are freed while the tree grows instead of both peaking together.
+    """
+    # (tag, url, children) of each open element above the root
+    frames = []
+    children = []
+    root = children
+    # adjacent literal pieces, joined into one text leaf
+    texts = []
+    items.reverse()
+    pop = items.pop
+    while items:
+        item = pop()
+        kind = type(item)
+        if kind is str:
+            texts.append(item)
+            continue
+        if kind is _Delimiter:
+            # unmatched runs stay linked to their neighbours, which would
+            # keep them alive until the cyclic garbage collector runs
+            item.previous = item.next = None
+            if not item.opens and not item.closes:
+                texts.append(item.char * item.count)
+                continue
+            # closing tags use the left of the run, opening tags the right
+            for _ in range(item.closes):
+                children = _close_frame(frames, children, texts)
+                texts = []
+            if item.count:
+                texts.append(item.char * item.count)
+            for tag in reversed(item.opens):
+                if texts:
+                    children.append(LeafNode(None, "".join(texts)))
+                    texts = []
+                frames.append((tag, None, children))
+                children = []
+        elif kind is _Bracket:
+            if item.url is None:
+                texts.append("![" if item.image else "[")
+                continue
+            if texts:
+                children.append(LeafNode(None, "".join(texts)))
+                texts = []
+            frames.append(("img" if item.image else "a", item.url, children))
+            children = []
+        elif item is _BRACKET_END:
+            children = _close_frame(frames, children, texts)
+            texts = []
+        else:
+            if texts:
+                children.append(LeafNode(None, "".join(texts)))
+                texts = []
+            children.append(item)
+    if texts:
+        children.append(LeafNode(None, "".join(texts)))
+    return root
+
+
+def _close_frame(frames, children, texts):
+    """Build the innermost open element and return its parent's children"""
+    tag, url, parent = frames.pop()
+    props = None if url is None else {"href": url}
+    if tag == "img":
+        alt = _plain_text(children) + "".join(texts)
+        node = LeafNode("img", "", {"src": image_src(url), "alt": alt})
+    elif not children:
+        # plain content needs no separate text leaf
+        value = "".join(texts)
+        if tag == "a":
+            value = link_text(value, url)
+        node = LeafNode(tag, value, props)
+    else:
+        if texts:
+            children.append(LeafNode(None, "".join(texts)))
+        node = ParentNode(tag, children, props)
+    parent.append(node)
+    return parent
+
+
+def _plain_text(nodes):
+    """Text content of nodes, used as the alt text of images"""
+    parts = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ParentNode):
+            stack.extend(reversed(node.children))
+        elif node.tag == "img":
+            parts.append(node.props["alt"])
+        else:
+            parts.append(node.value)
+    return "".join(parts)
@@ -1,33 +1,109 @@
-from textnode import TextNode, TextType
-from htmlnode import HTMLNode
-
-
-def main():
-    node1 = TextNode("This is a text node", 
-                     TextType.LINK, 
-                     "https://www.boot.dev)")
-    node2 = TextNode("This is a text node", 
-                     TextType.LINK, 
-                     "https://www.boot.dev)")
-    node3 = TextNode("This is bold text", TextType.BOLD)
-    
-    print(repr(node1))
-    print(repr(node2))
-    print(repr(node3))
-    print(node1 == node2)
-    print(node1 == node3)
-    
-    node_html = HTMLNode("p",
-                        "This is a html node",
-                        None,
-                        {
-                            "href": "https://www.google.com",
-                            "target": "_blank"
-                        }
-                        )
-    print(repr(node_html))
-    
+import argparse
+import cProfile
+import sys
+
+import profiler
+from dev_server import serve
+from parse_cache import ParseCache
+from render_cache import RenderCache, load_cache, save_cache
+from site_builder import build_site
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a static site from markdown")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="render changed pages")
+    build_parser.add_argument("--content", default="content",
+                              help="directory of markdown sources")
+    build_parser.add_argument("--template", default="template.html",
+                              help="html template for every page")
+    build_parser.add_argument("--output", default="public",
+                              help="directory to write html into")
+    build_parser.add_argument("--static", default="static",
+                              help="directory of images and other assets to copy")
+    build_parser.add_argument("--hash-assets", action="store_true",
+                              help="name assets by content hash and rewrite image urls")
+    build_parser.add_argument("--link-assets", action="store_true",
+                              help="hard link assets into the output instead of copying")
+    build_parser.add_argument("-j", "--jobs", type=int, default=1,
+                              help="worker processes to render with, 0 for one per core")
+    build_parser.add_argument("--fsync", action="store_true",
+                              help="sync written pages to disk before exiting")
+    build_parser.add_argument("--cache-size", type=float, default=32, metavar="MB",
+                              help="size of the rendered block cache, 0 to disable")
+    build_parser.add_argument("--cache-file", metavar="FILE",
+                              help="load and save the block cache across builds")
+    build_parser.add_argument("--parse-cache", metavar="DIR",
+                              help="keep parsed pages in DIR across builds, "
+                                   "used instead of the block cache")
+    build_parser.add_argument("--parse-cache-size", type=float, default=256, metavar="MB",
+                              help="size the parse cache is trimmed to")
+    build_parser.add_argument("--profile", action="store_true",
+                              help="report the slowest pages and stages")
+    build_parser.add_argument("--profile-top", type=int, default=10, metavar="N",
+                              help="pages to list in the profile report")
+    build_parser.add_argument("--profile-dump", metavar="FILE",
+                              help="write cProfile stats of this process to FILE")
+
+    serve_parser = subparsers.add_parser("serve", help="serve the site from memory")
+    serve_parser.add_argument("--content", default="content",
+                              help="directory of markdown sources")
+    serve_parser.add_argument("--template", default="template.html",
+                              help="html template for every page")
+    serve_parser.add_argument("--host", default="localhost")
+    serve_parser.add_argument("--port", type=int, default=8888)
+    serve_parser.add_argument("--watch", action="store_true",
+                              help="re-render pages when their sources change")
+    serve_parser.add_argument("--interval", type=float, default=0.05, metavar="SECONDS",
+                              help="how often --watch polls the content directory")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        cache = None
+        if args.cache_size > 0:
+            max_bytes = int(args.cache_size * 1024 * 1024)
+            if args.cache_file:
+                cache = load_cache(args.cache_file, max_bytes)
+            else:
+                cache = RenderCache(max_bytes)
+        parse_cache = None
+        if args.parse_cache:
+            parse_cache = ParseCache(args.parse_cache,
+                                     int(args.parse_cache_size * 1024 * 1024))
+        cprofile = None
+        if args.profile_dump:
+            # pstats only cover this process, build with --jobs 1 to see rendering
+            cprofile = cProfile.Profile()
+            cprofile.enable()
+        result = build_site(args.content, args.template, args.output,
+                            jobs=args.jobs or None, profile=args.profile,
+                            cache=cache, fsync=args.fsync, static_dir=args.static,
+                            hash_assets=args.hash_assets, link_assets=args.link_assets,
+                            parse_cache=parse_cache)
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(args.profile_dump)
+        print(f"rendered {len(result.rendered)}, "
+              f"skipped {len(result.skipped)}, "
+              f"deleted {len(result.deleted)}")
+        if result.assets is not None:
+            print(f"assets copied {len(result.assets.copied)}, "
+                  f"skipped {len(result.assets.skipped)}, "
+                  f"deleted {len(result.assets.deleted)}")
+        if parse_cache is not None:
+            print(repr(parse_cache))
+        elif cache is not None:
+            print(repr(cache))
+            if args.cache_file:
+                save_cache(args.cache_file, cache)
+        if args.profile:
+            print(profiler.format_report(result.profiles, args.profile_top))
+    elif args.command == "serve":
+        serve(args.content, args.template, args.host, args.port,
+              watch_changes=args.watch, interval=args.interval)
+    return 0
 
 
 if __name__=="__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,6 +1,42 @@
 import re
 
-from textnode import TextNode, TextType
+from textnode import TextNode, TextNodeBatch, TextType
+
+
+_INLINE_SPECIAL_RE = re.compile(r"[*_`!\[]")
+_PAIRED_RE = re.compile(r"[\[\]()]")
+
+
+class InlineStats:
+    """How many inline texts took the plain text fast path or were scanned"""
+    __slots__ = ("plain", "scanned")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.plain = 0
+        self.scanned = 0
+
+    def __repr__(self):
+        return f"InlineStats(plain: {self.plain}, scanned: {self.scanned})"
+
+
+# counts for this process: plain by is_plain_text, scanned by text_to_textnodes
+# and inline_parser.parse_inline
+stats = InlineStats()
+
+
+def is_plain_text(text):
+    """Whether text has no inline markdown, so it is a single TEXT node
+    Checks every character once per special character with str membership,
+    which is far cheaper than a regex search. "!" is not checked: an image
+    always contains "[" too. Plain texts are counted in stats.plain.
+    """
+    if "*" in text or "_" in text or "`" in text or "[" in text:
+        return False
+    stats.plain += 1
+    return True
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type: TextType):
@@ -8,7 +44,8 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type: TextType):
     Non-TextNode objects and TextNodes of other types are reserved unchanged.
 
     Args:
-        old_nodes (list): list of objects. Splits TextNodes of TextType.TEXT
+        old_nodes (list | TextNodeBatch): list of objects. Splits TextNodes of
+            TextType.TEXT. A TextNodeBatch is split into a new batch.
         delimiter (str): markdown delimiter (eg. "**" for bold)
         text_type (TextType): TextTypes to generate based on delimiter
 
@@ -17,10 +54,15 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type: TextType):
         ValueError: Delimiter with no closing delimiter is unsupported.
 
     Returns:
-        list: Objects, TextNodes, and TextNodes that have been split.
+        list | TextNodeBatch: Objects, TextNodes, and TextNodes that have been split.
     """
     if not isinstance(text_type, TextType):
         raise TypeError("text_type must be a valid TextType enum value")
+    if not delimiter:
+        raise ValueError("delimiter must not be empty")
+    if isinstance(old_nodes, TextNodeBatch):
+        return _split_batch_delimiter(old_nodes, delimiter, text_type)
+    size = len(delimiter)
     result_nodes = []
     for old_node in old_nodes:
         if not isinstance(old_node, TextNode):
@@ -32,69 +74,193 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type: TextType):
             # for now preserve empty text TextNodes that are passed in
             result_nodes.append(old_node)
         else:
-            current_text = old_node.text                
-            while delimiter in current_text:
-                parts = current_text.split(delimiter, maxsplit=1)
-                before = parts[0]
-                rest = parts[1]
-                
-                if delimiter not in rest:
-                    raise  ValueError(f"Closing delimiter not found for {delimiter}")
-                    
-                inner_parts = rest.split(delimiter, maxsplit=1)
-                inner = inner_parts[0]
-                if len(inner_parts) > 1:
-                    after = inner_parts[1]
-                else:
-                    after = ""
-                
+            # offsets into the original text, so nothing is copied per match
+            text = old_node.text
+            cursor = 0
+            while True:
+                open_index = text.find(delimiter, cursor)
+                if open_index == -1:
+                    break
+                close_index = text.find(delimiter, open_index + size)
+                if close_index == -1:
+                    raise ValueError(f"Closing delimiter not found for {delimiter}")
+
                 # design decision to not create empty TextNodes
-                if before:
-                    result_nodes.append(TextNode(before, TextType.TEXT))
-                result_nodes.append(TextNode(inner, text_type))
-                
-                current_text = after
+                if open_index > cursor:
+                    result_nodes.append(TextNode(text[cursor:open_index], TextType.TEXT))
+                result_nodes.append(TextNode(text[open_index + size:close_index], text_type))
+                cursor = close_index + size
 
             # design decision to not create empty TextNodes
-            if current_text:
-                result_nodes.append(TextNode(current_text, TextType.TEXT))
+            if cursor < len(text):
+                result_nodes.append(TextNode(text[cursor:], TextType.TEXT))
     
     return result_nodes
 
 
-def split_nodes_image(old_nodes):
+def _split_batch_delimiter(batch, delimiter, text_type):
+    result = batch.derive()
+    append = result.append_code
+    text = batch.text
+    text_code = TextNodeBatch.TYPE_CODES[TextType.TEXT]
+    type_code = TextNodeBatch.TYPE_CODES[text_type]
+    size = len(delimiter)
+    for start, end, code, url_index in batch.spans():
+        if code != text_code or start == end:
+            append(start, end, code, url_index)
+            continue
+        cursor = start
+        while True:
+            open_index = text.find(delimiter, cursor, end)
+            if open_index == -1:
+                break
+            close_index = text.find(delimiter, open_index + size, end)
+            if close_index == -1:
+                raise ValueError(f"Closing delimiter not found for {delimiter}")
+            # design decision to not create empty TextNodes
+            if open_index > cursor:
+                append(cursor, open_index, text_code)
+            append(open_index + size, close_index, type_code)
+            cursor = close_index + size
+        if cursor < end:
+            append(cursor, end, text_code)
+    return result
+
+
+def split_nodes_image(old_nodes, match_cache=None):
+    """Split TextNodes of type TEXT on markdown images
+    Non-TextNode objects and TextNodes of other types are reserved unchanged.
+
+    Args:
+        old_nodes (list | TextNodeBatch): list of objects. Splits TextNodes of
+            TextType.TEXT. A TextNodeBatch is split into a new batch.
+        match_cache (dict, optional): memo of per-text scan results shared
+            with split_nodes_link, so the link pass reuses this scan
+
+    Returns:
+        list | TextNodeBatch: Objects, TextNodes, and TextNodes that have been split.
+    """
+    return _split_nodes_link_like(old_nodes, True, match_cache)
+
+
+def split_nodes_link(old_nodes, match_cache=None):
+    """Split TextNodes of type TEXT on markdown links
+    Non-TextNode objects and TextNodes of other types are reserved unchanged.
+
+    Args:
+        old_nodes (list | TextNodeBatch): list of objects. Splits TextNodes of
+            TextType.TEXT. A TextNodeBatch is split into a new batch.
+        match_cache (dict, optional): memo of per-text scan results shared
+            with split_nodes_image, so the link pass reuses its scan
+
+    Returns:
+        list | TextNodeBatch: Objects, TextNodes, and TextNodes that have been split.
+    """
+    return _split_nodes_link_like(old_nodes, False, match_cache)
+
+
+def _scan_links(text, match_cache):
+    """Find images and links in one scan, memoized by text when cached.
+
+    Returns:
+        list: Tuple of (is_image, "text", "link", start, end)
+    """
+    if match_cache is not None:
+        matches = match_cache.get(text)
+        if matches is not None:
+            return matches
+    if "[" not in text:
+        # no image or link is possible
+        return []
+    matches = [
+        (is_image, text[start + 1 + is_image:text_end], text[text_end + 2:url_end],
+         start, url_end + 1)
+        for is_image, start, text_end, url_end in _find_links(text)
+    ]
+    if match_cache is not None:
+        match_cache[text] = matches
+    return matches
+
+
+def _split_nodes_link_like(old_nodes, images, match_cache):
+    text_type = TextType.IMAGE if images else TextType.LINK
+    if isinstance(old_nodes, TextNodeBatch):
+        return _split_batch_link_like(old_nodes, images, text_type)
     result_nodes = []
     for old_node in old_nodes:
         if not isinstance(old_node, TextNode):
             # for now preserve Non-TextNode ojbects as is
             result_nodes.append(old_node)
             continue
-        images = extract_markdown_images(old_node.text)
-        if len(images) == 0:
+        if old_node.text_type != TextType.TEXT:
             result_nodes.append(old_node)
-        else:
-            current_text = old_node.text
-            for image in images:
-                image_alt = image[0]
-                image_link = image[1]
-                sections = current_text.split(f"![{image_alt}]({image_link})", maxsplit=1)
-                before = sections[0]
-                after = sections[1]
-                # design decision to not create empty TextNodes
-                if before:
-                    result_nodes.append(TextNode(before, TextType.TEXT))
-                
-                result_nodes.append(TextNode(image_alt, TextType.IMAGE, image_link))
-                
-                current_text = after
-            
+            continue
+        text = old_node.text
+        matches = _scan_links(text, match_cache)
+        if not any(match[0] == images for match in matches):
+            result_nodes.append(old_node)
+            continue
+
+        cursor = 0
+        # matches of the other kind, re-based onto the TEXT nodes we emit
+        # so the other pass finds them in the cache without rescanning
+        pending = []
+        for match in matches:
+            is_image, match_text, url, start, end = match
+            if is_image != images:
+                pending.append(match)
+                continue
             # design decision to not create empty TextNodes
-            if current_text:
-                result_nodes.append(TextNode(current_text, TextType.TEXT))
-    
+            if start > cursor:
+                _append_text(result_nodes, text, cursor, start, pending, match_cache)
+            pending = []
+            result_nodes.append(TextNode(match_text, text_type, url))
+            cursor = end
+
+        # design decision to not create empty TextNodes
+        if cursor < len(text):
+            _append_text(result_nodes, text, cursor, len(text), pending, match_cache)
+
     return result_nodes
 
 
+def _split_batch_link_like(batch, images, text_type):
+    # spans are scanned in place with pos/endpos, so no match cache is needed
+    result = batch.derive()
+    append = result.append_code
+    urls = result.urls
+    text = batch.text
+    text_code = TextNodeBatch.TYPE_CODES[TextType.TEXT]
+    type_code = TextNodeBatch.TYPE_CODES[text_type]
+    for start, end, code, url_index in batch.spans():
+        if code != text_code or start == end:
+            append(start, end, code, url_index)
+            continue
+        cursor = start
+        for is_image, match_start, text_end, url_end in _find_links(text, start, end):
+            if is_image != images:
+                continue
+            # design decision to not create empty TextNodes
+            if match_start > cursor:
+                append(cursor, match_start, text_code)
+            urls.append(text[text_end + 2:url_end])
+            append(match_start + 1 + is_image, text_end, type_code, len(urls) - 1)
+            cursor = url_end + 1
+        if cursor < end:
+            append(cursor, end, text_code)
+    return result
+
+
+def _append_text(result_nodes, text, start, end, pending, match_cache):
+    segment = text[start:end]
+    result_nodes.append(TextNode(segment, TextType.TEXT))
+    if match_cache is not None:
+        match_cache[segment] = [
+            (is_image, match_text, url, match_start - start, match_end - start)
+            for is_image, match_text, url, match_start, match_end in pending
+        ]
+
+
 def extract_markdown_images(text):
     """Extract image alt text and link from markdown text
 
@@ -104,9 +270,8 @@ def extract_markdown_images(text):
     Returns:
         list: Tuple of ("alt text", "image link")
     """
-    pattern = r"!\[(.*?)\]\((.*?)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return [(match_text, url) for is_image, match_text, url, _, _ in _scan_links(text, None)
+            if is_image]
 
 def extract_markdown_links(text):
     """Extract link text and link from markdown text
@@ -117,6 +282,195 @@ def extract_markdown_links(text):
     Returns:
         list: Tuple of ("link text", "link")
     """
-    pattern = r"(?<!!)\[(.*?)\]\((.*?)\)"
-    matches = re.findall(pattern, text)
-    return matches
\ No newline at end of file
+    return [(match_text, url) for is_image, match_text, url, _, _ in _scan_links(text, None)
+            if not is_image]
+
+
+def _find_links(text, start=0, end=None):
+    """Images and links of text[start:end], in document order
+    Link text may hold balanced brackets and urls balanced parentheses, eg.
+    [see [1]](/notes) or [x](/wiki/X_(disambiguation)). Every bracket and
+    parenthesis is paired in one pass with a stack, so nothing is rescanned.
+    Images are taken first, as split_nodes_image runs before
+    split_nodes_link; links overlapping one are dropped.
+
+    Returns:
+        list: Tuple of (is_image, start, end of the text, end of the url),
+            the text starting after "[" and the url after "]("
+    """
+    candidates = _link_candidates(text, start, len(text) if end is None else end)
+    if not candidates:
+        return []
+    images = []
+    image_end = start
+    for candidate in candidates:
+        if candidate[0] and candidate[1] >= image_end:
+            images.append(candidate)
+            image_end = candidate[3] + 1
+    matches = []
+    next_image = 0
+    link_end = start
+    for candidate in candidates:
+        if candidate[0] or candidate[1] < link_end:
+            continue
+        # skip the images ending before this link, then check the next one
+        while next_image < len(images) and images[next_image][3] < candidate[1]:
+            next_image += 1
+        if next_image < len(images) and images[next_image][1] <= candidate[3]:
+            continue
+        matches.append(candidate)
+        link_end = candidate[3] + 1
+    if images:
+        matches = sorted(matches + images, key=lambda match: match[1])
+    return matches
+
+
+def _link_candidates(text, start, end):
+    """Every image or link of text[start:end], overlapping ones included,
+    ordered by start; see _find_links
+    """
+    if "[" not in text[start:end]:
+        return []
+    # "[" and "(" waiting for their pair, and the pairs found
+    open_brackets = []
+    open_parens = []
+    bracket_starts = []
+    bracket_ends = {}
+    paren_ends = {}
+    for match in _PAIRED_RE.finditer(text, start, end):
+        index = match.start()
+        char = text[index]
+        if char == "[":
+            open_brackets.append(index)
+            bracket_starts.append(index)
+        elif char == "]":
+            if open_brackets:
+                bracket_ends[open_brackets.pop()] = index
+        elif char == "(":
+            open_parens.append(index)
+        elif open_parens:
+            paren_ends[open_parens.pop()] = index
+
+    candidates = []
+    for index in bracket_starts:
+        text_end = bracket_ends.get(index)
+        if text_end is None:
+            continue
+        url_end = paren_ends.get(text_end + 1)
+        if url_end is None:
+            continue
+        # a "[" after "!" only starts an image
+        is_image = index > start and text[index - 1] == "!"
+        candidates.append((is_image, index - is_image, text_end, url_end))
+
+    # links may not contain links, the innermost one is kept; each marks
+    # only its parent, and the mark moves up as parents close
+    holds_link = [False] * len(candidates)
+    parents = []
+    for position, (is_image, match_start, _, _) in enumerate(candidates):
+        while parents and candidates[parents[-1]][3] < match_start:
+            _close_candidate(parents, holds_link, candidates)
+        if parents and not is_image:
+            holds_link[parents[-1]] = True
+        parents.append(position)
+    while parents:
+        _close_candidate(parents, holds_link, candidates)
+    return [candidate for candidate, has_link in zip(candidates, holds_link)
+            if candidate[0] or not has_link]
+
+
+def _close_candidate(parents, holds_link, candidates):
+    child = parents.pop()
+    if parents and (holds_link[child] or not candidates[child][0]):
+        holds_link[parents[-1]] = True
+
+
+def text_to_textnodes(text, batch=False):
+    """Tokenize markdown text into TextNodes in a single left-to-right pass
+    Recognizes **bold**, _italic_ / *italic*, `code`, images and links.
+    Delimited content is not parsed further, so markup inside `code` is
+    kept verbatim. Text is only sliced when a node is emitted.
+
+    The site build does not use this flat tokenizer: blocks are parsed by
+    inline_parser.parse_inline, which nests markup. It is kept for callers
+    that want TextNodes.
+
+    Args:
+        text (str): markdown text of a single block
+        batch (bool): return a TextNodeBatch of spans over text instead of
+            a list, so no TextNode or str is built per node
+
+    Raises:
+        ValueError: Delimiter with no closing delimiter is unsupported.
+
+    Returns:
+        list | TextNodeBatch: TextNodes in document order
+    """
+    if is_plain_text(text):
+        if batch:
+            return TextNodeBatch.from_text(text)
+        return [TextNode(text, TextType.TEXT)] if text else []
+    stats.scanned += 1
+    if batch:
+        result = TextNodeBatch(text)
+        _scan_inline(text, result.append)
+        return result
+    result_nodes = []
+    add_node = result_nodes.append
+
+    def append(start, end, text_type, url):
+        add_node(TextNode(text[start:end], text_type, url))
+
+    _scan_inline(text, append)
+    return result_nodes
+
+
+def _scan_inline(text, append):
+    """Call append(start, end, TextType, url) for each inline node of text"""
+    text_start = 0
+    cursor = 0
+    # start -> image or link of the text, found on the first "!" or "["
+    links = None
+    while True:
+        match = _INLINE_SPECIAL_RE.search(text, cursor)
+        if match is None:
+            break
+        index = match.start()
+        char = text[index]
+
+        if char == "!" or char == "[":
+            if links is None:
+                links = {link[1]: link for link in _find_links(text)}
+            link = links.get(index)
+            if link is None:
+                # a lone "!" or "[" is plain text
+                cursor = index + 1
+                continue
+            is_image, _, text_end, url_end = link
+            # design decision to not create empty TextNodes
+            if index > text_start:
+                append(text_start, index, TextType.TEXT, None)
+            append(index + 1 + is_image, text_end,
+                   TextType.IMAGE if is_image else TextType.LINK, text[text_end + 2:url_end])
+            cursor = text_start = url_end + 1
+            continue
+
+        if char == "*" and text.startswith("**", index):
+            delimiter = "**"
+            text_type = TextType.BOLD
+        else:
+            delimiter = char
+            text_type = TextType.CODE if char == "`" else TextType.ITALIC
+        inner_start = index + len(delimiter)
+        inner_end = text.find(delimiter, inner_start)
+        if inner_end == -1:
+            raise ValueError(f"Closing delimiter not found for {delimiter}")
+
+        # design decision to not create empty TextNodes
+        if index > text_start:
+            append(text_start, index, TextType.TEXT, None)
+        append(inner_start, inner_end, text_type, None)
+        cursor = text_start = inner_end + len(delimiter)
+
+    if text_start < len(text):
+        append(text_start, len(text), TextType.TEXT, None)
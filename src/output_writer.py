@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class OutputWriter:
+    """Write output files from a background thread pool
+    submit() returns as soon as a write is queued, so rendering the next
+    page overlaps with writing the last one. At most max_pending writes
+    are queued; submit() blocks beyond that, so a whole site is never
+    buffered in memory. Files whose bytes are already on disk are not
+    rewritten, and each directory is created once. With fsync, written
+    files are synced in one batch by flush() instead of one at a time.
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, workers=4, max_pending=64, fsync=False):
+        self.fsync = fsync
+        self.written = 0
+        self.unchanged = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="output-writer")
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        # writes in submission order, finished ones are popped by submit()
+        self._futures = deque()
+        self._created_dirs = set()
+        self._unsynced = []
+        self._error = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, path, data):
+        """Queue data (bytes) to be written to path"""
+        with self._lock:
+            futures = self._futures
+            while futures and futures[0].done():
+                self._keep_error(futures.popleft())
+        self._raise_error()
+        self._pending.acquire()
+        future = self._executor.submit(self._write, path, data)
+        with self._lock:
+            self._futures.append(future)
+        future.add_done_callback(self._release)
+
+    def flush(self):
+        """Wait for queued writes, then fsync written files and directories
+
+        Raises:
+            OSError: first error of any queued write
+        """
+        with self._lock:
+            futures = self._futures
+            self._futures = deque()
+        for future in futures:
+            # waits for the write; done callbacks may not have run yet, so
+            # errors are taken from the futures themselves
+            self._keep_error(future)
+        self._raise_error()
+        if self.fsync:
+            with self._lock:
+                paths = self._unsynced
+                self._unsynced = []
+            directories = {os.path.dirname(path) for path in paths}
+            list(self._executor.map(_fsync_path, paths))
+            list(self._executor.map(_fsync_path, directories))
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown()
+
+    def _write(self, path, data):
+        directory = os.path.dirname(path)
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                self._created_dirs.add(directory)
+        written = write_if_changed(path, data)
+        with self._lock:
+            if written:
+                self.written += 1
+                if self.fsync:
+                    self._unsynced.append(path)
+            else:
+                self.unchanged += 1
+
+    def _release(self, future):
+        self._pending.release()
+
+    def _keep_error(self, future):
+        error = future.exception()
+        if error is not None and self._error is None:
+            self._error = error
+
+    def _raise_error(self):
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise error
+
+
+def write_if_changed(path, data, fsync=False):
+    """Write bytes to path unless the file already holds exactly them
+
+    Returns:
+        bool: whether the file was written
+    """
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as fp:
+                if fp.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as fp:
+        fp.write(data)
+        if fsync:
+            fp.flush()
+            os.fsync(fp.fileno())
+    return True
+
+
+def _fsync_path(path):
+    # directories are synced so new entries in them are durable too
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
\ No newline at end of file
@@ -0,0 +1,95 @@
+import re
+from functools import lru_cache
+
+
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+
+
+class PageTemplate:
+    """Html template compiled once into literal segments and named slots
+    {{ Name }} placeholders are found by one scan when compiling; rendering
+    only joins the segments with the values, so pages never rescan or copy
+    the template per placeholder. A placeholder without a value is kept as
+    written.
+    """
+    __slots__ = ("source", "segments", "slots", "_repeated")
+
+    def __init__(self, source):
+        self.source = source
+        # literal text before each slot, then the text after the last one
+        segments = []
+        # (name, placeholder as written) of each slot
+        slots = []
+        cursor = 0
+        for match in _PLACEHOLDER_RE.finditer(source):
+            segments.append(source[cursor:match.start()])
+            slots.append((match.group(1), match.group(0)))
+            cursor = match.end()
+        segments.append(source[cursor:])
+        self.segments = tuple(segments)
+        self.slots = tuple(slots)
+        names = [name for name, _ in slots]
+        self._repeated = frozenset(name for name in names if names.count(name) > 1)
+
+    @property
+    def names(self):
+        """Names of the placeholders, in order of first use"""
+        return list(dict.fromkeys(name for name, _ in self.slots))
+
+    def iter_render(self, values):
+        """Yield the rendered page in chunks
+
+        Args:
+            values (dict): name -> str, or an iterable of str chunks such as
+                htmlnode.iter_html(root), which is streamed without joining
+
+        Yields:
+            str: consecutive pieces of the page
+        """
+        values = self._single_use(values)
+        segments = self.segments
+        for index, (name, placeholder) in enumerate(self.slots):
+            if segments[index]:
+                yield segments[index]
+            value = values.get(name, placeholder)
+            if isinstance(value, str):
+                yield value
+            else:
+                yield from value
+        if segments[-1]:
+            yield segments[-1]
+
+    def render(self, values):
+        """Rendered page as one str, see iter_render"""
+        # a list is filled directly, which is faster than joining iter_render
+        values = self._single_use(values)
+        segments = self.segments
+        parts = [segments[0]]
+        for index, (name, placeholder) in enumerate(self.slots, 1):
+            value = values.get(name, placeholder)
+            if isinstance(value, str):
+                parts.append(value)
+            else:
+                parts.extend(value)
+            parts.append(segments[index])
+        return "".join(parts)
+
+    def _single_use(self, values):
+        # an iterable can only be consumed once, so join those used twice
+        if not self._repeated:
+            return values
+        values = dict(values)
+        for name in self._repeated:
+            value = values.get(name)
+            if value is not None and not isinstance(value, str):
+                values[name] = "".join(value)
+        return values
+
+    def __repr__(self):
+        return f"PageTemplate({len(self.source)} chars, slots: {self.names})"
+
+
+@lru_cache(maxsize=32)
+def compile_template(source):
+    """Shared PageTemplate for template text, compiled on first use"""
+    return PageTemplate(source)
@@ -0,0 +1,384 @@
+"""On-disk cache of parsed pages, shared by builds and worker processes.
+
+A page's html node tree is stored in one file per source hash and url
+directory (relative links resolve against it), in a
+compact binary format instead of pickle:
+
+    header   magic, parser version, string count, text size, op count
+    lengths  u32 length of each distinct string, in characters
+    text     the distinct strings concatenated, utf-8
+    ops      u32 stream: the page's dependencies, then the tree in preorder
+
+Strings are referenced by index + 1, with 0 for None. A node is
+(kind, tag, props count + 1 or 0 for None, key, value, ..., then the
+value of a leaf or the child count of a parent). Loading decodes the text
+once and rebuilds the nodes from the ops, without running the parsers.
+
+The parser version is a hash of the parsing modules' source, so any
+parser change invalidates old entries without a manual version bump; a
+directory stamped with another version is cleared when opened. The
+least recently used files are evicted beyond max_bytes.
+"""
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+import block_parser
+import converter
+import dependency_graph
+import htmlnode
+import inline_parser
+import markdown_parser
+import textnode
+from dependency_graph import PageDependencies
+from htmlnode import LeafNode, ParentNode
+
+
+FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+STAMP_NAME = "VERSION"
+_SUFFIX = ".tree"
+_MAGIC = b"MDPT"
+_HEADER = struct.Struct("<4s16sIII")
+_LEAF = 0
+_PARENT = 1
+# modules whose code decides the tree parsed from a source
+_PARSER_MODULES = (block_parser, inline_parser, markdown_parser, converter,
+                   dependency_graph, htmlnode, textnode, sys.modules[__name__])
+
+
+@lru_cache(maxsize=None)
+def parser_version():
+    """Digest of the format version and the parsing modules' source"""
+    digest = hashlib.blake2b(str(FORMAT_VERSION).encode(), digest_size=16)
+    for module in _PARSER_MODULES:
+        with open(module.__file__, "rb") as fp:
+            digest.update(fp.read())
+    return digest.digest()
+
+
+class ParseCache:
+    """Parsed node trees of whole pages, kept in a directory across builds
+    Safe to share between processes: entries are written atomically and a
+    missing or unreadable entry is a miss.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        stamp_path = os.path.join(directory, STAMP_NAME)
+        version = parser_version().hex()
+        try:
+            with open(stamp_path, encoding="utf-8") as fp:
+                stamped = fp.read().strip()
+        except OSError:
+            stamped = None
+        if stamped != version:
+            for entry in os.scandir(directory):
+                if entry.name.endswith(_SUFFIX):
+                    os.remove(entry.path)
+            with open(stamp_path, "w", encoding="utf-8") as fp:
+                fp.write(version)
+        self.size = sum(size for _, size, _ in self._files())
+
+    def __getstate__(self):
+        # workers open the directory themselves, with fresh statistics
+        return (self.directory, self.max_bytes)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def markdown_to_html_node(self, lines, source_hash):
+        """Tree of a page from the cache, or parsed from lines and stored
+        The page's titles and images are recorded as usual; an entry is
+        only used while the titles and image urls it shows are unchanged.
+
+        Args:
+            lines (iterable): lines of the page's markdown
+            source_hash (str): hex hash of the page's source
+
+        Returns:
+            ParentNode: div containing one child per block
+        """
+        page_dependencies = converter.current_dependencies
+        base = "/" if page_dependencies is None else page_dependencies.base
+        cached = self._load(source_hash, base)
+        if cached is not None and _resolves_same(cached[1]):
+            self.hits += 1
+            root, dependencies = cached
+            if page_dependencies is not None:
+                page_dependencies.update(PageDependencies(
+                    base, dependencies["titles"], dependencies["images"]))
+            return root
+        self.misses += 1
+
+        dependencies = PageDependencies(base)
+        converter.current_dependencies = dependencies
+        try:
+            root = block_parser.markdown_to_html_node(lines)
+        finally:
+            converter.current_dependencies = page_dependencies
+        if page_dependencies is not None:
+            page_dependencies.update(dependencies)
+        self.put(source_hash, root, base, {
+            "titles": {path: converter.page_titles.get(path)
+                       for path in dependencies.titles},
+            "images": {path: converter.asset_urls.get(path)
+                       for path in dependencies.images},
+        })
+        return root
+
+    def get(self, source_hash, base="/"):
+        """(root, resolved dependencies) stored for source_hash, or None
+
+        Args:
+            source_hash (str): hex hash of the page's source
+            base (str): url directory of the page, eg. "/blog/"
+        """
+        cached = self._load(source_hash, base)
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    def _load(self, source_hash, base):
+        path = self._path(source_hash, base)
+        try:
+            with open(path, "rb") as fp:
+                cached = decode_tree(fp.read())
+        except (OSError, ValueError):
+            return None
+        try:
+            # recently used entries are evicted last
+            os.utime(path)
+        except OSError:
+            pass
+        return cached
+
+    def put(self, source_hash, root, base="/", dependencies=None):
+        """Store the tree of a source for pages in the url directory base,
+        see encode_tree
+        """
+        data = encode_tree(root, dependencies)
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(source_hash, base)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as fp:
+            fp.write(data)
+        os.replace(temp_path, path)
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            self.trim()
+
+    def trim(self):
+        """Evict the least recently used entries until within max_bytes"""
+        files = sorted(self._files())
+        self.size = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # evicted by another process
+                pass
+            self.size -= size
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": self.size,
+        }
+
+    def _path(self, source_hash, base):
+        key = hashlib.blake2b(parser_version() + f"{source_hash}\0{base}".encode(),
+                              digest_size=16).hexdigest()
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _files(self):
+        """(mtime_ns, size, path) of each entry"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return files
+
+    def __repr__(self):
+        stats = self.stats()
+        return (f"ParseCache(hits: {stats['hits']}, misses: {stats['misses']}, "
+                f"hit rate: {stats['hit_rate']:.1%}, size: {stats['size']})")
+
+
+def _resolves_same(dependencies):
+    """Whether titles and image urls are still what the tree shows"""
+    page_titles = converter.page_titles
+    asset_urls = converter.asset_urls
+    return (all(page_titles.get(path) == title
+                for path, title in dependencies["titles"].items())
+            and all(asset_urls.get(path) == url
+                    for path, url in dependencies["images"].items()))
+
+
+def encode_tree(root, dependencies=None):
+    """Binary form of a LeafNode / ParentNode tree
+
+    Args:
+        root (HTMLNode): tree to store; lazy children are not supported
+        dependencies (dict, optional): {"titles": {path: title},
+            "images": {path: url}} resolved while parsing the tree
+
+    Raises:
+        TypeError: node that is not a LeafNode or ParentNode
+
+    Returns:
+        bytes: see the module docstring
+    """
+    strings = {}
+
+    def ref(value):
+        if value is None:
+            return 0
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings) + 1
+        return index
+
+    ops = array("I")
+    dependencies = dependencies or {}
+    for section in ("titles", "images"):
+        resolved = dependencies.get(section, {})
+        ops.append(len(resolved))
+        for path, value in resolved.items():
+            ops.extend((ref(path), ref(value)))
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ParentNode):
+            kind = _PARENT
+        elif isinstance(node, LeafNode):
+            kind = _LEAF
+        else:
+            raise TypeError(f"Cannot encode {type(node).__name__}")
+        props = node.props
+        ops.extend((kind, ref(node.tag), 0 if props is None else len(props) + 1))
+        if props:
+            for key, value in props.items():
+                ops.extend((ref(key), ref(value)))
+        if kind == _LEAF:
+            ops.append(ref(node.value))
+        else:
+            children = node.children
+            if not isinstance(children, (list, tuple)):
+                raise TypeError("Cannot encode lazy ParentNode children")
+            ops.append(len(children))
+            stack.extend(reversed(children))
+
+    lengths = array("I", map(len, strings))
+    text = "".join(strings).encode("utf-8")
+    if sys.byteorder == "big":
+        lengths.byteswap()
+        ops.byteswap()
+    header = _HEADER.pack(_MAGIC, parser_version(), len(lengths), len(text), len(ops))
+    return b"".join((header, lengths.tobytes(), text, ops.tobytes()))
+
+
+def decode_tree(data):
+    """Tree and resolved dependencies from encode_tree's bytes
+
+    Raises:
+        ValueError: data is not an entry of this parser version, or is cut
+            short or corrupt
+
+    Returns:
+        tuple: (ParentNode | LeafNode, {"titles": dict, "images": dict})
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated parse cache entry")
+    magic, version, string_count, text_size, op_count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != parser_version():
+        raise ValueError("Parse cache entry of another format or parser version")
+    offset = _HEADER.size
+    lengths = array("I")
+    lengths.frombytes(data[offset:offset + 4 * string_count])
+    offset += 4 * string_count
+    text = data[offset:offset + text_size].decode("utf-8")
+    offset += text_size
+    ops = array("I")
+    ops.frombytes(data[offset:offset + 4 * op_count])
+    if len(lengths) != string_count or len(ops) != op_count or offset + 4 * op_count != len(data):
+        raise ValueError("Truncated parse cache entry")
+    if sys.byteorder == "big":
+        lengths.byteswap()
+        ops.byteswap()
+
+    # index 0 is None, so refs index the table directly
+    table = [None]
+    start = 0
+    for length in lengths:
+        table.append(text[start:start + length])
+        start += length
+    try:
+        return _decode_ops(ops.tolist(), table)
+    except IndexError:
+        # a string ref or count pointing past the end of its table
+        raise ValueError("Corrupt parse cache entry") from None
+
+
+def _decode_ops(ops, table):
+    index = 0
+    dependencies = {}
+    for section in ("titles", "images"):
+        count = ops[index]
+        index += 1
+        dependencies[section] = {
+            table[ops[i]]: table[ops[i + 1]] for i in range(index, index + 2 * count, 2)
+        }
+        index += 2 * count
+
+    # (tag, props, parent's children, child count) of each open parent
+    frames = []
+    root = []
+    children = root
+    end = len(ops)
+    while index < end:
+        kind, tag, props_count = ops[index], table[ops[index + 1]], ops[index + 2]
+        index += 3
+        props = None
+        if props_count:
+            props = {}
+            for _ in range(props_count - 1):
+                props[table[ops[index]]] = table[ops[index + 1]]
+                index += 2
+        if kind == _PARENT:
+            frames.append((tag, props, children, ops[index]))
+            children = []
+            index += 1
+            continue
+        children.append(LeafNode(tag, table[ops[index]], props))
+        index += 1
+        while frames and len(children) == frames[-1][3]:
+            tag, props, parent, _ = frames.pop()
+            parent.append(ParentNode(tag, children, props))
+            children = parent
+    if frames or len(root) != 1:
+        raise ValueError("Truncated parse cache entry")
+    return root[0], dependencies
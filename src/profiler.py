@@ -0,0 +1,81 @@
+"""Opt-in per-page, per-stage build instrumentation.
+
+Instrumented code checks the module level `current` and records nothing
+when it is None, so the disabled cost is one global lookup per page or
+block. Stages are read, blocks, inline, to_html and write; inline time
+is not included in blocks. "plain" counts inline texts without markup,
+which skip the inline parser.
+"""
+
+
+# PageProfile of the page being rendered, None when profiling is off
+current = None
+
+
+class PageProfile:
+    __slots__ = ("path", "seconds", "nodes", "size")
+
+    def __init__(self, path):
+        self.path = path
+        self.seconds = {}
+        self.nodes = {}
+        self.size = {}
+
+    def record(self, stage, seconds, nodes=0, size=0):
+        """Add wall time, node count and bytes to a stage"""
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        self.nodes[stage] = self.nodes.get(stage, 0) + nodes
+        self.size[stage] = self.size.get(stage, 0) + size
+
+    def total_seconds(self):
+        return sum(self.seconds.values())
+
+    def __repr__(self):
+        return f"PageProfile({self.path}, {self.total_seconds():.6f}s)"
+
+
+def begin_page(path):
+    """Start recording a page; its stages are recorded until end_page"""
+    global current
+    current = PageProfile(path)
+    return current
+
+
+def end_page():
+    """Stop recording and return the finished PageProfile"""
+    global current
+    profile = current
+    current = None
+    return profile
+
+
+def stage_totals(profiles):
+    """Sum every stage across pages
+
+    Returns:
+        dict: stage -> (seconds, nodes, bytes)
+    """
+    totals = {}
+    for profile in profiles:
+        for stage, seconds in profile.seconds.items():
+            old_seconds, old_nodes, old_size = totals.get(stage, (0.0, 0, 0))
+            totals[stage] = (old_seconds + seconds,
+                             old_nodes + profile.nodes[stage],
+                             old_size + profile.size[stage])
+    return totals
+
+
+def format_report(profiles, top=10):
+    """Text report of the slowest pages and the per-stage totals"""
+    lines = [f"slowest {min(top, len(profiles))} of {len(profiles)} pages"]
+    slowest = sorted(profiles, key=PageProfile.total_seconds, reverse=True)[:top]
+    for profile in slowest:
+        lines.append(f"{profile.total_seconds() * 1000:>10.2f} ms  {profile.path}")
+
+    lines.append("stages")
+    totals = stage_totals(profiles)
+    for stage in sorted(totals, key=lambda stage: totals[stage][0], reverse=True):
+        seconds, nodes, size = totals[stage]
+        lines.append(f"{seconds * 1000:>10.2f} ms  {stage:<8}"
+                     f"{nodes:>10} nodes{size:>12} bytes")
+    return "\n".join(lines)
\ No newline at end of file
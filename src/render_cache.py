@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import converter
+from block_parser import block_to_html_node
+from dependency_graph import PageDependencies
+
+
+# bump whenever rendering output changes, so persisted caches are dropped
+CACHE_VERSION = 4
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class RenderCache:
+    """LRU cache of rendered block html keyed by a hash of the block source
+    Size is bounded by the characters of cached html; the least recently
+    used blocks are evicted first.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # set to a list to collect entries added, see take_new_entries
+        self.new_entries = None
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        html = self._entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return html
+
+    def put(self, key, html):
+        if len(html) > self.max_bytes:
+            return
+        old_html = self._entries.pop(key, None)
+        if old_html is not None:
+            self.size -= len(old_html)
+        self._entries[key] = html
+        self.size += len(html)
+        if self.new_entries is not None:
+            self.new_entries.append((key, html))
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def render_block(self, block_type, lines):
+        """Rendered html of a block, from the cache when seen before
+        Blocks showing other pages' titles or images are never cached: their
+        html changes without their source, and a cached block would not
+        record its dependencies for the page.
+        """
+        key = block_key(block_type, lines)
+        html = self.get(key)
+        if html is None:
+            page_dependencies = converter.current_dependencies
+            block_dependencies = PageDependencies(
+                "/" if page_dependencies is None else page_dependencies.base)
+            converter.current_dependencies = block_dependencies
+            try:
+                html = block_to_html_node(block_type, lines).to_html()
+            finally:
+                converter.current_dependencies = page_dependencies
+            if block_dependencies:
+                if page_dependencies is not None:
+                    page_dependencies.update(block_dependencies)
+            else:
+                self.put(key, html)
+        return html
+
+    def entries(self):
+        """(key, html) pairs from least to most recently used"""
+        return list(self._entries.items())
+
+    def take_new_entries(self):
+        """Return and forget entries added since the last call
+        Only collected once new_entries has been set to a list.
+        """
+        new_entries = self.new_entries
+        if new_entries is None:
+            return []
+        self.new_entries = []
+        return new_entries
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size": self.size,
+        }
+
+    def __repr__(self):
+        stats = self.stats()
+        return (f"RenderCache(hits: {stats['hits']}, misses: {stats['misses']}, "
+                f"hit rate: {stats['hit_rate']:.1%}, entries: {stats['entries']}, "
+                f"size: {stats['size']})")
+
+
+def block_key(block_type, lines):
+    """Hash of a block's type and source lines"""
+    source = block_type.value + "\0" + "\n".join(lines)
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_cache(path, max_bytes=DEFAULT_MAX_BYTES):
+    """Load a persisted RenderCache, or an empty one if missing or outdated"""
+    cache = RenderCache(max_bytes)
+    try:
+        with open(path, encoding="utf-8") as fp:
+            data = json.load(fp)
+    except (OSError, ValueError):
+        return cache
+    if data.get("version") != CACHE_VERSION:
+        return cache
+    for key, html in data["entries"]:
+        cache.put(key, html)
+    return cache
+
+
+def save_cache(path, cache):
+    """Persist a RenderCache atomically, keeping its LRU order"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as fp:
+        json.dump({"version": CACHE_VERSION, "entries": cache.entries()}, fp)
+    os.replace(temp_path, path)
\ No newline at end of file
@@ -0,0 +1,540 @@
+import hashlib
+import json
+import os
+import posixpath
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import converter
+import profiler
+from asset_pipeline import asset_urls, sync_assets
+from block_parser import iter_text_lines, markdown_to_html, markdown_to_html_node
+from dependency_graph import DependencyGraph, PageDependencies, changed_paths
+from htmlnode import escape_text, iter_html
+from output_writer import OutputWriter, write_if_changed
+from page_template import PageTemplate, compile_template
+from render_cache import RenderCache
+from source_reader import MarkdownSource
+
+
+MANIFEST_NAME = ".manifest.json"
+# bump whenever rendering output changes, so every page is rebuilt once
+MANIFEST_VERSION = 5
+# tasks per worker, so small pages are batched instead of sent one by one
+CHUNKS_PER_WORKER = 4
+
+
+class BuildResult:
+    def __init__(self, rendered=None, skipped=None, deleted=None, profiles=None):
+        self.rendered = rendered if rendered is not None else []
+        self.skipped = skipped if skipped is not None else []
+        self.deleted = deleted if deleted is not None else []
+        # PageProfiles of rendered pages when built with profile=True
+        self.profiles = profiles if profiles is not None else []
+        # AssetResult when built with a static directory
+        self.assets = None
+
+    def __repr__(self):
+        return (f"BuildResult(rendered: {len(self.rendered)}, "
+                f"skipped: {len(self.skipped)}, deleted: {len(self.deleted)})")
+
+
+class PageResult:
+    __slots__ = ("rel_path", "source_hash", "rendered", "profile", "cache_delta",
+                 "parse_delta", "dependencies")
+
+    def __init__(self, rel_path, source_hash, rendered, profile=None, dependencies=None):
+        self.rel_path = rel_path
+        self.source_hash = source_hash
+        self.rendered = rendered
+        self.profile = profile
+        # PageDependencies recorded while rendering, None when not rendered
+        self.dependencies = dependencies
+        # (hits, misses, new entries) of a worker's RenderCache
+        self.cache_delta = None
+        # (hits, misses, evictions) of a worker's ParseCache
+        self.parse_delta = None
+
+    def __repr__(self):
+        return f"PageResult({self.rel_path}, {self.source_hash}, {self.rendered})"
+
+
+def build_site(content_dir, template_path, dest_dir, jobs=1, profile=False,
+               cache=None, fsync=False, static_dir=None, hash_assets=False,
+               link_assets=False, parse_cache=None):
+    """Render every changed markdown page under content_dir into dest_dir
+    A manifest of source hashes and the template hash is kept in dest_dir,
+    so unchanged pages are skipped and outputs of removed sources deleted.
+    It also keeps each page's title and dependency graph entry: an
+    unchanged page is rendered again only when a page whose title it shows
+    was added, removed or retitled, or an image it shows was renamed.
+
+    Args:
+        content_dir (str): directory of .md sources
+        template_path (str): html template with {{ Title }} and {{ Content }}
+        dest_dir (str): output directory
+        jobs (int): worker processes to render with, None for one per core
+        profile (bool): record a PageProfile for every rendered page
+        cache (RenderCache, optional): block html shared by every page
+        fsync (bool): sync written pages to disk before returning
+        static_dir (str, optional): directory of assets mirrored into dest_dir,
+            see asset_pipeline.sync_assets
+        hash_assets (bool): write assets under content hashed names and
+            point image urls at them
+        link_assets (bool): hard link assets instead of copying when possible
+        parse_cache (ParseCache, optional): parsed pages kept on disk across
+            builds, used instead of cache
+
+    Returns:
+        BuildResult: relative source paths rendered, skipped and deleted
+    """
+    manifest_path = os.path.join(dest_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    old_pages = manifest["pages"]
+    old_assets = manifest.get("assets", {})
+
+    template_source = read_file(template_path)
+    template_hash = hash_text(template_source)
+    # compiled once, then shared by every page and worker
+    template = PageTemplate(template_source)
+    template_changed = template_hash != manifest["template"]
+
+    result = BuildResult()
+    if static_dir is None:
+        assets = old_assets
+    else:
+        # assets first, so pages link to their current names
+        result.assets = sync_assets(static_dir, dest_dir, old_assets,
+                                    hash_assets, link_assets)
+        assets = result.assets.entries
+    images = asset_urls(assets)
+
+    pages = {}
+    stats = {}
+    tasks = []
+    # rel_path -> (source_path, dest_path) of pages skipped unless a title they show changed
+    unchanged = {}
+    for rel_path in iter_sources(content_dir):
+        source_path = os.path.join(content_dir, rel_path)
+        dest_path = os.path.join(dest_dir, output_path(rel_path))
+        stat = os.stat(source_path)
+        stats[rel_path] = stat
+        old_entry = old_pages.get(rel_path)
+        up_to_date = (not template_changed
+                      and old_entry is not None
+                      and os.path.exists(dest_path))
+
+        if (up_to_date
+                and old_entry["mtime_ns"] == stat.st_mtime_ns
+                and old_entry["size"] == stat.st_size):
+            # unchanged metadata, skip without reading the source
+            unchanged[rel_path] = (source_path, dest_path)
+            continue
+
+        old_hash = old_entry["hash"] if up_to_date else None
+        tasks.append((rel_path, source_path, dest_path, old_hash))
+
+    # every title is known before rendering, so links show current titles
+    titles = {url_path(rel_path): old_pages[rel_path]["title"] for rel_path in unchanged}
+    for rel_path, source_path, _, _ in tasks:
+        titles[url_path(rel_path)] = read_title(source_path)
+    # touched pages are included: one whose content is the same may still
+    # show a title or image that changed
+    graph = DependencyGraph()
+    for rel_path, entry in old_pages.items():
+        graph.add(rel_path, PageDependencies.from_dict(entry))
+    old_titles = {url_path(rel_path): entry["title"] for rel_path, entry in old_pages.items()}
+    affected = graph.dependents(titles=changed_paths(old_titles, titles),
+                                images=changed_paths(asset_urls(old_assets), images))
+
+    # an affected page must render even if its content hash is unchanged
+    tasks = [(rel_path, source_path, dest_path, None if rel_path in affected else old_hash)
+             for rel_path, source_path, dest_path, old_hash in tasks]
+    for rel_path, (source_path, dest_path) in unchanged.items():
+        if rel_path in affected:
+            tasks.append((rel_path, source_path, dest_path, None))
+        else:
+            pages[rel_path] = old_pages[rel_path]
+            result.skipped.append(rel_path)
+
+    for page in render_pages(tasks, template, jobs, profile, cache, fsync, titles,
+                             images, parse_cache):
+        rel_path = page.rel_path
+        if page.profile is not None:
+            result.profiles.append(page.profile)
+        if page.cache_delta is not None:
+            merge_cache_delta(cache, page.cache_delta)
+        if page.parse_delta is not None:
+            parse_cache.hits += page.parse_delta[0]
+            parse_cache.misses += page.parse_delta[1]
+            parse_cache.evictions += page.parse_delta[2]
+        if page.rendered:
+            result.rendered.append(rel_path)
+            dependencies = page.dependencies
+        else:
+            # touched but identical content
+            result.skipped.append(rel_path)
+            dependencies = PageDependencies.from_dict(old_pages[rel_path])
+        pages[rel_path] = {
+            "hash": page.source_hash,
+            "mtime_ns": stats[rel_path].st_mtime_ns,
+            "size": stats[rel_path].st_size,
+            "title": titles[url_path(rel_path)],
+            **dependencies.to_dict(),
+        }
+
+    for rel_path in old_pages.keys() - pages.keys():
+        remove_output(dest_dir, output_path(rel_path))
+        result.deleted.append(rel_path)
+    if result.assets is not None:
+        for rel_output in result.assets.stale_outputs:
+            remove_output(dest_dir, rel_output)
+    if parse_cache is not None:
+        # workers each bounded only what they saw of the directory
+        parse_cache.trim()
+
+    save_manifest(manifest_path, {
+        "version": MANIFEST_VERSION,
+        "template": template_hash,
+        "pages": pages,
+        "assets": assets,
+    })
+    return result
+
+
+def render_pages(tasks, template, jobs=1, profile=False, cache=None, fsync=False,
+                 titles=None, images=None, parse_cache=None):
+    """Run render tasks in this process or across a process pool
+    In this process pages are written by a background OutputWriter while
+    the next page renders. Workers read, render and write pages
+    themselves, so only the small task tuples and results cross process
+    boundaries. Each worker starts from a copy of cache and sends back
+    the block html it adds.
+
+    Args:
+        tasks (list): (rel_path, source_path, dest_path, old_hash) tuples
+        template (PageTemplate | str): html template
+        jobs (int): worker processes, None for one per core
+        profile (bool): record a PageProfile per rendered page
+        cache (RenderCache, optional): block html shared by every page
+        fsync (bool): sync written pages to disk before returning
+        titles (dict, optional): url path -> title of every page, shown by
+            links written without text
+        images (dict, optional): url path -> url of the content hashed copy
+            of each renamed image
+        parse_cache (ParseCache, optional): parsed pages kept on disk,
+            opened again by each worker
+
+    Returns:
+        list: PageResult for each task, in order
+    """
+    titles = titles if titles is not None else {}
+    images = images if images is not None else {}
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(tasks) <= 1:
+        page_titles = converter.page_titles
+        image_urls = converter.asset_urls
+        converter.page_titles = titles
+        converter.asset_urls = images
+        try:
+            with OutputWriter(fsync=fsync) as writer:
+                return [render_task(task, template, profile, cache, writer, parse_cache)
+                        for task in tasks]
+        finally:
+            converter.page_titles = page_titles
+            converter.asset_urls = image_urls
+
+    jobs = min(jobs, len(tasks))
+    chunksize = max(1, len(tasks) // (jobs * CHUNKS_PER_WORKER))
+    cache_state = None if cache is None else (cache.max_bytes, cache.entries())
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=_init_worker,
+                             initargs=(template, profile, cache_state, fsync,
+                                       titles, images, parse_cache)) as executor:
+        return list(executor.map(_render_worker_task, tasks, chunksize=chunksize))
+
+
+def render_task(task, template, profile=False, cache=None, writer=None, parse_cache=None):
+    """Render one page unless its content hash matches old_hash"""
+    rel_path, source_path, dest_path, old_hash = task
+    page_profile = profiler.begin_page(rel_path) if profile else None
+    dependencies = PageDependencies(url_base(rel_path))
+    converter.current_dependencies = dependencies
+    try:
+        start = time.perf_counter()
+        with MarkdownSource(source_path) as source:
+            source_hash = source.hash()
+            if page_profile is not None:
+                page_profile.record("read", time.perf_counter() - start, size=source.size)
+            if source_hash == old_hash:
+                return PageResult(rel_path, source_hash, False)
+            render_page(source, template, dest_path, cache, writer, parse_cache,
+                        default_title(rel_path))
+        return PageResult(rel_path, source_hash, True, page_profile, dependencies)
+    finally:
+        converter.current_dependencies = None
+        if profile:
+            profiler.end_page()
+
+
+def merge_cache_delta(cache, cache_delta):
+    """Fold a worker's cache statistics and new entries into cache"""
+    hits, misses, new_entries = cache_delta
+    cache.hits += hits
+    cache.misses += misses
+    for key, html in new_entries:
+        cache.put(key, html)
+
+
+_worker_template = None
+_worker_profile = False
+_worker_cache = None
+_worker_fsync = False
+_worker_parse_cache = None
+
+
+def _init_worker(template, profile, cache_state, fsync, titles, images, parse_cache):
+    # the template, cache, titles and image urls are sent once per worker
+    # instead of once per task
+    global _worker_template, _worker_profile, _worker_cache, _worker_fsync
+    global _worker_parse_cache
+    _worker_template = template
+    _worker_profile = profile
+    _worker_fsync = fsync
+    _worker_parse_cache = parse_cache
+    converter.page_titles = titles
+    converter.asset_urls = images
+    if cache_state is not None:
+        max_bytes, entries = cache_state
+        _worker_cache = RenderCache(max_bytes)
+        for key, html in entries:
+            _worker_cache.put(key, html)
+        _worker_cache.new_entries = []
+
+
+def _render_worker_task(task):
+    cache = _worker_cache
+    parse_cache = _worker_parse_cache
+    if parse_cache is not None:
+        parse_stats = (parse_cache.hits, parse_cache.misses, parse_cache.evictions)
+    if cache is None:
+        page = render_task(task, _worker_template, _worker_profile,
+                           parse_cache=parse_cache)
+    else:
+        hits = cache.hits
+        misses = cache.misses
+        page = render_task(task, _worker_template, _worker_profile, cache,
+                           parse_cache=parse_cache)
+        page.cache_delta = (cache.hits - hits, cache.misses - misses,
+                            cache.take_new_entries())
+    if parse_cache is not None:
+        page.parse_delta = (parse_cache.hits - parse_stats[0],
+                            parse_cache.misses - parse_stats[1],
+                            parse_cache.evictions - parse_stats[2])
+    return page
+
+
+def render_page(markdown, template, dest_path, cache=None, writer=None, parse_cache=None,
+                fallback_title=None):
+    """Render one markdown page into the template and write it to dest_path
+    With an OutputWriter the write is queued and the write stage only
+    measures the time to queue it.
+    """
+    data = render_html(markdown, template, cache, parse_cache, fallback_title).encode("utf-8")
+    start = time.perf_counter()
+    if writer is not None:
+        writer.submit(dest_path, data)
+    else:
+        # pool workers write synchronously, since they may exit as soon as
+        # the pool runs out of tasks
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        write_if_changed(dest_path, data, _worker_fsync)
+    page_profile = profiler.current
+    if page_profile is not None:
+        page_profile.record("write", time.perf_counter() - start, size=len(data))
+
+
+def render_html(markdown, template, cache=None, parse_cache=None, fallback_title=None):
+    """Render one markdown page into the template
+    A page without blocks, eg. an empty draft, renders an empty div.
+
+    Args:
+        markdown (str | MarkdownSource): markdown document with an h1 title
+        template (PageTemplate | str): html template with {{ Title }} and
+            {{ Content }}; str templates are compiled once and reused
+        cache (RenderCache, optional): reuse html of blocks seen before
+        parse_cache (ParseCache, optional): reuse the parsed tree of the
+            page, looked up by source hash; takes precedence over cache
+        fallback_title (str, optional): title of a page without an h1
+            heading, see default_title
+
+    Raises:
+        ValueError: page has no h1 heading and no fallback_title is given
+
+    Returns:
+        str: html of the page
+    """
+    if isinstance(template, str):
+        template = compile_template(template)
+    page_profile = profiler.current
+    start = time.perf_counter()
+    try:
+        title = extract_title(markdown)
+    except ValueError:
+        if fallback_title is None:
+            raise
+        title = fallback_title
+    title = escape_text(title)
+    if is_blank(markdown):
+        content = "<div></div>"
+        block_count = 0
+        parsed = start
+    elif parse_cache is not None:
+        source_hash = (markdown.hash() if isinstance(markdown, MarkdownSource)
+                       else hash_text(markdown))
+        root = parse_cache.markdown_to_html_node(iter_markdown_lines(markdown), source_hash)
+        block_count = len(root.children)
+        parsed = time.perf_counter()
+        content = iter_html(root)
+    elif cache is None and page_profile is None:
+        # blocks are built as the page is joined, so only one block's nodes
+        # are alive at a time
+        content = iter_html(markdown_to_html_node(iter_markdown_lines(markdown), lazy=True))
+        block_count = 0
+        parsed = start
+    elif cache is None:
+        # profiled pages are parsed up front, so parsing and to_html are
+        # timed apart
+        root = markdown_to_html_node(iter_markdown_lines(markdown))
+        block_count = len(root.children)
+        parsed = time.perf_counter()
+        # streamed into the page without building the content str first
+        content = iter_html(root)
+    else:
+        # cached blocks are stored as html, so parse and to_html are one stage
+        content = markdown_to_html(iter_markdown_lines(markdown), cache)
+        block_count = 0
+        parsed = time.perf_counter()
+    html = template.render({"Title": title, "Content": content})
+
+    if page_profile is not None:
+        # inline was recorded by block_parser while parsing
+        nested = page_profile.seconds.get("inline", 0.0)
+        page_profile.record("blocks", parsed - start - nested, block_count)
+        page_profile.record("to_html", time.perf_counter() - parsed, size=len(html))
+    return html
+
+
+def extract_title(markdown):
+    """Extract the text of the first h1 heading
+
+    Args:
+        markdown (str | MarkdownSource): markdown document
+
+    Raises:
+        ValueError: document has no h1 heading
+
+    Returns:
+        str: heading text
+    """
+    for line in iter_markdown_lines(markdown):
+        if line.startswith("# "):
+            return line[2:].strip()
+    raise ValueError("No h1 heading found")
+
+
+def read_title(source_path):
+    """Title of a markdown file, or None when it has no h1 heading"""
+    with MarkdownSource(source_path) as source:
+        try:
+            return extract_title(source)
+        except ValueError:
+            return None
+
+
+def default_title(rel_path):
+    """Title of a page without an h1 heading, its file name without the
+    extension, eg. blog/first-post.md -> first-post
+    """
+    return os.path.splitext(os.path.basename(rel_path))[0]
+
+
+def is_blank(markdown):
+    """Whether a markdown document has no blocks, only blank lines"""
+    return all(not line.strip() for line in iter_markdown_lines(markdown))
+
+
+def iter_markdown_lines(markdown):
+    """Fresh iterator over the lines of a markdown str or MarkdownSource"""
+    if isinstance(markdown, MarkdownSource):
+        return markdown.iter_lines()
+    return iter_text_lines(markdown)
+
+
+def iter_sources(content_dir):
+    """Yield paths of .md files relative to content_dir, in sorted order"""
+    for dir_path, dir_names, file_names in os.walk(content_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(".md"):
+                yield os.path.relpath(os.path.join(dir_path, file_name), content_dir)
+
+
+def output_path(rel_path):
+    """Relative output path of a source, eg. blog/post.md -> blog/post.html"""
+    return os.path.splitext(rel_path)[0] + ".html"
+
+
+def url_path(rel_path):
+    """Url a source is served at, eg. blog/post.md -> /blog/post.html"""
+    return "/" + output_path(rel_path).replace(os.sep, "/")
+
+
+def url_base(rel_path):
+    """Url directory relative links of a source resolve against, eg. /blog/"""
+    return posixpath.join(posixpath.dirname(url_path(rel_path)), "")
+
+
+def remove_output(dest_dir, rel_output):
+    """Delete an output file and any directories it leaves empty"""
+    path = os.path.join(dest_dir, rel_output)
+    if os.path.exists(path):
+        os.remove(path)
+    directory = os.path.dirname(path)
+    while os.path.abspath(directory) != os.path.abspath(dest_dir):
+        if not os.path.isdir(directory) or os.listdir(directory):
+            break
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+
+def load_manifest(manifest_path):
+    """Load a build manifest, or an empty one if missing or outdated"""
+    empty = {"version": MANIFEST_VERSION, "template": None, "pages": {}, "assets": {}}
+    try:
+        with open(manifest_path, encoding="utf-8") as fp:
+            manifest = json.load(fp)
+    except (OSError, ValueError):
+        return empty
+    if manifest.get("version") != MANIFEST_VERSION:
+        return empty
+    return manifest
+
+
+def save_manifest(manifest_path, manifest):
+    """Write the manifest atomically, so an interrupted build forces a rebuild"""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, indent=1, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+
+def read_file(path, newline=None):
+    with open(path, encoding="utf-8", newline=newline) as fp:
+        return fp.read()
+
+
+def hash_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
\ No newline at end of file
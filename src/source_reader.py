@@ -0,0 +1,61 @@
+import hashlib
+import mmap
+import os
+
+
+class MarkdownSource:
+    """Read-only memory map of a markdown file
+    Lines are located by offset in the map and each is decoded straight
+    from it, so the whole file is never copied into one bytes or str.
+    Use as a context manager, or call close() when done.
+
+    The map is not a copy: if the file is truncated while mapped, touching
+    a page past its new end raises SIGBUS and kills the process instead of
+    raising an exception. Only map files nothing rewrites in place while
+    they are read, eg. during a build; long running readers such as the
+    dev server read into a str instead.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as fp:
+            self.size = os.fstat(fp.fileno()).st_size
+            # empty files cannot be mapped
+            self._map = (mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+                         if self.size else None)
+        self._view = memoryview(self._map if self._map is not None else b"")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        # the view must be released before the map can be closed
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+
+    def hash(self):
+        """sha256 hex digest of the file's bytes"""
+        return hashlib.sha256(self._view).hexdigest()
+
+    def iter_lines(self):
+        """Yield the decoded lines of the file, without line endings
+        A trailing "\\r" is kept; the block parser strips it.
+        """
+        data = self._map
+        if data is None:
+            return
+        view = self._view
+        start = 0
+        while start < self.size:
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = self.size
+            yield str(view[start:end], "utf-8")
+            start = end + 1
+
+    def __repr__(self):
+        return f"MarkdownSource({self.path}, {self.size})"
\ No newline at end of file
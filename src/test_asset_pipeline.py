@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from asset_pipeline import (
+    asset_urls,
+    copy_asset,
+    hash_file,
+    hashed_path,
+    sync_assets,
+)
+
+
+class TestSyncAssets(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.static = os.path.join(root, "static")
+        self.public = os.path.join(root, "public")
+        self.ring = os.path.join("images", "ring.png")
+        self.write(self.ring, b"one ring")
+        self.write("style.css", b"body {}")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, rel_path, data, mtime_ns=None):
+        path = os.path.join(self.static, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as fp:
+            fp.write(data)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def read(self, rel_path):
+        with open(os.path.join(self.public, rel_path), "rb") as fp:
+            return fp.read()
+
+    def sync(self, old_entries, **kwargs):
+        return sync_assets(self.static, self.public, old_entries, **kwargs)
+
+    def test_copies_then_skips_unchanged(self):
+        first = self.sync({})
+        self.assertListEqual(first.copied, ["style.css", self.ring])
+        self.assertEqual(self.read(self.ring), b"one ring")
+        second = self.sync(first.entries)
+        self.assertListEqual(second.copied, [])
+        self.assertListEqual(second.skipped, ["style.css", self.ring])
+
+    def test_touched_file_skipped_by_hash(self):
+        entries = self.sync({}).entries
+        self.write(self.ring, b"one ring", mtime_ns=10**9)
+        result = self.sync(entries)
+        self.assertListEqual(result.copied, [])
+        self.assertEqual(result.entries[self.ring]["mtime_ns"], 10**9)
+
+    def test_changed_file_copied(self):
+        entries = self.sync({}).entries
+        self.write(self.ring, b"two rings", mtime_ns=10**9)
+        result = self.sync(entries)
+        self.assertListEqual(result.copied, [self.ring])
+        self.assertEqual(self.read(self.ring), b"two rings")
+
+    def test_missing_output_copied(self):
+        entries = self.sync({}).entries
+        os.remove(os.path.join(self.public, "style.css"))
+        self.assertListEqual(self.sync(entries).copied, ["style.css"])
+
+    def test_deleted_asset(self):
+        entries = self.sync({}).entries
+        os.remove(os.path.join(self.static, "style.css"))
+        result = self.sync(entries)
+        self.assertListEqual(result.deleted, ["style.css"])
+        self.assertListEqual(result.stale_outputs, ["style.css"])
+
+    def test_missing_static_dir(self):
+        self.static = os.path.join(self.temp_dir.name, "missing")
+        result = self.sync({})
+        self.assertEqual(result.entries, {})
+
+    def test_hashed_names(self):
+        result = self.sync({}, hashed=True)
+        output = hashed_path(self.ring, hash_file(os.path.join(self.static, self.ring)))
+        self.assertEqual(result.entries[self.ring]["output"], output)
+        self.assertEqual(self.read(output), b"one ring")
+        self.assertEqual(result.urls()["/images/ring.png"], "/" + output.replace(os.sep, "/"))
+        self.write(self.ring, b"two rings", mtime_ns=10**9)
+        changed = self.sync(result.entries, hashed=True)
+        self.assertListEqual(changed.stale_outputs, [output])
+        self.assertNotEqual(changed.entries[self.ring]["output"], output)
+
+    def test_unhashed_names_need_no_urls(self):
+        self.assertEqual(self.sync({}).urls(), {})
+
+    def test_hard_links(self):
+        self.sync({}, link=True)
+        source = os.stat(os.path.join(self.static, self.ring))
+        output = os.stat(os.path.join(self.public, self.ring))
+        self.assertEqual((source.st_dev, source.st_ino), (output.st_dev, output.st_ino))
+
+
+class TestCopyAsset(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.temp_dir.name, "source.bin")
+        self.dest = os.path.join(self.temp_dir.name, "out", "dest.bin")
+        self.data = os.urandom(3 * 1024 * 1024 + 7)
+        with open(self.source, "wb") as fp:
+            fp.write(self.data)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_dest(self):
+        with open(self.dest, "rb") as fp:
+            return fp.read()
+
+    def test_copy(self):
+        method = copy_asset(self.source, self.dest)
+        self.assertIn(method, ("range", "copy"))
+        self.assertEqual(self.read_dest(), self.data)
+        self.assertFalse(os.path.exists(self.dest + ".tmp"))
+
+    def test_link_falls_back_to_copy(self):
+        with mock.patch("os.link", side_effect=OSError("cross-device link")):
+            method = copy_asset(self.source, self.dest, link=True)
+        self.assertNotEqual(method, "link")
+        self.assertEqual(self.read_dest(), self.data)
+
+    @unittest.skipUnless(hasattr(os, "copy_file_range"), "no copy_file_range")
+    def test_copy_file_range_unsupported(self):
+        error = OSError(18, "Invalid cross-device link")
+        with mock.patch("os.copy_file_range", side_effect=error):
+            self.assertEqual(copy_asset(self.source, self.dest), "copy")
+        self.assertEqual(self.read_dest(), self.data)
+
+
+class TestAssetUrls(unittest.TestCase):
+    def test_only_renamed_assets(self):
+        entries = {
+            os.path.join("images", "ring.png"): {"output": os.path.join("images", "ring.abc.png")},
+            "style.css": {"output": "style.css"},
+        }
+        self.assertEqual(asset_urls(entries), {"/images/ring.png": "/images/ring.abc.png"})
+
+
+if __name__ == "__main__":
+    unittest.main()
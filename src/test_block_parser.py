@@ -0,0 +1,166 @@
+import io
+import unittest
+
+from block_parser import (
+    BlockType,
+    block_to_block_type,
+    iter_blocks,
+    iter_html_nodes,
+    markdown_to_blocks,
+    markdown_to_html_node,
+)
+from htmlnode import iter_html
+from markdown_parser import stats
+
+
+class TestMarkdownToBlocks(unittest.TestCase):
+    def test_markdown_to_blocks(self):
+        md = """
+This is **bolded** paragraph
+
+This is another paragraph with _italic_ text and `code` here
+This is the same paragraph on a new line
+
+- This is a list
+- with items
+"""
+        self.assertListEqual(
+            markdown_to_blocks(md),
+            [
+                "This is **bolded** paragraph",
+                "This is another paragraph with _italic_ text and `code` here\nThis is the same paragraph on a new line",
+                "- This is a list\n- with items",
+            ],
+        )
+
+    def test_excess_blank_lines(self):
+        md = "\n\n\nFirst\n\n\n\n   \nSecond\n\n"
+        self.assertListEqual(markdown_to_blocks(md), ["First", "Second"])
+
+    def test_code_fence_keeps_blank_lines(self):
+        md = "```\nline one\n\n  indented\n```\nafter"
+        self.assertListEqual(
+            markdown_to_blocks(md),
+            ["```\nline one\n\n  indented\n```", "after"],
+        )
+
+    def test_iter_blocks_reads_lines_lazily(self):
+        source = io.StringIO("# Heading\n\nparagraph\n")
+        blocks = iter_blocks(source)
+        self.assertEqual(next(blocks), (BlockType.HEADING, ["# Heading"]))
+        self.assertEqual(source.readline(), "paragraph\n")
+
+
+class TestBlockToBlockType(unittest.TestCase):
+    def test_block_types(self):
+        self.assertEqual(block_to_block_type("# heading"), BlockType.HEADING)
+        self.assertEqual(block_to_block_type("###### heading"), BlockType.HEADING)
+        self.assertEqual(block_to_block_type("####### heading"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("```\ncode\n```"), BlockType.CODE)
+        self.assertEqual(block_to_block_type("> quote\n> more"), BlockType.QUOTE)
+        self.assertEqual(block_to_block_type("- a\n- b"), BlockType.UNORDERED_LIST)
+        self.assertEqual(block_to_block_type("1. a\n2. b"), BlockType.ORDERED_LIST)
+        self.assertEqual(block_to_block_type("1. a\n3. b"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("> quote\nnot"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("plain"), BlockType.PARAGRAPH)
+
+
+class TestMarkdownToHTMLNode(unittest.TestCase):
+    def test_paragraphs(self):
+        md = """
+This is **bolded** paragraph
+text in a p
+tag here
+
+This is another paragraph with _italic_ text and `code` here
+
+"""
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p>"
+            "<p>This is another paragraph with <i>italic</i> text and <code>code</code> here</p></div>",
+        )
+
+    def test_codeblock(self):
+        md = """
+```
+This is text that _should_ remain
+the **same** even with inline stuff
+```
+"""
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><pre><code>This is text that _should_ remain\n"
+            "the **same** even with inline stuff\n</code></pre></div>",
+        )
+
+    def test_headings_and_quote(self):
+        md = "## Sub **heading**\n\n> A quote\n> continues"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><h2>Sub <b>heading</b></h2>"
+            "<blockquote>A quote continues</blockquote></div>",
+        )
+
+    def test_lists(self):
+        md = "- one\n- [two](/two)\n\n1. first\n2. `second`"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            '<div><ul><li>one</li><li><a href="/two">two</a></li></ul>'
+            "<ol><li>first</li><li><code>second</code></li></ol></div>",
+        )
+
+    def test_iter_html_nodes_from_file(self):
+        source = io.StringIO("# Title\n\nBody text\n")
+        nodes = [node.to_html() for node in iter_html_nodes(source)]
+        self.assertListEqual(nodes, ["<h1>Title</h1>", "<p>Body text</p>"])
+
+    def test_plain_text_fast_path(self):
+        stats.reset()
+        md = "# Plain & simple\n\nNo markup here!\n\n- item _one_"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><h1>Plain &amp; simple</h1><p>No markup here!</p>"
+            "<ul><li>item <i>one</i></li></ul></div>",
+        )
+        self.assertEqual((stats.plain, stats.scanned), (2, 1))
+
+    def test_empty_document(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html_node("\n\n")
+
+
+class TestLazyMarkdownToHTMLNode(unittest.TestCase):
+    MARKDOWN = ("# Title _one_\n\nA **bold** [link](/x)\n\n> quote *here*\n\n"
+                "- a\n- `b`\n\n1. c\n2. **d**\n\n```\ncode\n```")
+
+    def test_matches_eager(self):
+        self.assertEqual(
+            markdown_to_html_node(self.MARKDOWN, lazy=True).to_html(),
+            markdown_to_html_node(self.MARKDOWN).to_html(),
+        )
+
+    def test_blocks_parsed_while_serializing(self):
+        lines = iter(["First *block*", "", "Second *block*"])
+        stats.reset()
+        root = markdown_to_html_node(lines, lazy=True)
+        self.assertEqual(stats.scanned, 0)
+        chunks = iter_html(root)
+        self.assertListEqual([next(chunks), next(chunks), next(chunks)],
+                             ["<div>", "<p>", "First "])
+        self.assertEqual(stats.scanned, 1)
+        # the second block's lines are not read yet
+        self.assertEqual(next(lines), "Second *block*")
+
+    def test_empty_document_fails_when_serialized(self):
+        root = markdown_to_html_node("\n\n", lazy=True)
+        with self.assertRaises(ValueError):
+            root.to_html()
+
+    def test_frozen_cannot_be_lazy(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html_node(self.MARKDOWN, frozen=True, lazy=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
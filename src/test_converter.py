@@ -1,7 +1,9 @@
 import unittest
 
-from converter import text_node_to_html_node
-from textnode import TextNode, TextType
+import converter
+from converter import text_node_to_html_node, text_nodes_to_html_nodes
+from dependency_graph import PageDependencies
+from textnode import TextNode, TextNodeBatch, TextType
 
 
 class TestTextNodeToHTMLNode(unittest.TestCase):
@@ -92,5 +94,107 @@ class TestTextNodeToHTMLNode(unittest.TestCase):
         self.assertEqual(html_node.props["alt"], "Cool image")
 
 
+
+class TestTextNodesToHTMLNodes(unittest.TestCase):
+    def test_batch(self):
+        nodes = [
+            TextNode("Text ", TextType.TEXT),
+            TextNode("bold", TextType.BOLD),
+            TextNode("link", TextType.LINK, "url"),
+        ]
+        html_nodes = text_nodes_to_html_nodes(nodes)
+        self.assertIsInstance(html_nodes, list)
+        self.assertListEqual(
+            [node.to_html() for node in html_nodes],
+            ["Text ", "<b>bold</b>", '<a href="url">link</a>'],
+        )
+
+    def test_lazy_batch(self):
+        nodes = iter([TextNode("code", TextType.CODE)])
+        html_nodes = text_nodes_to_html_nodes(nodes, lazy=True)
+        self.assertNotIsInstance(html_nodes, list)
+        self.assertEqual(next(html_nodes).to_html(), "<code>code</code>")
+
+    def test_batch_empty(self):
+        self.assertListEqual(text_nodes_to_html_nodes([]), [])
+
+    def test_batch_invalid_node(self):
+        with self.assertRaises(TypeError):
+            text_nodes_to_html_nodes([TextNode("text", TextType.TEXT), ""])
+
+    def test_text_node_batch(self):
+        nodes = [
+            TextNode("Text ", TextType.TEXT),
+            TextNode("alt", TextType.IMAGE, "a.png"),
+            TextNode("link", TextType.LINK, "url"),
+        ]
+        batch = TextNodeBatch.from_nodes(nodes)
+        self.assertListEqual(
+            [node.to_html() for node in text_nodes_to_html_nodes(batch)],
+            [node.to_html() for node in text_nodes_to_html_nodes(nodes)],
+        )
+        self.assertEqual(text_node_to_html_node(batch, 2).to_html(),
+                         '<a href="url">link</a>')
+        with self.assertRaises(TypeError):
+            text_node_to_html_node(batch)
+
+    def test_batch_invalid_text_type(self):
+        invalid_node = TextNode("This is a node", TextType.TEXT)
+        invalid_node.text_type = "invalid"
+        with self.assertRaises(ValueError):
+            text_nodes_to_html_nodes([invalid_node])
+
+
+class TestDependencies(unittest.TestCase):
+    def setUp(self):
+        converter.page_titles = {"/blog/post.html": "A <Post>"}
+        converter.current_dependencies = PageDependencies("/blog/")
+
+    def tearDown(self):
+        converter.page_titles = {}
+        converter.asset_urls = {}
+        converter.current_dependencies = None
+
+    def test_link_without_text_shows_title(self):
+        node = text_node_to_html_node(TextNode("", TextType.LINK, "post"))
+        self.assertEqual(node.to_html(), '<a href="post">A &lt;Post&gt;</a>')
+        self.assertEqual(converter.current_dependencies.titles, {"/blog/post.html"})
+
+    def test_link_with_text_has_no_dependency(self):
+        node = text_node_to_html_node(TextNode("read", TextType.LINK, "post.html"))
+        self.assertEqual(node.value, "read")
+        self.assertFalse(converter.current_dependencies)
+
+    def test_unknown_page_is_still_recorded(self):
+        node = text_node_to_html_node(TextNode("", TextType.LINK, "/new.html"))
+        self.assertEqual(node.value, "")
+        self.assertEqual(converter.current_dependencies.titles, {"/new.html"})
+
+    def test_page_without_title(self):
+        converter.page_titles["/untitled.html"] = None
+        node = text_node_to_html_node(TextNode("", TextType.LINK, "/untitled.html"))
+        self.assertEqual(node.to_html(), '<a href="/untitled.html"></a>')
+        self.assertEqual(converter.current_dependencies.titles, {"/untitled.html"})
+
+    def test_image_recorded(self):
+        text_nodes_to_html_nodes([
+            TextNode("ring", TextType.IMAGE, "../images/ring.png"),
+            TextNode("elsewhere", TextType.IMAGE, "https://example.com/ring.png"),
+        ])
+        self.assertEqual(converter.current_dependencies.images, {"/images/ring.png"})
+
+    def test_not_recording(self):
+        converter.current_dependencies = None
+        node = text_node_to_html_node(TextNode("", TextType.LINK, "/blog/post.html"))
+        self.assertEqual(node.value, "A <Post>")
+
+    def test_image_points_at_hashed_copy(self):
+        converter.asset_urls = {"/images/ring.png": "/images/ring.abc.png"}
+        node = text_node_to_html_node(TextNode("ring", TextType.IMAGE, "../images/ring.png"))
+        self.assertEqual(node.props["src"], "/images/ring.abc.png")
+        node = text_node_to_html_node(TextNode("other", TextType.IMAGE, "other.png"))
+        self.assertEqual(node.props["src"], "other.png")
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
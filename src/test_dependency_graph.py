@@ -0,0 +1,67 @@
+import unittest
+
+from dependency_graph import (
+    DependencyGraph,
+    PageDependencies,
+    changed_paths,
+    local_url_path,
+    page_url_path,
+)
+
+
+class TestUrlPaths(unittest.TestCase):
+    def test_local_url_path(self):
+        self.assertEqual(local_url_path("/images/ring.png"), "/images/ring.png")
+        self.assertEqual(local_url_path("../images/ring.png", "/blog/"), "/images/ring.png")
+        self.assertEqual(local_url_path("post.html#top", "/blog/"), "/blog/post.html")
+        self.assertEqual(local_url_path("./", "/blog/"), "/blog/")
+
+    def test_other_sites_are_not_local(self):
+        self.assertIsNone(local_url_path("https://example.com/a.png"))
+        self.assertIsNone(local_url_path("//example.com/a.png"))
+        self.assertIsNone(local_url_path("mailto:frodo@shire.me"))
+        self.assertIsNone(local_url_path("#top"))
+
+    def test_page_url_path(self):
+        self.assertEqual(page_url_path("/about"), "/about.html")
+        self.assertEqual(page_url_path("/blog/"), "/blog/index.html")
+        self.assertEqual(page_url_path("post.html", "/blog/"), "/blog/post.html")
+        self.assertIsNone(page_url_path("https://example.com"))
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def test_dependents(self):
+        graph = DependencyGraph()
+        graph.add("index.md", PageDependencies(titles={"/about.html"}))
+        graph.add("blog/post.md", PageDependencies(
+            "/blog/", titles={"/about.html"}, images={"/ring.png"}))
+        self.assertEqual(graph.dependents(titles=["/about.html"]), {"index.md", "blog/post.md"})
+        self.assertEqual(graph.dependents(images=["/ring.png"]), {"blog/post.md"})
+        self.assertEqual(graph.dependents(titles=["/missing.html"]), set())
+
+    def test_add_replaces_and_remove_forgets(self):
+        graph = DependencyGraph()
+        graph.add("index.md", PageDependencies(titles={"/about.html"}))
+        graph.add("index.md", PageDependencies(titles={"/contact.html"}))
+        self.assertEqual(graph.dependents(titles=["/about.html"]), set())
+        self.assertEqual(graph.dependents(titles=["/contact.html"]), {"index.md"})
+        graph.remove("index.md")
+        graph.remove("index.md")
+        self.assertEqual(graph.dependents(titles=["/contact.html"]), set())
+        self.assertEqual(len(graph), 0)
+
+    def test_dict_round_trip(self):
+        dependencies = PageDependencies("/blog/", {"/b.html", "/a.html"}, {"/ring.png"})
+        data = dependencies.to_dict()
+        self.assertEqual(data, {"titles": ["/a.html", "/b.html"], "images": ["/ring.png"]})
+        self.assertEqual(PageDependencies.from_dict(data), dependencies)
+        self.assertFalse(PageDependencies.from_dict({}))
+
+    def test_changed_paths(self):
+        old = {"/a.html": "A", "/b.html": "B", "/c.html": "C"}
+        new = {"/a.html": "A", "/b.html": "Bee", "/d.html": "D"}
+        self.assertEqual(changed_paths(old, new), {"/b.html", "/c.html", "/d.html"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+from dev_server import SiteState, make_handler, url_path, watch
+from page_template import PageTemplate
+from site_builder import read_file, render_html
+from source_reader import MarkdownSource
+
+
+class TestSiteState(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nA post")
+        self.site = SiteState(self.content, self.template)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, text, mtime_ns=None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(text)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_initial_refresh_renders_all(self):
+        self.assertEqual(len(self.site.refresh()), 2)
+        self.assertEqual(
+            self.site.get("/"), b"<title>Home</title><div><h1>Home</h1><p>Welcome</p></div>"
+        )
+        self.assertIsNotNone(self.site.get("/blog/post"))
+        self.assertIsNotNone(self.site.get("/blog/post.html?x=1"))
+        self.assertIsNone(self.site.get("/missing"))
+
+    def test_refresh_renders_only_changed(self):
+        self.site.refresh()
+        self.assertListEqual(self.site.refresh(), [])
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nEdited", 10**9)
+        self.assertListEqual(self.site.refresh(), ["index.md"])
+        self.assertIn(b"Edited", self.site.get("/index.html"))
+
+    def test_refresh_drops_removed(self):
+        self.site.refresh()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self.assertListEqual(self.site.refresh(), [os.path.join("blog", "post.md")])
+        self.assertIsNone(self.site.get("/blog/post.html"))
+
+    def test_template_change_renders_all(self):
+        self.site.refresh()
+        self.write(self.template, "{{ Content }}", 10**9)
+        self.assertEqual(len(self.site.refresh()), 2)
+        self.assertEqual(self.site.get("/"), b"<div><h1>Home</h1><p>Welcome</p></div>")
+
+    def test_retitled_page_renders_pages_showing_its_title(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[](/blog/post)")
+        self.site.refresh()
+        self.assertIn(b">Post</a>", self.site.get("/"))
+        post = os.path.join("blog", "post.md")
+        self.write(os.path.join(self.content, post), "# Renamed\n\nA post", 10**9)
+        self.assertListEqual(sorted(self.site.refresh()), sorted([post, "index.md"]))
+        self.assertIn(b">Renamed</a>", self.site.get("/"))
+        os.remove(os.path.join(self.content, post))
+        self.assertListEqual(sorted(self.site.refresh()), sorted([post, "index.md"]))
+        self.assertIn(b'<a href="/blog/post"></a>', self.site.get("/"))
+
+    def test_link_to_page_without_title(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[](/blog/post)")
+        self.write(os.path.join(self.content, "blog", "post.md"), "No heading yet")
+        self.site.refresh()
+        self.assertIn(b'<a href="/blog/post"></a>', self.site.get("/"))
+
+    def test_broken_page_shows_error(self):
+        with open(os.path.join(self.content, "index.md"), "wb") as fp:
+            fp.write(b"# Home\n\n\xff")
+        self.site.refresh()
+        self.assertIn(b"codec can&#x27;t decode", self.site.get("/"))
+
+    def test_page_without_heading_titled_by_file_name(self):
+        self.write(os.path.join(self.content, "index.md"), "No title here")
+        self.write(os.path.join(self.content, "blog", "draft.md"), "")
+        self.site.refresh()
+        self.assertEqual(self.site.get("/"), b"<title>index</title><div><p>No title here</p></div>")
+        self.assertEqual(self.site.get("/blog/draft"), b"<title>draft</title><div></div>")
+
+    def test_sources_are_not_memory_mapped(self):
+        # a source truncated while mapped would kill the server with SIGBUS
+        with mock.patch("mmap.mmap", side_effect=AssertionError("mapped a source")):
+            self.assertEqual(len(self.site.refresh()), 2)
+            self.write(os.path.join(self.content, "index.md"), "# Home\n\nEdited", 10**9)
+            self.assertListEqual(self.site.refresh(), ["index.md"])
+        self.assertIn(b"<title>Home</title>", self.site.get("/"))
+        self.assertIn(b"Edited", self.site.get("/"))
+
+    def test_missing_template_keeps_the_last_one(self):
+        self.site.refresh()
+        moved = self.template + ".saving"
+        os.rename(self.template, moved)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nEdited", 10**9)
+        self.assertListEqual(self.site.refresh(), ["index.md"])
+        self.assertIn(b"<title>Home</title>", self.site.get("/"))
+        self.assertIn(b"Edited", self.site.get("/"))
+        os.rename(moved, self.template)
+        self.write(self.template, "{{ Content }}", 2 * 10**9)
+        self.assertEqual(len(self.site.refresh()), 2)
+        self.assertNotIn(b"<title>", self.site.get("/"))
+
+    def test_watch_survives_failed_refresh(self):
+        stop_event = threading.Event()
+        calls = []
+
+        class FailingSite:
+            def refresh(self):
+                calls.append(None)
+                if len(calls) == 1:
+                    raise OSError("template missing")
+                stop_event.set()
+                return []
+
+        with mock.patch("sys.stderr"):
+            watch(FailingSite(), interval=0.001, stop_event=stop_event)
+        self.assertEqual(len(calls), 2)
+
+    def test_renders_like_a_build(self):
+        path = os.path.join(self.content, "index.md")
+        with open(path, "w", encoding="utf-8", newline="") as fp:
+            fp.write("# Home\r\n\r\n```\na\u2028b\x0cc\rd\n```\n")
+        self.site.refresh()
+        with MarkdownSource(path) as source:
+            expected = render_html(source, PageTemplate(read_file(self.template)))
+        self.assertEqual(self.site.get("/"), expected.encode("utf-8"))
+
+    def test_url_path(self):
+        self.assertEqual(url_path(os.path.join("blog", "post.md")), "/blog/post.html")
+
+
+class TestHandler(unittest.TestCase):
+    def test_serves_from_memory(self):
+        site = SiteState(None, None)
+        site.pages["/index.html"] = b"<p>hi</p>"
+        server = ThreadingHTTPServer(("localhost", 0), make_handler(site))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base = f"http://localhost:{server.server_port}"
+            with urllib.request.urlopen(base + "/") as response:
+                self.assertEqual(response.read(), b"<p>hi</p>")
+                self.assertEqual(response.headers["Content-Type"], "text/html; charset=utf-8")
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(base + "/missing")
+            self.assertEqual(context.exception.code, 404)
+            context.exception.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
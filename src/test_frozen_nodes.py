@@ -0,0 +1,110 @@
+import unittest
+
+from block_parser import markdown_to_html_node
+from frozen_nodes import (
+    FrozenLeafNode,
+    FrozenParentNode,
+    FrozenProps,
+    freeze,
+    intern_leaf,
+    intern_props,
+)
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+
+class TestFreeze(unittest.TestCase):
+    def test_text_node(self):
+        node = freeze(TextNode("link", TextType.LINK, "url"))
+        self.assertEqual(node, TextNode("link", TextType.LINK, "url"))
+        self.assertIs(node, freeze(TextNode("link", TextType.LINK, "url")))
+        self.assertEqual(hash(node), hash(freeze(TextNode("link", TextType.LINK, "url"))))
+        with self.assertRaises(AttributeError):
+            node.text = "other"
+
+    def test_leaves_are_interned(self):
+        first = freeze(LeafNode("b", "Note"))
+        second = freeze(LeafNode("b", "Note"))
+        self.assertIs(first, second)
+        self.assertIsInstance(first, FrozenLeafNode)
+        self.assertEqual(first.to_html(), "<b>Note</b>")
+
+    def test_subtrees_are_shared(self):
+        def tree():
+            return ParentNode("div", [
+                ParentNode("p", [LeafNode("a", "home", {"href": "/"})]),
+                ParentNode("p", [LeafNode("a", "home", {"href": "/"})]),
+            ])
+        first = freeze(tree())
+        second = freeze(tree())
+        self.assertIs(first, second)
+        self.assertIs(first.children[0], first.children[1])
+        self.assertEqual(first.to_html(), tree().to_html())
+        self.assertEqual(len({first, second}), 1)
+
+    def test_frozen_parent_is_immutable(self):
+        node = freeze(ParentNode("p", [LeafNode(None, "text")]))
+        self.assertIsInstance(node, FrozenParentNode)
+        self.assertIsInstance(node.children, tuple)
+        with self.assertRaises(AttributeError):
+            node.children = []
+        with self.assertRaises(AttributeError):
+            node.tag = "div"
+
+    def test_non_str_value(self):
+        self.assertEqual(freeze(LeafNode("p", 5)).to_html(), "<p>5</p>")
+
+    def test_props_equal_in_any_order(self):
+        first = FrozenProps({"a": "1", "b": "2"})
+        second = FrozenProps({"b": "2", "a": "1"})
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertIs(intern_props({"href": "/", "title": "t"}),
+                      intern_props({"title": "t", "href": "/"}))
+        self.assertIs(intern_leaf("a", "x", {"href": "/", "title": "t"}),
+                      intern_leaf("a", "x", {"title": "t", "href": "/"}))
+        self.assertEqual(freeze(LeafNode("a", "x", {"href": "/", "title": "t"})),
+                         freeze(LeafNode("a", "x", {"title": "t", "href": "/"})))
+
+    def test_props_are_interned_and_read_only(self):
+        props = intern_props({"href": "/", "target": "_blank"})
+        self.assertIs(props, intern_props({"href": "/", "target": "_blank"}))
+        self.assertIsInstance(props, FrozenProps)
+        with self.assertRaises(TypeError):
+            props["href"] = "/other"
+        with self.assertRaises(TypeError):
+            props.update(href="/other")
+        leaf = intern_leaf("a", "x", {"href": "/", "target": "_blank"})
+        self.assertIs(leaf.props, props)
+
+    def test_deep_tree(self):
+        node = LeafNode("b", "deep")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        self.assertEqual(freeze(node).to_html(), node.to_html())
+
+    def test_invalid_node(self):
+        with self.assertRaises(TypeError):
+            freeze("text")
+
+    def test_frozen_leaf_with_plain_props(self):
+        node = FrozenLeafNode("a", "x", {"href": "/"})
+        self.assertIsInstance(node.props, FrozenProps)
+        self.assertEqual(node, FrozenLeafNode("a", "x", {"href": "/"}))
+
+    def test_frozen_leaf_escapes(self):
+        node = FrozenLeafNode("a", "<x>", {"title": '"q"'})
+        self.assertEqual(node.to_html(), '<a title="&quot;q&quot;">&lt;x&gt;</a>')
+
+
+class TestFrozenMarkdown(unittest.TestCase):
+    def test_matches_mutable(self):
+        md = "# Title\n\nShared [link](/)\n\n- Shared [link](/)\n\nShared [link](/)"
+        frozen = markdown_to_html_node(md, frozen=True)
+        self.assertIsInstance(frozen, FrozenParentNode)
+        self.assertEqual(frozen.to_html(), markdown_to_html_node(md).to_html())
+        self.assertIs(frozen.children[1], frozen.children[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
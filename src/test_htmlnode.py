@@ -1,6 +1,16 @@
+import io
+import sys
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import (
+    HTMLNode,
+    LeafNode,
+    ParentNode,
+    escape_attribute,
+    escape_text,
+    iter_html,
+    write_html,
+)
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -98,6 +108,66 @@ class TestLeafNode(unittest.TestCase):
         node = LeafNode("a", "Click me!", {"href": "https://www.google.com"})
         self.assertEqual(repr(node), "LeafNode(a, Click me!, {'href': 'https://www.google.com'})")
 
+    def test_escapes_value_and_props(self):
+        node = LeafNode("a", "Fish & <chips>", {"href": '/search?q="x"&page=2'})
+        self.assertEqual(
+            node.to_html(),
+            '<a href="/search?q=&quot;x&quot;&amp;page=2">Fish &amp; &lt;chips&gt;</a>',
+        )
+        self.assertEqual(LeafNode(None, "1 < 2").to_html(), "1 &lt; 2")
+
+    def test_cached_until_reassigned(self):
+        node = LeafNode("a", "old", {"href": "/old"})
+        self.assertEqual(node.to_html(), '<a href="/old">old</a>')
+        self.assertIs(node.props_to_html(), node.props_to_html())
+        node.value = "new"
+        node.props = {"href": "/new"}
+        self.assertEqual(node.to_html(), '<a href="/new">new</a>')
+        node.value = None
+        with self.assertRaises(ValueError):
+            node.to_html()
+
+    def test_non_str_value(self):
+        self.assertEqual(LeafNode("p", 5).to_html(), "<p>5</p>")
+        self.assertEqual(LeafNode(None, 1.5).to_html(), "1.5")
+
+    def test_props_changed_in_place(self):
+        node = LeafNode("a", "x", {"href": "/a"})
+        self.assertEqual(node.to_html(), '<a href="/a">x</a>')
+        node.props["href"] = "/b"
+        self.assertEqual(node.to_html(), '<a href="/b">x</a>')
+        node.props["title"] = "B"
+        self.assertEqual(node.to_html(), '<a href="/b" title="B">x</a>')
+        del node.props["href"]
+        self.assertEqual(node.to_html(), '<a title="B">x</a>')
+        node.props.clear()
+        self.assertEqual(node.to_html(), "<a>x</a>")
+
+        parent = ParentNode("p", [LeafNode(None, "x")], {"class": "a"})
+        self.assertEqual(parent.to_html(), '<p class="a">x</p>')
+        parent.props["class"] = "b"
+        self.assertEqual(parent.to_html(), '<p class="b">x</p>')
+
+    def test_slots(self):
+        leaf = LeafNode("b", "bold")
+        parent = ParentNode("p", [leaf])
+        self.assertFalse(hasattr(leaf, "__dict__"))
+        self.assertFalse(hasattr(parent, "__dict__"))
+        self.assertIsNone(leaf.children)
+
+
+class TestEscape(unittest.TestCase):
+    def test_escape_text(self):
+        text = "plain text"
+        self.assertIs(escape_text(text), text)
+        self.assertEqual(escape_text('a & b < c > "d"'), 'a &amp; b &lt; c &gt; "d"')
+        self.assertEqual(escape_text("&amp;"), "&amp;amp;")
+
+    def test_escape_attribute(self):
+        self.assertEqual(escape_attribute('say "hi" & <go>'),
+                         "say &quot;hi&quot; &amp; &lt;go&gt;")
+        self.assertEqual(escape_attribute(None), "None")
+
 
 class TestParentNode(unittest.TestCase):
     def test_repr(self):
@@ -188,5 +258,78 @@ class TestParentNode(unittest.TestCase):
         )
 
 
+class TestStreamingHTML(unittest.TestCase):
+    def test_iter_html_chunks(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode("b", "bold")])])
+        self.assertListEqual(
+            list(iter_html(node)),
+            ["<div>", "<p>", "<b>bold</b>", "</p>", "</div>"],
+        )
+
+    def test_iter_html_leaf(self):
+        self.assertListEqual(list(iter_html(LeafNode(None, "text"))), ["text"])
+
+    def test_write_html(self):
+        node = ParentNode(
+            "div",
+            [LeafNode("a", "link", {"href": "url"}), LeafNode(None, " text")],
+            {"class": "page"},
+        )
+        fp = io.StringIO()
+        write_html(node, fp)
+        self.assertEqual(fp.getvalue(), node.to_html())
+        self.assertEqual(
+            fp.getvalue(), '<div class="page"><a href="url">link</a> text</div>'
+        )
+
+    def test_deep_nesting(self):
+        depth = sys.getrecursionlimit() * 2
+        node = LeafNode("b", "deep")
+        for _ in range(depth):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * depth + "<b>deep</b>"))
+        self.assertTrue(html.endswith("</span>" * depth))
+
+    def test_invalid_nested_child(self):
+        child = ParentNode("p", [LeafNode(None, "text")])
+        parent = ParentNode("div", [child])
+        child.children = []
+        with self.assertRaises(ValueError):
+            write_html(parent, io.StringIO())
+
+
+class TestLazyParentNode(unittest.TestCase):
+    def test_children_pulled_while_serializing(self):
+        pulled = []
+
+        def children():
+            for text in ("one", "two"):
+                pulled.append(text)
+                yield LeafNode("b", text)
+
+        node = ParentNode("p", children())
+        self.assertListEqual(pulled, [])
+        chunks = iter_html(ParentNode("div", iter([node])))
+        self.assertListEqual([next(chunks), next(chunks), next(chunks)],
+                             ["<div>", "<p>", "<b>one</b>"])
+        self.assertListEqual(pulled, ["one"])
+        self.assertListEqual(list(chunks), ["<b>two</b>", "</p>", "</div>"])
+
+    def test_rendered_once(self):
+        node = ParentNode("p", (LeafNode(None, text) for text in "ab"))
+        self.assertEqual(node.to_html(), "<p>ab</p>")
+        with self.assertRaises(ValueError):
+            node.to_html()
+
+    def test_empty_children(self):
+        with self.assertRaises(ValueError):
+            ParentNode("p", iter([])).to_html()
+
+    def test_invalid_child(self):
+        with self.assertRaises(TypeError):
+            ParentNode("p", iter([LeafNode(None, "a"), "text"])).to_html()
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import gc
+import unittest
+
+import converter
+from block_parser import markdown_to_html_node
+from htmlnode import LeafNode, ParentNode
+from dependency_graph import PageDependencies
+from inline_parser import _Delimiter, parse_inline
+
+
+def render(text):
+    return "".join(node.to_html() for node in parse_inline(text))
+
+
+class TestParseInline(unittest.TestCase):
+    def test_flat_markup(self):
+        self.assertEqual(
+            render("Text **bold** _it_ *it* `code` ![alt](a.png) [link](/l)"),
+            'Text <b>bold</b> <i>it</i> <i>it</i> <code>code</code> '
+            '<img src="a.png" alt="alt"></img> <a href="/l">link</a>',
+        )
+
+    def test_nested_emphasis(self):
+        self.assertEqual(render("**bold _italic_**"), "<b>bold <i>italic</i></b>")
+        self.assertEqual(render("*a **b** c*"), "<i>a <b>b</b> c</i>")
+        self.assertEqual(render("***both***"), "<i><b>both</b></i>")
+        self.assertEqual(render("**a*b*c**"), "<b>a<i>b</i>c</b>")
+
+    def test_nested_nodes(self):
+        nodes = parse_inline("**bold _it_**")
+        self.assertEqual(len(nodes), 1)
+        self.assertIsInstance(nodes[0], ParentNode)
+        self.assertEqual(nodes[0].tag, "b")
+        self.assertEqual(nodes[0].children[1].tag, "i")
+        # plain content is a single leaf
+        self.assertIsInstance(parse_inline("**bold**")[0], LeafNode)
+
+    def test_links_with_markup(self):
+        self.assertEqual(render("[**bold** link](/x)"),
+                         '<a href="/x"><b>bold</b> link</a>')
+        self.assertEqual(render("**see [docs](/d)**"),
+                         '<b>see <a href="/d">docs</a></b>')
+        self.assertEqual(render("![alt *em*](i.png)"),
+                         '<img src="i.png" alt="alt em"></img>')
+
+    def test_no_links_in_links(self):
+        self.assertEqual(render("[a [b](/b) c](/a)"),
+                         '[a <a href="/b">b</a> c](/a)')
+
+    def test_emphasis_does_not_cross_links(self):
+        self.assertEqual(render("*a [b* c](/x)"), '*a <a href="/x">b* c</a>')
+
+    def test_code_spans(self):
+        self.assertEqual(render("`code **x**`"), "<code>code **x**</code>")
+        self.assertEqual(render("``a ` b``"), "<code>a ` b</code>")
+        self.assertEqual(render("`open"), "`open")
+
+    def test_unmatched_delimiters_are_text(self):
+        self.assertEqual(render("unclosed **bold"), "unclosed **bold")
+        self.assertEqual(render("**foo*"), "*<i>foo</i>")
+        self.assertEqual(render("2 * 3 * 4"), "2 * 3 * 4")
+        self.assertEqual(render("[x] and ] and a ![ b"), "[x] and ] and a ![ b")
+
+    def test_underscore_inside_words(self):
+        self.assertEqual(render("snake_case_name"), "snake_case_name")
+        self.assertEqual(render("foo*bar*"), "foo<i>bar</i>")
+
+    def test_adversarial_runs(self):
+        for text in ("*" * 10000, "*a " * 5000, "[" * 5000 + "](x)" * 5000,
+                     "_" * 3 + "*_" * 5000, "".join("`" * (i % 40 + 1) for i in range(2000))):
+            self.assertIsInstance(parse_inline(text), list)
+        self.assertEqual(render("*" * 50), "*" * 50)
+
+    def test_scanned_items_freed_without_gc(self):
+        # giant pages rely on the delimiters being freed as the tree is built
+        gc.collect()
+        gc.disable()
+        try:
+            nodes = parse_inline("**a** *b _c " * 1000 + "[x](/y) *d*")
+            leaked = sum(type(item) is _Delimiter for item in gc.get_objects())
+        finally:
+            gc.enable()
+        self.assertEqual(leaked, 0)
+        self.assertGreater(len(nodes), 1000)
+
+
+class TestNestedBlocks(unittest.TestCase):
+    def test_blocks_use_nested_parser(self):
+        md = "# **Bold _title_**\n\n- [**link**](/l)\n\nPlain unclosed *star"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><h1><b>Bold <i>title</i></b></h1>"
+            '<ul><li><a href="/l"><b>link</b></a></li></ul>'
+            "<p>Plain unclosed *star</p></div>",
+        )
+
+
+class TestDependencies(unittest.TestCase):
+    def tearDown(self):
+        converter.page_titles = {}
+        converter.current_dependencies = None
+
+    def test_links_and_images_recorded(self):
+        converter.page_titles = {"/about.html": "About"}
+        converter.current_dependencies = PageDependencies()
+        nodes = parse_inline("see [](/about) and ![ring](/ring.png) [*x*](/x.html)")
+        self.assertEqual(
+            "".join(node.to_html() for node in nodes),
+            'see <a href="/about">About</a> and <img src="/ring.png" alt="ring"></img> '
+            '<a href="/x.html"><i>x</i></a>',
+        )
+        self.assertEqual(converter.current_dependencies.titles, {"/about.html"})
+        self.assertEqual(converter.current_dependencies.images, {"/ring.png"})
+
+
+if __name__ == "__main__":
+    unittest.main()
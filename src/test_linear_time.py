@@ -0,0 +1,222 @@
+import gc
+import glob
+import os
+import random
+import sys
+import time
+import unittest
+
+from block_parser import markdown_to_html_node
+from inline_parser import parse_inline
+from markdown_parser import (
+    extract_markdown_images,
+    extract_markdown_links,
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from textnode import TextNode, TextNodeBatch, TextType
+
+
+SEED = 20240601
+# modules whose executed lines count as work, every module but the tests
+SOURCE_FILES = frozenset(
+    path for path in glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))
+    if not os.path.basename(path).startswith("test_")
+)
+# characters that matter to the inline parsers, plus some plain text
+ALPHABET = "**__``![]()  ab.\\é"
+
+# inputs that made naive parsers rescan the text, by name
+PATHOLOGICAL = {
+    "open_brackets": lambda n: "[" * n,
+    "open_images": lambda n: "![" * n,
+    "unclosed_links": lambda n: "[a](" * n,
+    "bracket_parens": lambda n: "](" * n,
+    "long_link_text": lambda n: "[" + "a" * n + "](",
+    "star_runs": lambda n: "*" * n,
+    "open_strong": lambda n: "**a" * n,
+    "open_emphasis": lambda n: "*a " * n,
+    "underscores": lambda n: "_a_" * n,
+    "mixed_runs": lambda n: "*_" * n,
+    "backticks": lambda n: "".join("`" * (i % 30 + 1) + "a" for i in range(n // 16)),
+    "nested_brackets": lambda n: "[" * (n // 8) + "](x)" * (n // 8),
+    "nested_links": lambda n: "[" * (n // 10) + "[a](b)" + "](c)" * (n // 10),
+    "nested_parens": lambda n: "[a](" + "(" * (n // 2) + ")" * (n // 2),
+}
+
+
+def random_text(rng, size):
+    return "".join(rng.choice(ALPHABET) for _ in range(size))
+
+
+def leaf_text(nodes):
+    """Text content of html nodes, without tags or attributes"""
+    parts = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if node.children:
+            stack.extend(reversed(node.children))
+        else:
+            parts.append(node.value)
+    return "".join(parts)
+
+
+def is_subsequence(part, whole):
+    characters = iter(whole)
+    return all(char in characters for char in part)
+
+
+def outcome(function, *args):
+    """Result of function, or the type of the ValueError it raised"""
+    try:
+        return function(*args)
+    except ValueError:
+        return ValueError
+
+
+class TestFuzz(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(SEED)
+
+    def texts(self, count=300, size=40):
+        return [random_text(self.rng, self.rng.randrange(size)) for _ in range(count)]
+
+    def test_parse_inline_keeps_text_order(self):
+        for text in self.texts():
+            nodes = parse_inline(text)
+            "".join(node.to_html() for node in nodes)
+            self.assertTrue(is_subsequence(leaf_text(nodes), text), text)
+
+    def test_text_to_textnodes_keeps_text_order(self):
+        for text in self.texts():
+            nodes = outcome(text_to_textnodes, text)
+            if nodes is not ValueError:
+                joined = "".join(node.text for node in nodes)
+                self.assertTrue(is_subsequence(joined, text), text)
+            batch = outcome(text_to_textnodes, text, True)
+            self.assertEqual(nodes, batch if batch is ValueError else list(batch), text)
+
+    def test_split_nodes_delimiter_batch_parity(self):
+        for text in self.texts():
+            for delimiter, text_type in (("**", TextType.BOLD), ("_", TextType.ITALIC),
+                                         ("`", TextType.CODE)):
+                nodes = outcome(split_nodes_delimiter, [TextNode(text, TextType.TEXT)],
+                                delimiter, text_type)
+                batch = outcome(split_nodes_delimiter,
+                                TextNodeBatch.from_nodes([TextNode(text, TextType.TEXT)]),
+                                delimiter, text_type)
+                self.assertEqual(nodes, batch if batch is ValueError else list(batch), text)
+
+    def test_split_links_parity(self):
+        for text in self.texts():
+            nodes = [TextNode(text, TextType.TEXT)]
+            expected = split_nodes_link(split_nodes_image(nodes))
+            match_cache = {}
+            cached = split_nodes_link(split_nodes_image(nodes, match_cache), match_cache)
+            batch = split_nodes_link(split_nodes_image(TextNodeBatch.from_nodes(nodes)))
+            self.assertListEqual(expected, cached, text)
+            self.assertListEqual(expected, list(batch), text)
+            images = [(node.text, node.url) for node in expected
+                      if node.text_type == TextType.IMAGE]
+            links = [(node.text, node.url) for node in expected
+                     if node.text_type == TextType.LINK]
+            self.assertListEqual(images, extract_markdown_images(text), text)
+            self.assertListEqual(links, extract_markdown_links(text), text)
+
+    def test_documents_render(self):
+        prefixes = ["", "# ", "> ", "- ", "1. ", "```"]
+        for _ in range(100):
+            lines = [self.rng.choice(prefixes) + random_text(self.rng, 20)
+                     for _ in range(self.rng.randrange(1, 8))]
+            node = outcome(markdown_to_html_node, "\n".join(lines))
+            if node is not ValueError:
+                node.to_html()
+
+
+class TestLinearTime(unittest.TestCase):
+    """Work must grow linearly: 4x the input may cost at most 8x, where
+    quadratic behavior costs 16x.
+
+    Work is counted as the lines of the repo's modules executed, which is
+    exact and unaffected by machine load. Scans inside one C call, eg. a
+    str.find rescanning the text, run no lines, so CPU time of this process
+    is compared too, over larger inputs with garbage collection paused,
+    since its cost grows with every object alive, not the input.
+    """
+    LINES_SIZE = 500
+    TIME_SIZE = 8000
+    MAX_RATIO = 8
+
+    def lines_run(self, function, text):
+        count = 0
+
+        def trace_lines(frame, event, arg):
+            nonlocal count
+            if event == "line":
+                count += 1
+            return trace_lines
+
+        def trace_calls(frame, event, arg):
+            if frame.f_code.co_filename in SOURCE_FILES:
+                return trace_lines
+            return None
+
+        sys.settrace(trace_calls)
+        try:
+            outcome(function, text)
+        finally:
+            sys.settrace(None)
+        return count
+
+    def best_time(self, function, text):
+        best = float("inf")
+        for _ in range(5):
+            start = time.process_time()
+            outcome(function, text)
+            best = min(best, time.process_time() - start)
+        return best
+
+    def ratio(self, measure, size, function, make_input):
+        small = measure(function, make_input(size))
+        large = measure(function, make_input(4 * size))
+        if measure == self.lines_run:
+            self.assertGreater(small, 0, "no lines of the parsers were traced")
+        return large / max(small, 1e-4)
+
+    def assert_linear(self, function):
+        for name, make_input in PATHOLOGICAL.items():
+            ratio = self.ratio(self.lines_run, self.LINES_SIZE, function, make_input)
+            self.assertLessEqual(ratio, self.MAX_RATIO, f"{name}: lines run")
+        gc.disable()
+        try:
+            for name, make_input in PATHOLOGICAL.items():
+                ratio = self.ratio(self.best_time, self.TIME_SIZE, function, make_input)
+                if ratio > self.MAX_RATIO:
+                    # measure again before failing on a noisy machine
+                    ratio = self.ratio(self.best_time, self.TIME_SIZE, function, make_input)
+                self.assertLessEqual(ratio, self.MAX_RATIO, f"{name}: cpu time")
+        finally:
+            gc.enable()
+
+    def test_extract(self):
+        self.assert_linear(extract_markdown_images)
+        self.assert_linear(extract_markdown_links)
+
+    def test_split_nodes(self):
+        self.assert_linear(lambda text: split_nodes_delimiter(
+            [TextNode(text, TextType.TEXT)], "**", TextType.BOLD))
+        self.assert_linear(lambda text: split_nodes_link(
+            split_nodes_image([TextNode(text, TextType.TEXT)])))
+
+    def test_text_to_textnodes(self):
+        self.assert_linear(text_to_textnodes)
+
+    def test_parse_inline(self):
+        self.assert_linear(parse_inline)
+
+
+if __name__ == "__main__":
+    unittest.main()
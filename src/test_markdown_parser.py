@@ -3,11 +3,15 @@ import unittest
 from markdown_parser import (
     split_nodes_delimiter,
     split_nodes_image,
+    split_nodes_link,
     extract_markdown_images, 
+    text_to_textnodes,
     extract_markdown_links,
+    is_plain_text,
+    stats,
     )
 
-from textnode import TextNode, TextType
+from textnode import TextNode, TextNodeBatch, TextType
 
 
 class TestSplitNodesDelimiter(unittest.TestCase):
@@ -136,6 +140,10 @@ class TestSplitNodesDelimiter(unittest.TestCase):
             result = split_nodes_delimiter([node], "#", "heading")
             self.assertEqual(str(context), "text_type must be a valid TextType enum value")
 
+    def test_empty_delimiter(self):
+        with self.assertRaises(ValueError):
+            split_nodes_delimiter([TextNode("text", TextType.TEXT)], "", TextType.BOLD)
+
     def test_empty_node_list(self):
         result =  split_nodes_delimiter([], "_", TextType.ITALIC)
         self.assertListEqual(result, [])
@@ -215,6 +223,28 @@ class TestExtractMarkdownLink(unittest.TestCase):
         matches = extract_markdown_links(text)
         self.assertListEqual(matches, [("link", "urllink")])
 
+    def test_extract_innermost_link(self):
+        # links may not contain links
+        text = "[outer [inner](/in) text](/out) and [a](/b)"
+        self.assertListEqual(extract_markdown_links(text), [("inner", "/in"), ("a", "/b")])
+
+    def test_extract_nested_brackets(self):
+        self.assertListEqual(extract_markdown_links("[see [1]](/notes)"),
+                             [("see [1]", "/notes")])
+        self.assertListEqual(extract_markdown_images("![a [b] c](/i.png)"),
+                             [("a [b] c", "/i.png")])
+
+    def test_extract_parentheses_in_url(self):
+        text = "[Mercury](https://en.wikipedia.org/wiki/Mercury_(planet)) and ![x](/a_(1).png)"
+        self.assertListEqual(extract_markdown_links(text),
+                             [("Mercury", "https://en.wikipedia.org/wiki/Mercury_(planet)")])
+        self.assertListEqual(extract_markdown_images(text), [("x", "/a_(1).png")])
+
+    def test_extract_unbalanced(self):
+        self.assertListEqual(extract_markdown_links("[a [b](c)"), [("b", "c")])
+        self.assertListEqual(extract_markdown_links("[a](b (c)"), [])
+        self.assertListEqual(extract_markdown_links("[[a](b)](c)"), [("a", "b")])
+
 
 class TestSplitNodesImage(unittest.TestCase):
     def test_split_single_image(self):
@@ -297,10 +327,275 @@ class TestSplitNodesImage(unittest.TestCase):
             new_nodes,
         )
     
-    # TODO: implment the following test
-    # mixed content (links and images)
-    # Broken links (incomplete or malformed markdown)
-    # multiple nodes (like say text only, contains image, contains link)
+    def test_mixed_links_and_images(self):
+        node = TextNode("A [link](urllink) and ![image](image.png)", TextType.TEXT)
+        new_nodes = split_nodes_image([node])
+        self.assertListEqual(
+            [
+                TextNode("A [link](urllink) and ", TextType.TEXT),
+                TextNode("image", TextType.IMAGE, "image.png"),
+            ],
+            new_nodes,
+        )
+
+    def test_broken_image(self):
+        node = TextNode("Broken ![image](image.png and ![alt] text", TextType.TEXT)
+        self.assertListEqual(split_nodes_image([node]), [node])
+
+    def test_multiple_nodes(self):
+        nodes = [
+            TextNode("text only", TextType.TEXT),
+            TextNode("![image](image.png)", TextType.BOLD),
+            TextNode("has ![image](image.png)", TextType.TEXT),
+        ]
+        self.assertListEqual(
+            split_nodes_image(nodes),
+            [
+                TextNode("text only", TextType.TEXT),
+                TextNode("![image](image.png)", TextType.BOLD),
+                TextNode("has ", TextType.TEXT),
+                TextNode("image", TextType.IMAGE, "image.png"),
+            ]
+        )
+
+
+class TestSplitNodesLink(unittest.TestCase):
+    def test_split_links(self):
+        node = TextNode(
+            "This is text with a [link](https://boot.dev) and [another](https://google.com) end",
+            TextType.TEXT,
+        )
+        self.assertListEqual(
+            split_nodes_link([node]),
+            [
+                TextNode("This is text with a ", TextType.TEXT),
+                TextNode("link", TextType.LINK, "https://boot.dev"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("another", TextType.LINK, "https://google.com"),
+                TextNode(" end", TextType.TEXT),
+            ]
+        )
+
+    def test_split_link_ignores_images(self):
+        node = TextNode("![image](image.png) only", TextType.TEXT)
+        self.assertListEqual(split_nodes_link([node]), [node])
+
+    def test_split_no_link(self):
+        node = TextNode("This is a text with no link!", TextType.TEXT)
+        self.assertListEqual(split_nodes_link([node]), [node])
+
+    def test_shared_match_cache(self):
+        text = "![one](1.png) then [a](x) and ![two](2.png) [b](y)"
+        match_cache = {}
+        nodes = split_nodes_image([TextNode(text, TextType.TEXT)], match_cache)
+        self.assertEqual(
+            match_cache[" then [a](x) and "], [(False, "a", "x", 6, 12)]
+        )
+        self.assertListEqual(
+            split_nodes_link(nodes, match_cache),
+            split_nodes_link(split_nodes_image([TextNode(text, TextType.TEXT)])),
+        )
+        self.assertListEqual(
+            split_nodes_link(nodes, match_cache),
+            [
+                TextNode("one", TextType.IMAGE, "1.png"),
+                TextNode(" then ", TextType.TEXT),
+                TextNode("a", TextType.LINK, "x"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("two", TextType.IMAGE, "2.png"),
+                TextNode(" ", TextType.TEXT),
+                TextNode("b", TextType.LINK, "y"),
+            ]
+        )
+
+
+    def test_split_nested_brackets_and_parentheses(self):
+        text = "[see [1]](/notes), [X](/wiki/X_(y)) and [![badge](/b.svg)](/ci)"
+        expected = [
+            TextNode("see [1]", TextType.LINK, "/notes"),
+            TextNode(", ", TextType.TEXT),
+            TextNode("X", TextType.LINK, "/wiki/X_(y)"),
+            TextNode(" and [", TextType.TEXT),
+            TextNode("badge", TextType.IMAGE, "/b.svg"),
+            TextNode("](/ci)", TextType.TEXT),
+        ]
+        nodes = [TextNode(text, TextType.TEXT)]
+        self.assertListEqual(split_nodes_link(split_nodes_image(nodes)), expected)
+        batch = TextNodeBatch.from_nodes(nodes)
+        self.assertListEqual(list(split_nodes_link(split_nodes_image(batch))), expected)
+        self.assertListEqual(text_to_textnodes(text), expected)
+
+def multi_pass_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+class TestTextToTextNodesParity(unittest.TestCase):
+    def assert_parity(self, text):
+        self.assertListEqual(text_to_textnodes(text), multi_pass_textnodes(text))
+
+    def test_parity_plain_text(self):
+        self.assert_parity("Plain text with no markdown at all")
+
+    def test_parity_bold(self):
+        self.assert_parity("Text with **bold** and **more bold** formatting")
+
+    def test_parity_italic(self):
+        self.assert_parity("Text with _italic text_ in it")
+
+    def test_parity_code(self):
+        self.assert_parity("`code` at start and ends with `code`")
+
+    def test_parity_adjacent_delimiters(self):
+        self.assert_parity("Text with **bold****more bold**")
+
+    def test_parity_images(self):
+        self.assert_parity(
+            "An ![image](https://i.imgur.com/zjjcJKZ.png) and another "
+            "![second image](https://i.imgur.com/3elNhQu.png)"
+        )
+
+    def test_parity_links(self):
+        self.assert_parity("A [link](https://boot.dev) and ![image](image.png)")
+
+    def test_parity_adjacent_images(self):
+        self.assert_parity("![image1](imagelink1)![image2](imagelink2)")
+
+    def test_parity_mixed(self):
+        self.assert_parity(
+            "This is **text** with an _italic_ word and a `code block` "
+            "and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) !"
+        )
+
+    def test_parity_empty_text(self):
+        self.assertListEqual(text_to_textnodes(""), [])
+
+    def test_parity_unmatched_delimiter(self):
+        text = "Text with `unmatched delimiter"
+        with self.assertRaises(ValueError):
+            multi_pass_textnodes(text)
+        with self.assertRaises(ValueError):
+            text_to_textnodes(text)
+
+
+class TestTextToTextNodes(unittest.TestCase):
+    def test_links(self):
+        text = "A [link](https://boot.dev) and ![image](image.png)"
+        self.assertListEqual(
+            text_to_textnodes(text),
+            [
+                TextNode("A ", TextType.TEXT),
+                TextNode("link", TextType.LINK, "https://boot.dev"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("image", TextType.IMAGE, "image.png"),
+            ]
+        )
+
+    def test_star_italic(self):
+        self.assertListEqual(
+            text_to_textnodes("*italic* and **bold**"),
+            [
+                TextNode("italic", TextType.ITALIC),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("bold", TextType.BOLD),
+            ]
+        )
+
+    def test_code_content_not_parsed(self):
+        self.assertListEqual(
+            text_to_textnodes("Run `snake_case **x**` now"),
+            [
+                TextNode("Run ", TextType.TEXT),
+                TextNode("snake_case **x**", TextType.CODE),
+                TextNode(" now", TextType.TEXT),
+            ]
+        )
+
+    def test_lone_brackets_are_text(self):
+        text = "Wow! [not a link] and ! alone"
+        self.assertListEqual(
+            text_to_textnodes(text), [TextNode(text, TextType.TEXT)]
+        )
+
+
+
+class TestTextNodeBatchSplitting(unittest.TestCase):
+    def split_all(self, nodes):
+        nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+        nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+        nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+        nodes = split_nodes_image(nodes)
+        return split_nodes_link(nodes)
+
+    def assert_batch_parity(self, nodes):
+        batch = self.split_all(TextNodeBatch.from_nodes(nodes))
+        self.assertIsInstance(batch, TextNodeBatch)
+        self.assertListEqual(list(batch), self.split_all(nodes))
+
+    def test_split_parity(self):
+        self.assert_batch_parity([
+            TextNode("A **bold** and _it_ with `code` then ![img](a.png) "
+                     "and [link](https://x.y) end", TextType.TEXT),
+            TextNode("kept **as is**", TextType.CODE),
+            TextNode("", TextType.TEXT),
+            TextNode("[a](1)[b](2)![c](3)", TextType.TEXT),
+            TextNode("site", TextType.LINK, "/site"),
+        ])
+
+    def test_split_shares_backing_text(self):
+        batch = TextNodeBatch.from_text("a **b** c")
+        split = split_nodes_delimiter(batch, "**", TextType.BOLD)
+        self.assertIs(split.text, batch.text)
+        self.assertEqual(split[1], TextNode("b", TextType.BOLD))
+
+    def test_split_unclosed_delimiter(self):
+        with self.assertRaises(ValueError):
+            split_nodes_delimiter(TextNodeBatch.from_text("a **b"), "**", TextType.BOLD)
+
+    def test_split_only_within_spans(self):
+        # a delimiter pair must not be matched across two TEXT nodes
+        batch = TextNodeBatch.from_nodes([
+            TextNode("a `b", TextType.TEXT),
+            TextNode("c` d", TextType.TEXT),
+        ])
+        with self.assertRaises(ValueError):
+            split_nodes_delimiter(batch, "`", TextType.CODE)
+
+    def test_text_to_textnodes_batch(self):
+        text = "A **bold** and *it* then ![img](a.png) and [link](/l) plus [lone"
+        batch = text_to_textnodes(text, batch=True)
+        self.assertIsInstance(batch, TextNodeBatch)
+        self.assertIs(batch.text, text)
+        self.assertListEqual(list(batch), text_to_textnodes(text))
+        self.assertEqual(len(text_to_textnodes("", batch=True)), 0)
+
+
+
+class TestPlainTextFastPath(unittest.TestCase):
+    def setUp(self):
+        stats.reset()
+
+    def test_is_plain_text(self):
+        self.assertTrue(is_plain_text("Hello, world! (see below)"))
+        self.assertTrue(is_plain_text(""))
+        for text in ("a *b*", "snake_case", "`x`", "[a](b)", "![a](b)"):
+            self.assertFalse(is_plain_text(text), text)
+        self.assertEqual((stats.plain, stats.scanned), (2, 0))
+
+    def test_text_to_textnodes_counts(self):
+        self.assertListEqual(text_to_textnodes("Just text!"),
+                             [TextNode("Just text!", TextType.TEXT)])
+        self.assertListEqual(text_to_textnodes(""), [])
+        self.assertListEqual(list(text_to_textnodes("Just text", batch=True)),
+                             [TextNode("Just text", TextType.TEXT)])
+        text_to_textnodes("Some **bold**")
+        self.assertEqual((stats.plain, stats.scanned), (3, 1))
+        self.assertEqual(repr(stats), "InlineStats(plain: 3, scanned: 1)")
 
 
 if __name__ == "__main__":
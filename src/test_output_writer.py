@@ -0,0 +1,98 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from output_writer import OutputWriter, write_if_changed
+
+
+class TestWriteIfChanged(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "page.html")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read(self):
+        with open(self.path, "rb") as fp:
+            return fp.read()
+
+    def test_new_file(self):
+        self.assertTrue(write_if_changed(self.path, b"<p>new</p>"))
+        self.assertEqual(self.read(), b"<p>new</p>")
+
+    def test_unchanged_file_not_written(self):
+        write_if_changed(self.path, b"<p>same</p>")
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(write_if_changed(self.path, b"<p>same</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+
+    def test_same_size_different_bytes(self):
+        write_if_changed(self.path, b"<p>aaa</p>")
+        self.assertTrue(write_if_changed(self.path, b"<p>bbb</p>", fsync=True))
+        self.assertEqual(self.read(), b"<p>bbb</p>")
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_writes_in_background(self):
+        with OutputWriter(workers=2, max_pending=2) as writer:
+            for number in range(20):
+                path = os.path.join(self.root, f"dir{number % 3}", f"{number}.html")
+                writer.submit(path, f"<p>{number}</p>".encode("utf-8"))
+        self.assertEqual(writer.written, 20)
+        with open(os.path.join(self.root, "dir1", "7.html"), "rb") as fp:
+            self.assertEqual(fp.read(), b"<p>7</p>")
+
+    def test_skips_unchanged(self):
+        path = os.path.join(self.root, "page.html")
+        write_if_changed(path, b"same")
+        with OutputWriter(fsync=True) as writer:
+            writer.submit(path, b"same")
+            writer.submit(os.path.join(self.root, "sub", "new.html"), b"new")
+        self.assertEqual((writer.written, writer.unchanged), (1, 1))
+
+    def test_error_raised_on_close(self):
+        blocker = os.path.join(self.root, "file")
+        write_if_changed(blocker, b"not a directory")
+        writer = OutputWriter()
+        writer.submit(os.path.join(blocker, "page.html"), b"data")
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_error_raised_before_done_callbacks_run(self):
+        # callbacks run after the waiters on a future are woken
+        release = OutputWriter._release
+
+        def slow_release(writer, future):
+            time.sleep(0.05)
+            release(writer, future)
+
+        with mock.patch.object(OutputWriter, "_release", slow_release), \
+                mock.patch("output_writer.write_if_changed", side_effect=OSError("disk full")):
+            writer = OutputWriter()
+            writer.submit(os.path.join(self.root, "page.html"), b"data")
+            with self.assertRaises(OSError):
+                writer.close()
+
+    def test_error_raised_by_next_submit(self):
+        blocker = os.path.join(self.root, "file")
+        write_if_changed(blocker, b"not a directory")
+        writer = OutputWriter()
+        writer.submit(os.path.join(blocker, "page.html"), b"data")
+        writer._futures[0].exception()
+        with self.assertRaises(OSError):
+            writer.submit(os.path.join(self.root, "next.html"), b"data")
+        writer.close()
+        self.assertFalse(os.path.exists(os.path.join(self.root, "next.html")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import pickle
+import unittest
+
+from htmlnode import LeafNode, ParentNode, iter_html
+from page_template import PageTemplate, compile_template
+
+
+class TestPageTemplate(unittest.TestCase):
+    def test_compile(self):
+        template = PageTemplate("<title>{{ Title }}</title><main>{{Content}}</main>")
+        self.assertEqual(template.segments, ("<title>", "</title><main>", "</main>"))
+        self.assertEqual(template.slots,
+                         (("Title", "{{ Title }}"), ("Content", "{{Content}}")))
+        self.assertEqual(template.names, ["Title", "Content"])
+
+    def test_render(self):
+        template = PageTemplate("<h1>{{ Title }}</h1>{{ Content }}")
+        values = {"Title": "Hi", "Content": "<p>body</p>"}
+        self.assertEqual(template.render(values), "<h1>Hi</h1><p>body</p>")
+        self.assertEqual("".join(template.iter_render(values)), template.render(values))
+
+    def test_values_are_not_rescanned(self):
+        template = PageTemplate("{{ Title }}|{{ Content }}")
+        rendered = template.render({"Title": "{{ Content }}", "Content": "x"})
+        self.assertEqual(rendered, "{{ Content }}|x")
+
+    def test_missing_value_keeps_placeholder(self):
+        template = PageTemplate("{{ Title }} {{  Other  }} {not} {{ }}")
+        self.assertEqual(template.render({"Title": "T"}), "T {{  Other  }} {not} {{ }}")
+
+    def test_no_placeholders(self):
+        template = PageTemplate("<p>static</p>")
+        self.assertEqual(template.render({}), "<p>static</p>")
+        self.assertEqual(PageTemplate("").render({}), "")
+
+    def test_streams_chunks(self):
+        root = ParentNode("div", [LeafNode("b", "bold"), LeafNode(None, " text")])
+        template = PageTemplate("<main>{{ Content }}</main>")
+        self.assertEqual(template.render({"Content": iter_html(root)}),
+                         "<main><div><b>bold</b> text</div></main>")
+        chunks = list(template.iter_render({"Content": iter_html(root)}))
+        self.assertGreater(len(chunks), 3)
+
+    def test_repeated_iterable(self):
+        template = PageTemplate("{{ Content }}|{{ Content }}")
+        self.assertEqual(template.render({"Content": iter(["a", "b"])}), "ab|ab")
+        self.assertEqual("".join(template.iter_render({"Content": iter(["c"])})), "c|c")
+
+    def test_compile_template_is_shared(self):
+        source = "<p>{{ Content }}</p>"
+        self.assertIs(compile_template(source), compile_template(source))
+
+    def test_pickle(self):
+        template = PageTemplate("<p>{{ Content }}</p>")
+        copy = pickle.loads(pickle.dumps(template))
+        self.assertEqual(copy.render({"Content": "x"}), "<p>x</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import time
+import unittest
+
+import converter
+from block_parser import markdown_to_html_node
+from dependency_graph import PageDependencies
+from htmlnode import LeafNode, ParentNode
+from parse_cache import STAMP_NAME, ParseCache, decode_tree, encode_tree
+
+
+MARKDOWN = ("# Title _é_\n\nA **bold [link](/x)** and `code`\n\n"
+            "- one\n- ![ring](/ring.png)\n\n```\n<code>\n```")
+
+
+class TestEncodeTree(unittest.TestCase):
+    def test_round_trip(self):
+        root = markdown_to_html_node(MARKDOWN)
+        decoded, dependencies = decode_tree(encode_tree(root))
+        self.assertEqual(decoded.to_html(), root.to_html())
+        self.assertEqual(dependencies, {"titles": {}, "images": {}})
+
+    def test_keeps_none_and_empty_props(self):
+        root = ParentNode("p", [LeafNode(None, ""), LeafNode("b", "x", {})])
+        decoded, _ = decode_tree(encode_tree(root))
+        self.assertIsNone(decoded.props)
+        self.assertIsNone(decoded.children[0].tag)
+        self.assertEqual(decoded.children[0].value, "")
+        self.assertEqual(decoded.children[1].props, {})
+
+    def test_dependencies(self):
+        dependencies = {"titles": {"/a.html": "A", "/new.html": None},
+                        "images": {"/ring.png": "/ring.abc.png"}}
+        data = encode_tree(LeafNode(None, "text"), dependencies)
+        self.assertEqual(decode_tree(data)[1], dependencies)
+
+    def test_truncated_entry(self):
+        data = encode_tree(markdown_to_html_node(MARKDOWN))
+        for size in (0, 10, len(data) - 4):
+            with self.assertRaises(ValueError):
+                decode_tree(data[:size])
+
+    def test_corrupt_string_ref(self):
+        data = bytearray(encode_tree(LeafNode("b", "text")))
+        # the last op is the leaf's value ref
+        data[-4:] = (1000).to_bytes(4, "little")
+        with self.assertRaises(ValueError):
+            decode_tree(bytes(data))
+
+    def test_lazy_children_not_encoded(self):
+        with self.assertRaises(TypeError):
+            encode_tree(markdown_to_html_node(MARKDOWN, lazy=True))
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "cache")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        converter.page_titles = {}
+        converter.current_dependencies = None
+
+    def parse(self, cache, markdown=MARKDOWN, source_hash="hash"):
+        return cache.markdown_to_html_node(markdown.splitlines(), source_hash).to_html()
+
+    def test_persists_across_instances(self):
+        first = ParseCache(self.directory)
+        html = self.parse(first)
+        self.assertEqual((first.hits, first.misses), (0, 1))
+        second = ParseCache(self.directory)
+        self.assertEqual(self.parse(second), html)
+        self.assertEqual((second.hits, second.misses), (1, 0))
+        self.assertGreater(second.size, 0)
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = ParseCache(self.directory)
+        html = self.parse(cache)
+        for entry in os.scandir(self.directory):
+            if entry.name != STAMP_NAME:
+                with open(entry.path, "r+b") as fp:
+                    fp.seek(-4, os.SEEK_END)
+                    fp.write((1000).to_bytes(4, "little"))
+        self.assertEqual(self.parse(cache), html)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_other_parser_version_cleared(self):
+        self.parse(ParseCache(self.directory))
+        with open(os.path.join(self.directory, STAMP_NAME), "w", encoding="utf-8") as fp:
+            fp.write("older")
+        cache = ParseCache(self.directory)
+        self.assertEqual(cache.size, 0)
+        self.assertIsNone(cache.get("hash"))
+
+    def test_evicts_least_recently_used(self):
+        cache = ParseCache(self.directory)
+        self.parse(cache, source_hash="old")
+        size = cache.size
+        old_time = time.time() - 100
+        for entry in os.scandir(self.directory):
+            if entry.name != STAMP_NAME:
+                os.utime(entry.path, (old_time, old_time))
+        cache.max_bytes = size * 3 // 2
+        self.parse(cache, source_hash="new")
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, size)
+        self.assertIsNone(cache.get("old"))
+        self.assertIsNotNone(cache.get("new"))
+
+    def test_keyed_by_url_directory(self):
+        markdown = "See [](x.html)"
+        converter.page_titles = {"/a/x.html": "Ax", "/b/x.html": "Bx"}
+        cache = ParseCache(self.directory)
+        for base, title in (("/a/", "Ax"), ("/b/", "Bx")):
+            converter.current_dependencies = PageDependencies(base)
+            self.assertIn(f">{title}</a>", self.parse(cache, markdown))
+            self.assertEqual(converter.current_dependencies.titles, {f"{base}x.html"})
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_changed_title_is_a_miss(self):
+        markdown = "# Home\n\nSee [](/about.html)"
+        converter.page_titles = {"/about.html": "About"}
+        cache = ParseCache(self.directory)
+        self.assertIn(">About</a>", self.parse(cache, markdown))
+        converter.current_dependencies = PageDependencies()
+        self.assertIn(">About</a>", self.parse(cache, markdown))
+        self.assertEqual(converter.current_dependencies.titles, {"/about.html"})
+        converter.page_titles = {"/about.html": "About us"}
+        self.assertIn(">About us</a>", self.parse(cache, markdown))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
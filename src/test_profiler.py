@@ -0,0 +1,58 @@
+import unittest
+
+import profiler
+from block_parser import markdown_to_html_node
+from profiler import PageProfile, format_report, stage_totals
+
+
+class TestPageProfile(unittest.TestCase):
+    def test_record_accumulates(self):
+        profile = PageProfile("index.md")
+        profile.record("inline", 0.5, 3)
+        profile.record("inline", 0.25, 2)
+        profile.record("write", 0.25, size=100)
+        self.assertEqual(profile.seconds["inline"], 0.75)
+        self.assertEqual(profile.nodes["inline"], 5)
+        self.assertEqual(profile.size["write"], 100)
+        self.assertEqual(profile.total_seconds(), 1.0)
+
+    def test_begin_end_page(self):
+        profile = profiler.begin_page("index.md")
+        self.assertIs(profiler.current, profile)
+        markdown_to_html_node("A **bold** paragraph")
+        self.assertIs(profiler.end_page(), profile)
+        self.assertIsNone(profiler.current)
+        self.assertEqual(profile.nodes["inline"], 3)
+        self.assertNotIn("convert", profile.nodes)
+
+    def test_disabled_records_nothing(self):
+        self.assertIsNone(profiler.current)
+        markdown_to_html_node("A **bold** paragraph")
+        self.assertIsNone(profiler.current)
+
+
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        self.fast = PageProfile("fast.md")
+        self.fast.record("read", 0.001, size=10)
+        self.slow = PageProfile("slow.md")
+        self.slow.record("read", 0.002, size=20)
+        self.slow.record("to_html", 0.5, size=300)
+
+    def test_stage_totals(self):
+        totals = stage_totals([self.fast, self.slow])
+        self.assertEqual(totals["read"][2], 30)
+        self.assertAlmostEqual(totals["read"][0], 0.003)
+        self.assertEqual(totals["to_html"], (0.5, 0, 300))
+
+    def test_format_report_slowest_first(self):
+        report = format_report([self.fast, self.slow], top=1)
+        lines = report.splitlines()
+        self.assertEqual(lines[0], "slowest 1 of 2 pages")
+        self.assertIn("slow.md", lines[1])
+        self.assertNotIn("fast.md", report)
+        self.assertIn("to_html", lines[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
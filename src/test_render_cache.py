@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+
+import converter
+from block_parser import BlockType, markdown_to_html
+from dependency_graph import PageDependencies
+from render_cache import CACHE_VERSION, RenderCache, block_key, load_cache, save_cache
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = RenderCache()
+        self.assertIsNone(cache.get("key"))
+        cache.put("key", "<p>html</p>")
+        self.assertEqual(cache.get("key"), "<p>html</p>")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats()["hit_rate"], 0.5)
+
+    def test_evicts_least_recently_used(self):
+        cache = RenderCache(max_bytes=10)
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")
+        cache.put("c", "cccc")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "aaaa")
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, 8)
+
+    def test_oversized_entry_not_cached(self):
+        cache = RenderCache(max_bytes=3)
+        cache.put("a", "too long")
+        self.assertEqual(len(cache), 0)
+
+    def test_replace_entry_updates_size(self):
+        cache = RenderCache()
+        cache.put("a", "aaaa")
+        cache.put("a", "aa")
+        self.assertEqual(cache.size, 2)
+
+    def test_render_block(self):
+        cache = RenderCache()
+        lines = ["Shared **footer**"]
+        first = cache.render_block(BlockType.PARAGRAPH, lines)
+        second = cache.render_block(BlockType.PARAGRAPH, list(lines))
+        self.assertEqual(first, "<p>Shared <b>footer</b></p>")
+        self.assertEqual(second, first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_blocks_with_dependencies_not_cached(self):
+        cache = RenderCache()
+        converter.current_dependencies = PageDependencies()
+        try:
+            for _ in range(2):
+                html = cache.render_block(BlockType.PARAGRAPH, ["See [](/about.html)"])
+        finally:
+            dependencies = converter.current_dependencies
+            converter.current_dependencies = None
+        self.assertEqual(html, '<p>See <a href="/about.html"></a></p>')
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(dependencies.titles, {"/about.html"})
+
+    def test_block_key_includes_type(self):
+        self.assertNotEqual(
+            block_key(BlockType.PARAGRAPH, ["x"]), block_key(BlockType.HEADING, ["x"])
+        )
+
+    def test_new_entries_only_when_tracked(self):
+        cache = RenderCache()
+        cache.put("a", "1")
+        self.assertListEqual(cache.take_new_entries(), [])
+        cache.new_entries = []
+        cache.put("b", "2")
+        self.assertListEqual(cache.take_new_entries(), [("b", "2")])
+        self.assertListEqual(cache.take_new_entries(), [])
+
+
+class TestMarkdownToHTMLCached(unittest.TestCase):
+    def test_matches_uncached(self):
+        md = "# Title\n\nBody _text_\n\n- a\n- b\n\n```\ncode\n```\n\nBody _text_"
+        cache = RenderCache()
+        self.assertEqual(markdown_to_html(md, cache), markdown_to_html(md))
+        self.assertEqual(cache.hits, 1)
+
+    def test_empty_document(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html("", RenderCache())
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache", "blocks.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip_keeps_lru_order(self):
+        cache = RenderCache()
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        save_cache(self.path, cache)
+        loaded = load_cache(self.path)
+        self.assertListEqual(loaded.entries(), [("b", "2"), ("a", "1")])
+        self.assertEqual(loaded.hits, 0)
+
+    def test_missing_file(self):
+        self.assertEqual(len(load_cache(self.path)), 0)
+
+    def test_outdated_version(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as fp:
+            json.dump({"version": CACHE_VERSION - 1, "entries": [["a", "1"]]}, fp)
+        self.assertEqual(len(load_cache(self.path)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
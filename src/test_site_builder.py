@@ -0,0 +1,290 @@
+import os
+import tempfile
+import unittest
+
+from parse_cache import ParseCache
+from render_cache import RenderCache
+from page_template import PageTemplate
+from site_builder import MANIFEST_NAME, build_site, extract_title, read_file, render_html
+from source_reader import MarkdownSource
+
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+
+class TestBuildSite(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.content = os.path.join(root, "content")
+        self.public = os.path.join(root, "public")
+        self.template = os.path.join(root, "template.html")
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome **home**")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nA post")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(text)
+
+    def read(self, rel_path):
+        with open(os.path.join(self.public, rel_path), encoding="utf-8") as fp:
+            return fp.read()
+
+    def build(self, jobs=1):
+        return build_site(self.content, self.template, self.public, jobs=jobs)
+
+    def test_first_build_renders_all(self):
+        result = self.build()
+        self.assertListEqual(result.rendered, ["index.md", os.path.join("blog", "post.md")])
+        self.assertEqual(
+            self.read("index.html"),
+            "<title>Home</title><main><div><h1>Home</h1><p>Welcome <b>home</b></p></div></main>",
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.public, MANIFEST_NAME)))
+
+    def test_rebuild_skips_unchanged(self):
+        self.build()
+        result = self.build()
+        self.assertListEqual(result.rendered, [])
+        self.assertEqual(len(result.skipped), 2)
+
+    def test_rebuild_changed_page_only(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nEdited text")
+        result = self.build()
+        self.assertListEqual(result.rendered, ["index.md"])
+        self.assertIn("Edited text", self.read("index.html"))
+
+    def test_touched_page_with_same_content_skipped(self):
+        self.build()
+        path = os.path.join(self.content, "index.md")
+        os.utime(path, ns=(0, 0))
+        result = self.build()
+        self.assertListEqual(result.rendered, [])
+
+    def test_template_change_rebuilds_all(self):
+        self.build()
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        result = self.build()
+        self.assertEqual(len(result.rendered), 2)
+
+    def test_missing_output_rebuilt(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        result = self.build()
+        self.assertListEqual(result.rendered, ["index.md"])
+
+    def test_deleted_source_removes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        result = self.build()
+        self.assertListEqual(result.deleted, [os.path.join("blog", "post.md")])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+
+    def test_retitled_page_rebuilds_pages_showing_its_title(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nRead [](blog/post)")
+        self.write(os.path.join(self.content, "about.md"), "# About\n\n[Post](blog/post)")
+        self.build()
+        self.assertIn('<a href="blog/post">Post</a>', self.read("index.html"))
+        post = os.path.join("blog", "post.md")
+        self.write(os.path.join(self.content, post), "# Second post\n\nA post")
+        result = self.build()
+        self.assertListEqual(sorted(result.rendered), sorted([post, "index.md"]))
+        self.assertIn('<a href="blog/post">Second post</a>', self.read("index.html"))
+        self.write(os.path.join(self.content, post), "# Second post\n\nEdited")
+        self.assertListEqual(self.build().rendered, [post])
+
+    def test_touched_page_rebuilt_when_title_it_shows_changes(self):
+        self.write(os.path.join(self.content, "a.md"), "# A\n\nSee [](/b.html)")
+        self.write(os.path.join(self.content, "b.md"), "# Beta\n\nText")
+        self.build()
+        os.utime(os.path.join(self.content, "a.md"), ns=(0, 0))
+        self.write(os.path.join(self.content, "b.md"), "# Gamma\n\nText")
+        result = self.build()
+        self.assertListEqual(sorted(result.rendered), ["a.md", "b.md"])
+        self.assertIn(">Gamma</a>", self.read("a.html"))
+
+    def test_added_and_removed_pages_rebuild_dependents(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nSee [](/new.html)")
+        self.build()
+        self.write(os.path.join(self.content, "new.md"), "# New page\n\nText")
+        result = self.build(jobs=2)
+        self.assertListEqual(sorted(result.rendered), ["index.md", "new.md"])
+        self.assertIn("New page</a>", self.read("index.html"))
+        os.remove(os.path.join(self.content, "new.md"))
+        result = self.build()
+        self.assertListEqual(result.rendered, ["index.md"])
+        self.assertIn('<a href="/new.html"></a>', self.read("index.html"))
+
+    def test_assets_copied_and_image_urls_hashed(self):
+        static = os.path.join(self.temp_dir.name, "static")
+        ring = os.path.join(static, "images", "ring.png")
+        self.write(ring, "one ring")
+        self.write(os.path.join(self.content, "blog", "post.md"),
+                   "# Post\n\n![ring](../images/ring.png)")
+
+        def build():
+            return build_site(self.content, self.template, self.public,
+                              static_dir=static, hash_assets=True)
+
+        result = build()
+        self.assertListEqual(result.assets.copied, [os.path.join("images", "ring.png")])
+        output = result.assets.entries[os.path.join("images", "ring.png")]["output"]
+        src = "/" + output.replace(os.sep, "/")
+        self.assertIn(f'<img src="{src}"', self.read(os.path.join("blog", "post.html")))
+        self.assertEqual(self.read(output), "one ring")
+
+        result = build()
+        self.assertListEqual(result.rendered, [])
+        self.assertListEqual(result.assets.copied, [])
+
+        self.write(ring, "two rings")
+        os.utime(ring, ns=(10**9, 10**9))
+        result = build()
+        self.assertListEqual(result.rendered, [os.path.join("blog", "post.md")])
+        self.assertNotIn(src, self.read(os.path.join("blog", "post.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, output)))
+
+    def test_parallel_build_matches_serial(self):
+        for number in range(6):
+            self.write(os.path.join(self.content, f"page{number}.md"),
+                       f"# Page {number}\n\nText with `code` {number}")
+        self.build()
+        serial = {name: self.read(name) for name in os.listdir(self.public)
+                  if name.endswith(".html")}
+        self.write(self.template, TEMPLATE + " ")
+        result = self.build(jobs=2)
+        self.assertEqual(len(result.rendered), 8)
+        for name, html in serial.items():
+            self.assertEqual(self.read(name), html + " ")
+
+    def test_parallel_rebuild_skips_touched(self):
+        self.build(jobs=2)
+        for name in ("index.md", os.path.join("blog", "post.md")):
+            os.utime(os.path.join(self.content, name), ns=(0, 0))
+        result = self.build(jobs=2)
+        self.assertListEqual(result.rendered, [])
+        self.assertEqual(len(result.skipped), 2)
+
+    def test_profiled_build(self):
+        result = build_site(self.content, self.template, self.public, profile=True)
+        self.assertListEqual(
+            sorted(profile.path for profile in result.profiles), sorted(result.rendered)
+        )
+        stages = set(result.profiles[0].seconds)
+        self.assertSetEqual(
+            stages, {"read", "blocks", "plain", "inline", "to_html", "write"}
+        )
+
+    def test_cached_build_matches_uncached(self):
+        footer = "\n\nShared **footer** text"
+        self.write(os.path.join(self.content, "index.md"), "# Home" + footer)
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post" + footer)
+        self.build()
+        uncached = self.read("index.html")
+        self.write(self.template, TEMPLATE + " ")
+        cache = RenderCache()
+        build_site(self.content, self.template, self.public, cache=cache)
+        self.assertEqual(self.read("index.html"), uncached + " ")
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_parallel_build_merges_worker_caches(self):
+        cache = RenderCache()
+        result = build_site(self.content, self.template, self.public, jobs=2,
+                            cache=cache)
+        self.assertEqual(len(result.rendered), 2)
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(len(cache), 4)
+
+    def test_parse_cache_across_builds(self):
+        self.build()
+        uncached = {name: self.read(name) for name in ("index.html", os.path.join("blog", "post.html"))}
+        directory = os.path.join(self.temp_dir.name, "parse-cache")
+        for jobs, hits in ((2, 0), (1, 2)):
+            os.remove(os.path.join(self.public, MANIFEST_NAME))
+            parse_cache = ParseCache(directory)
+            build_site(self.content, self.template, self.public, jobs=jobs,
+                       parse_cache=parse_cache)
+            self.assertEqual((parse_cache.hits, parse_cache.misses), (hits, 2 - hits))
+            for name, html in uncached.items():
+                self.assertEqual(self.read(name), html)
+
+    def test_parse_cache_same_source_in_other_directories(self):
+        for name in ("a", "b"):
+            self.write(os.path.join(self.content, name, "index.md"), "# Index\n\n[](x.html)")
+            self.write(os.path.join(self.content, name, "x.md"), f"# {name.upper()}x\n\nText")
+        parse_cache = ParseCache(os.path.join(self.temp_dir.name, "parse-cache"))
+        build_site(self.content, self.template, self.public, parse_cache=parse_cache)
+        self.assertIn(">Ax</a>", self.read(os.path.join("a", "index.html")))
+        self.assertIn(">Bx</a>", self.read(os.path.join("b", "index.html")))
+
+    def test_pages_without_heading_or_blocks(self):
+        self.write(os.path.join(self.content, "blog", "draft.md"), "")
+        self.write(os.path.join(self.content, "notes.md"), "Just *notes*")
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                result = build_site(self.content, self.template, self.public, jobs=jobs,
+                                    cache=RenderCache() if jobs == 1 else None)
+                self.assertEqual(len(result.rendered) + len(result.skipped), 4)
+                self.assertEqual(self.read(os.path.join("blog", "draft.html")),
+                                 "<title>draft</title><main><div></div></main>")
+                self.assertEqual(self.read("notes.html"), "<title>notes</title>"
+                                 "<main><div><p>Just <i>notes</i></p></div></main>")
+
+    def test_unprofiled_build_has_no_profiles(self):
+        self.assertListEqual(self.build().profiles, [])
+
+
+class TestRenderHtml(unittest.TestCase):
+    def test_compiled_and_str_templates_match(self):
+        markdown = "# Fish & Chips\n\nSome **bold** text"
+        expected = ("<title>Fish &amp; Chips</title><main><div><h1>Fish &amp; Chips</h1>"
+                    "<p>Some <b>bold</b> text</p></div></main>")
+        self.assertEqual(render_html(markdown, TEMPLATE), expected)
+        self.assertEqual(render_html(markdown, PageTemplate(TEMPLATE)), expected)
+        self.assertEqual(render_html(markdown, TEMPLATE, RenderCache()), expected)
+
+    def test_fallback_title(self):
+        self.assertEqual(render_html("Text", TEMPLATE, fallback_title="a & b"),
+                         "<title>a &amp; b</title><main><div><p>Text</p></div></main>")
+        self.assertEqual(render_html(" \n\n", TEMPLATE, fallback_title="empty"),
+                         "<title>empty</title><main><div></div></main>")
+        with self.assertRaises(ValueError):
+            render_html("Text", TEMPLATE)
+
+    def test_str_and_mapped_sources_match(self):
+        markdown = ("# Title\r\n\r\n```\na\u2028b\x0cc\rd\n```\n\n"
+                    "para\x1cgraph\u2029end\n")
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "page.md")
+            with open(path, "w", encoding="utf-8", newline="") as fp:
+                fp.write(markdown)
+            with MarkdownSource(path) as source:
+                mapped = render_html(source, TEMPLATE)
+            text = render_html(read_file(path, newline=""), TEMPLATE)
+        self.assertEqual(text, mapped)
+        self.assertEqual(render_html(markdown, TEMPLATE), mapped)
+        self.assertIn("a\u2028b\x0cc\rd", mapped)
+        self.assertIn("<title>Title</title>", mapped)
+
+    def test_title_is_not_substituted_again(self):
+        html = render_html("# {{ Content }}", TEMPLATE)
+        self.assertTrue(html.startswith("<title>{{ Content }}</title>"))
+
+
+class TestExtractTitle(unittest.TestCase):
+    def test_extract_title(self):
+        self.assertEqual(extract_title("Intro\n\n# Hello  \n## Sub"), "Hello")
+
+    def test_no_title(self):
+        with self.assertRaises(ValueError):
+            extract_title("## Only a subheading")
+
+
+if __name__ == "__main__":
+    unittest.main()
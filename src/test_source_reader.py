@@ -0,0 +1,71 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+from source_reader import MarkdownSource
+
+
+class TestMarkdownSource(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "page.md")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, data):
+        with open(self.path, "wb") as fp:
+            fp.write(data)
+
+    def test_iter_lines(self):
+        self.write("# Título\n\nsome **text**\nlast line".encode("utf-8"))
+        with MarkdownSource(self.path) as source:
+            self.assertListEqual(
+                list(source.iter_lines()), ["# Título", "", "some **text**", "last line"]
+            )
+
+    def test_trailing_newline(self):
+        self.write(b"one\ntwo\n")
+        with MarkdownSource(self.path) as source:
+            self.assertListEqual(list(source.iter_lines()), ["one", "two"])
+
+    def test_crlf_keeps_carriage_return(self):
+        self.write(b"one\r\ntwo\r\n")
+        with MarkdownSource(self.path) as source:
+            self.assertListEqual(list(source.iter_lines()), ["one\r", "two\r"])
+
+    def test_iter_lines_twice(self):
+        self.write(b"one\ntwo")
+        with MarkdownSource(self.path) as source:
+            self.assertListEqual(list(source.iter_lines()), list(source.iter_lines()))
+
+    def test_empty_file(self):
+        self.write(b"")
+        with MarkdownSource(self.path) as source:
+            self.assertEqual(source.size, 0)
+            self.assertListEqual(list(source.iter_lines()), [])
+            self.assertEqual(source.hash(), hashlib.sha256(b"").hexdigest())
+
+    def test_hash(self):
+        data = b"# Title\n\nbody\n"
+        self.write(data)
+        with MarkdownSource(self.path) as source:
+            self.assertEqual(source.hash(), hashlib.sha256(data).hexdigest())
+
+    def test_invalid_utf8(self):
+        self.write(b"bad \xff byte")
+        with MarkdownSource(self.path) as source:
+            with self.assertRaises(UnicodeDecodeError):
+                list(source.iter_lines())
+
+    def test_close_with_unfinished_iterator(self):
+        self.write(b"one\ntwo")
+        source = MarkdownSource(self.path)
+        lines = source.iter_lines()
+        self.assertEqual(next(lines), "one")
+        source.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
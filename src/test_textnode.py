@@ -1,6 +1,6 @@
 import unittest
 
-from textnode import TextNode, TextType
+from textnode import TextNode, TextNodeBatch, TextType
 
 
 class TestTextNode(unittest.TestCase):    
@@ -51,6 +51,56 @@ class TestTextNode(unittest.TestCase):
         string = "TextNode(This is a text node, link, https://www.boot.dev)"
         self.assertEqual(string, repr(node))
 
+    
+    def test_slots(self):
+        node = TextNode("This is a text node", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+
+
+
+class TestTextNodeBatch(unittest.TestCase):
+    def test_spans_share_text(self):
+        text = "see [docs](/docs) now"
+        batch = TextNodeBatch(text)
+        batch.append(0, 4, TextType.TEXT)
+        batch.append(5, 9, TextType.LINK, "/docs")
+        batch.append(17, 21, TextType.TEXT)
+        self.assertEqual(len(batch), 3)
+        self.assertIs(batch.text, text)
+        self.assertEqual(batch[1], TextNode("docs", TextType.LINK, "/docs"))
+        self.assertEqual(batch[-1], TextNode(" now", TextType.TEXT))
+        self.assertEqual(batch.url_of(0), None)
+        self.assertEqual(batch.type_of(1), TextType.LINK)
+        self.assertListEqual(list(batch), [batch[0], batch[1], batch[2]])
+
+    def test_from_nodes(self):
+        nodes = [
+            TextNode("plain ", TextType.TEXT),
+            TextNode("alt", TextType.IMAGE, "a.png"),
+            TextNode("", TextType.TEXT),
+        ]
+        batch = TextNodeBatch.from_nodes(nodes)
+        self.assertEqual(batch.text, "plain alt")
+        self.assertListEqual(list(batch), nodes)
+        with self.assertRaises(TypeError):
+            TextNodeBatch.from_nodes(["text"])
+
+    def test_from_text(self):
+        self.assertListEqual(list(TextNodeBatch.from_text("hi")),
+                             [TextNode("hi", TextType.TEXT)])
+        self.assertEqual(len(TextNodeBatch.from_text("")), 0)
+
+    def test_derive_keeps_urls(self):
+        batch = TextNodeBatch("x")
+        batch.append(0, 1, TextType.LINK, "/x")
+        derived = batch.derive()
+        self.assertIs(derived.text, batch.text)
+        self.assertEqual(len(derived), 0)
+        derived.append_code(0, 1, batch.types[0], batch.url_indexes[0])
+        self.assertEqual(derived[0], batch[0])
+        derived.append(0, 1, TextType.LINK, "/y")
+        self.assertEqual(batch.urls, ["/x"])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,3 +1,4 @@
+from array import array
 from enum import Enum
 
 
@@ -11,6 +12,8 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type: TextType, url=None):
         self.text = text
         self.text_type = text_type
@@ -24,4 +27,108 @@ class TextNode:
                 and self.url == text_node.url)
     
     def __repr__(self):
-        return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
\ No newline at end of file
+        return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
+
+
+class TextNodeBatch:
+    """Many TextNodes stored as columns over one backing string
+    Each node is a (start, end) span of text, a type code and an index into
+    urls (-1 for none), kept in compact arrays instead of a TextNode and a
+    str per node. Batches split from another batch share its backing string.
+    Indexing or iterating builds TextNodes on demand.
+
+    Batches come from text_to_textnodes(text, batch=True) and the split
+    functions; the site build parses with inline_parser.parse_inline
+    instead, so it does not build batches of giant pages.
+    """
+    __slots__ = ("text", "starts", "ends", "types", "url_indexes", "urls")
+
+    # type code of a node is the index of its TextType here
+    TEXT_TYPES = tuple(TextType)
+    TYPE_CODES = {text_type: code for code, text_type in enumerate(TEXT_TYPES)}
+
+    def __init__(self, text="", urls=None):
+        self.text = text
+        self.starts = array("I")
+        self.ends = array("I")
+        self.types = array("B")
+        self.url_indexes = array("i")
+        self.urls = urls if urls is not None else []
+
+    @classmethod
+    def from_text(cls, text):
+        """Batch of one TEXT node spanning text, empty when text is empty"""
+        batch = cls(text)
+        if text:
+            batch.append(0, len(text), TextType.TEXT)
+        return batch
+
+    @classmethod
+    def from_nodes(cls, text_nodes):
+        """Batch holding copies of TextNodes, backed by their joined text
+
+        Raises:
+            TypeError: item is not a TextNode
+        """
+        batch = cls()
+        parts = []
+        offset = 0
+        for text_node in text_nodes:
+            if not isinstance(text_node, TextNode):
+                raise TypeError("Expected a TextNode object")
+            end = offset + len(text_node.text)
+            batch.append(offset, end, text_node.text_type, text_node.url)
+            parts.append(text_node.text)
+            offset = end
+        batch.text = "".join(parts)
+        return batch
+
+    def derive(self):
+        """Empty batch over the same text, with the same url indexes"""
+        return TextNodeBatch(self.text, list(self.urls))
+
+    def append(self, start, end, text_type, url=None):
+        """Add a node for text[start:end]"""
+        url_index = -1
+        if url is not None:
+            url_index = len(self.urls)
+            self.urls.append(url)
+        self.append_code(start, end, self.TYPE_CODES[text_type], url_index)
+
+    def append_code(self, start, end, type_code, url_index=-1):
+        """Add a node from raw column values"""
+        self.starts.append(start)
+        self.ends.append(end)
+        self.types.append(type_code)
+        self.url_indexes.append(url_index)
+
+    def spans(self):
+        """Iterate (start, end, type code, url index) of every node"""
+        return zip(self.starts, self.ends, self.types, self.url_indexes)
+
+    def text_of(self, index):
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def type_of(self, index):
+        return self.TEXT_TYPES[self.types[index]]
+
+    def url_of(self, index):
+        url_index = self.url_indexes[index]
+        return None if url_index < 0 else self.urls[url_index]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        return TextNode(self.text_of(index), self.type_of(index), self.url_of(index))
+
+    def __iter__(self):
+        text = self.text
+        text_types = self.TEXT_TYPES
+        urls = self.urls
+        for start, end, type_code, url_index in self.spans():
+            yield TextNode(text[start:end], text_types[type_code],
+                           None if url_index < 0 else urls[url_index])
+
+    def __repr__(self):
+        return f"TextNodeBatch({len(self)} nodes, {len(self.text)} chars)"